@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Startup cost of the ``version-tracker`` CLI, measured with ``-X importtime``.
+
+Runs each command in a fresh interpreter and adds up the cumulative import
+time of every top-level import the command triggers, leaving out what the
+interpreter imports on its own at startup. Also reports whether any heavy
+dependency (HTTP client, schema validator) was loaded. The best of several
+runs is kept to filter out noise.
+
+Exits with status 1 if a command exceeds ``--max-ms`` or loads a heavy
+dependency, so it can guard against startup regressions.
+
+Usage:
+    python benchmarks/bench_import.py [--runs 5] [--max-ms 75]
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+REPO_ROOT = Path(__file__).parent.parent
+
+COMMANDS = {
+    "help": ["--help"],
+    "list": ["list"],
+    "get": ["get", "chrome", "windows"],
+}
+
+# Modules that only a network check or validation should need
+HEAVY_MODULES = ("httpx", "httpcore", "jsonschema", "asyncio")
+
+# "import time:      self |   cumulative | <indent>module"
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Return ``(module, cumulative_us, depth)`` for each ``-X importtime`` line."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            _, cumulative, indent, module = match.groups()
+            entries.append((module, int(cumulative), len(indent) // 2))
+    return entries
+
+
+def _importtime(args: Sequence[str]) -> List[Tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode not in (0, 2):
+        raise RuntimeError(f"{args} failed: {result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def startup_modules() -> Set[str]:
+    """Modules the bare interpreter imports before running any code."""
+    return {module for module, _, _ in _importtime(["-c", "pass"])}
+
+
+def measure(argv: Sequence[str], baseline: Set[str], runs: int = 5) -> Dict:
+    """Measure one CLI invocation.
+
+    Returns:
+        ``import_ms`` (best of ``runs``) and the heavy modules it loaded
+    """
+    best = None
+    heavy: Set[str] = set()
+    for _ in range(runs):
+        entries = _importtime(["-m", "scripts.cli", *argv])
+        total = sum(
+            cumulative
+            for module, cumulative, depth in entries
+            if depth == 0 and module not in baseline
+        )
+        best = total if best is None else min(best, total)
+        heavy |= {
+            module
+            for module, _, _ in entries
+            if module.split(".")[0] in HEAVY_MODULES
+        }
+    return {
+        "import_ms": round(best / 1000, 2),
+        "heavy_modules": sorted({module.split(".")[0] for module in heavy}),
+    }
+
+
+def run(runs: int, max_ms: float) -> Dict:
+    baseline = startup_modules()
+    results = {name: measure(argv, baseline, runs) for name, argv in COMMANDS.items()}
+    failures = [
+        name
+        for name, result in results.items()
+        if result["import_ms"] > max_ms or result["heavy_modules"]
+    ]
+    return {
+        "benchmark": "import_time",
+        "runs": runs,
+        "max_ms": max_ms,
+        "commands": results,
+        "failures": failures,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=75.0,
+        help="Import time allowed per command (default: %(default)s)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    result = run(args.runs, args.max_ms)
+    print(json.dumps(result, indent=2))
+    return 1 if result["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Compare the JSON codecs on the documents the checkers handle.
+
+For every installed backend (see ``scripts/checkers/codec.py``) times:
+
+- ``decode``: the Safari release-notes index, the largest upstream response
+- ``decode_data``: every ``data/*.json`` file
+- ``encode_data``: writing every ``data/*.json`` file in its on-disk format
+
+Each timing is the best of ``--rounds`` runs of ``--repeat`` iterations.
+Also checks that each backend reproduces the data files byte for byte.
+Prints a JSON report.
+
+Usage:
+    python benchmarks/bench_json.py [--rounds 5] [--repeat 50]
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from scripts.checkers.codec import available_codecs, get_codec
+
+ROOT = Path(__file__).parent.parent
+SAFARI_INDEX = ROOT / "tests" / "fixtures" / "safari-release-notes.json"
+
+
+def best_ms(function: Callable[[], Any], rounds: int, repeat: int) -> float:
+    """Best time of one iteration of ``function``, in milliseconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return round(best * 1000, 4)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    index = SAFARI_INDEX.read_bytes()
+    data_files = [path.read_bytes() for path in sorted((ROOT / "data").glob("*.json"))]
+    documents = [json.loads(raw) for raw in data_files]
+
+    results = {}
+    for name in available_codecs():
+        codec = get_codec(name)
+        results[name] = {
+            "decode_ms": best_ms(lambda: codec.loads(index), args.rounds, args.repeat),
+            "decode_data_ms": best_ms(
+                lambda: [codec.loads(raw) for raw in data_files],
+                args.rounds,
+                args.repeat,
+            ),
+            "encode_data_ms": best_ms(
+                lambda: [codec.dumps_pretty(document) for document in documents],
+                args.rounds,
+                args.repeat,
+            ),
+            "byte_identical": all(
+                codec.dumps_pretty(document).encode() == raw
+                for document, raw in zip(documents, data_files)
+            ),
+        }
+
+    baseline = results["stdlib"]
+    for result in results.values():
+        for key in ("decode_ms", "decode_data_ms", "encode_data_ms"):
+            result[key.replace("_ms", "_speedup")] = round(
+                baseline[key] / result[key], 2
+            )
+
+    return {
+        "benchmark": "json",
+        "index_bytes": len(index),
+        "data_files": len(data_files),
+        "default": get_codec().name,
+        "results": results,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark JSON codecs")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--repeat", type=int, default=50, help="Iterations per timed round"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    print(json.dumps(run(parse_args(argv)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
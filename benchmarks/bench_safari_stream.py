@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Compare buffered and streaming parsing of the Safari release-notes index.
+
+Serves a fixture shaped like the upstream index from a local server that
+sends it in chunks at a fixed bandwidth, then runs the Safari checker in
+both modes. Prints a JSON summary with latency, bytes read and peak Python
+memory (tracemalloc) for each mode.
+
+Usage:
+    python benchmarks/bench_safari_stream.py [--rounds 5] [--kbps 4096]
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Sequence
+
+from scripts.checkers.safari import SafariVersionChecker
+
+FIXTURE = (
+    Path(__file__).parent.parent / "tests" / "fixtures" / "safari-release-notes.json"
+)
+CHUNK_SIZE = 16 * 1024
+
+
+def start_server(body: bytes, kbps: int) -> ThreadingHTTPServer:
+    delay = CHUNK_SIZE / (kbps * 1024) if kbps else 0
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                for start in range(0, len(body), CHUNK_SIZE):
+                    self.wfile.write(body[start : start + CHUNK_SIZE])
+                    self.wfile.flush()
+                    if delay:
+                        time.sleep(delay)
+            except (BrokenPipeError, ConnectionResetError):
+                # The streaming client hangs up once it has what it needs
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    return server
+
+
+async def measure(url: str, streaming: bool, rounds: int) -> dict:
+    timings = []
+    bytes_read = 0
+    peak = 0
+    version = None
+    for _ in range(rounds):
+        checker = SafariVersionChecker()
+        checker.api_url = url
+        checker.streaming = streaming
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = await checker.fetch_latest_version("macos")
+        timings.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        bytes_read = checker.bytes_downloaded
+        version = result["version"] if result else None
+
+    timings.sort()
+    return {
+        "version": version,
+        "median_ms": round(timings[len(timings) // 2] * 1000, 2),
+        "bytes_read": bytes_read,
+        "peak_memory_bytes": peak,
+    }
+
+
+async def run(rounds: int, kbps: int) -> dict:
+    body = FIXTURE.read_bytes()
+    server = start_server(body, kbps)
+    url = f"http://127.0.0.1:{server.server_address[1]}/index"
+    try:
+        buffered = await measure(url, False, rounds)
+        streaming = await measure(url, True, rounds)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {
+        "benchmark": "safari_stream",
+        "document_bytes": len(body),
+        "bandwidth_kbps": kbps,
+        "rounds": rounds,
+        "buffered": buffered,
+        "streaming": streaming,
+        "speedup": round(buffered["median_ms"] / streaming["median_ms"], 2),
+        "memory_ratio": round(
+            streaming["peak_memory_bytes"] / buffered["peak_memory_bytes"], 3
+        ),
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--kbps",
+        type=int,
+        default=4096,
+        help="Simulated download bandwidth in KiB/s (0: unlimited)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    print(json.dumps(asyncio.run(run(args.rounds, args.kbps)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
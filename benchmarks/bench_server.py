@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Load benchmark for the read-only version server.
+
+Starts ``scripts.server.VersionServer`` in-process on a free port and drives
+it with keep-alive connections, each sending requests back to back. Prints a
+JSON summary with requests per second and latency percentiles.
+
+Usage:
+    python benchmarks/bench_server.py [--connections 50] [--requests 2000]
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Optional, Sequence
+
+from scripts.lookup import DEFAULT_DATA_DIR
+from scripts.server import VersionServer
+
+PATHS = [
+    "/products",
+    "/products/chrome",
+    "/products/chrome/windows",
+    "/products/edge/linux",
+    "/products/safari/ios",
+]
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.lower() == b"content-length":
+            length = int(value)
+    if length:
+        await reader.readexactly(length)
+    return status
+
+
+async def _client(
+    port: int, count: int, offset: int, latencies: List[float], etag: Optional[str]
+):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    conditional = f"If-None-Match: {etag}\r\n" if etag else ""
+    try:
+        for i in range(count):
+            path = PATHS[(offset + i) % len(PATHS)]
+            request = f"GET {path} HTTP/1.1\r\nHost: bench\r\n{conditional}\r\n"
+            start = time.perf_counter()
+            writer.write(request.encode())
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status not in (200, 304):
+                raise RuntimeError(f"Unexpected status {status} for {path}")
+    finally:
+        writer.close()
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def run(
+    connections: int, requests: int, data_dir: Path, conditional: bool
+) -> dict:
+    server = VersionServer(data_dir, port=0, reload_interval=3600)
+    await server.start()
+    try:
+        # A bogus ETag never matches, so it measures the header parsing path
+        # while still returning full bodies
+        etag = '"bench"' if conditional else None
+        per_connection = max(requests // connections, 1)
+        latencies: List[float] = []
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _client(server.port, per_connection, i, latencies, etag)
+                for i in range(connections)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        await server.close()
+
+    return {
+        "benchmark": "server",
+        "connections": connections,
+        "requests": len(latencies),
+        "seconds": round(elapsed, 4),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 0.50) * 1000, 3),
+            "p99": round(_percentile(latencies, 0.99) * 1000, 3),
+            "max": round(max(latencies) * 1000, 3),
+        },
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the version server")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument(
+        "--conditional",
+        action="store_true",
+        help="Send a (non-matching) If-None-Match header with every request",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    result = asyncio.run(
+        run(args.connections, args.requests, args.data_dir, args.conditional)
+    )
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
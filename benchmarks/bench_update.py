@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""End-to-end ``update()`` benchmark against a local stub upstream.
+
+Starts ``stub_upstream.py`` in its own process, then for each product count
+runs a fresh worker process that points the Chrome, Edge, Firefox and Safari
+checkers at the stub and pads the run with synthetic declarative products
+(``JsonApiChecker``) until it reaches the requested count. Each worker runs
+every checker's ``update()`` concurrently inside one ``HttpSession``, twice:
+
+- ``cold``: data files are created and written
+- ``warm``: nothing changed upstream, so nothing is written
+
+Prints a JSON report with wall time, requests per second, bytes read and
+peak RSS per product count, for comparison across runs.
+
+Usage:
+    python benchmarks/bench_update.py [--products 4 100 1000] [--platforms 3]
+        [--latency-ms 20] [--size 2048] [--concurrency 64]
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+BENCHMARKS = Path(__file__).parent
+PLATFORMS = ["windows", "macos", "linux", "ios", "android", "web"]
+REAL_PRODUCTS = ["chrome", "edge", "firefox", "safari"]
+
+
+def build_checkers(
+    base_url: str, products: int, platforms: int, data_dir: Path
+) -> List[Any]:
+    """Create the real checkers plus synthetic ones, all writing to ``data_dir``."""
+    from scripts.checkers.declarative import JsonApiChecker
+    from scripts.checkers.registry import CheckerRegistry
+
+    registry = CheckerRegistry(definitions_dir=None, use_entry_points=False)
+    checkers = []
+    for name in REAL_PRODUCTS[:products]:
+        checker = registry.create(name)
+        if name == "chrome":
+            checker.base_url = f"{base_url}/chrome"
+        elif name == "edge":
+            checker.api_url = f"{base_url}/edge/api/products"
+        elif name == "firefox":
+            checker.desktop_url = f"{base_url}/firefox/firefox_versions.json"
+            checker.mobile_url = f"{base_url}/firefox/mobile_versions.json"
+        elif name == "safari":
+            checker.api_url = f"{base_url}/safari/index"
+        checkers.append(checker)
+
+    for i in range(products - len(checkers)):
+        identifier = f"synthetic-{i:04d}"
+        checkers.append(
+            JsonApiChecker(
+                {
+                    "identifier": identifier,
+                    "name": f"Synthetic {i}",
+                    "type": "runtime",
+                    "url": f"{base_url}/synthetic/{identifier}/{{platform}}.json",
+                    "path": ["version"],
+                    "platforms": {platform: {} for platform in PLATFORMS[:platforms]},
+                }
+            )
+        )
+
+    for checker in checkers:
+        checker.data_file = data_dir / f"{checker.product_name}.json"
+    return checkers
+
+
+async def run_round(
+    base_url: str, products: int, platforms: int, data_dir: Path, concurrency: int
+) -> Dict[str, Any]:
+    from scripts.checkers.session import HttpSession
+
+    checkers = build_checkers(base_url, products, platforms, data_dir)
+    session = HttpSession(
+        max_connections=concurrency,
+        max_connections_per_host=concurrency,
+        http2=False,
+        host_rate=None,
+    )
+    start = time.perf_counter()
+    async with session:
+        results = await asyncio.gather(*(checker.update() for checker in checkers))
+    elapsed = time.perf_counter() - start
+
+    requests = session.stats.requests
+    return {
+        "seconds": round(elapsed, 4),
+        "requests": requests,
+        "requests_per_second": round(requests / elapsed, 1),
+        "bytes_read": sum(checker.bytes_downloaded for checker in checkers),
+        "connections_opened": session.stats.connections_opened,
+        "failed_products": sum(1 for ok in results if not ok),
+    }
+
+
+def worker(args: argparse.Namespace) -> Dict[str, Any]:
+    """Measure one product count in this process."""
+    data_dir = Path(args.data_dir)
+    rounds = {}
+    for name in ("cold", "warm"):
+        rounds[name] = asyncio.run(
+            run_round(
+                args.base_url, args.worker, args.platforms, data_dir, args.concurrency
+            )
+        )
+    # ru_maxrss is in KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "products": args.worker,
+        "peak_rss_mb": round(peak_rss / 1024, 1),
+        **rounds,
+    }
+
+
+def start_stub(latency_ms: float, size: int) -> "tuple[subprocess.Popen, str]":
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(BENCHMARKS / "stub_upstream.py"),
+            "--latency-ms",
+            str(latency_ms),
+            "--size",
+            str(size),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    port = int(process.stdout.readline())
+    return process, f"http://127.0.0.1:{port}"
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    stub, base_url = start_stub(args.latency_ms, args.size)
+    results = []
+    try:
+        for products in args.products:
+            with tempfile.TemporaryDirectory() as data_dir:
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        __file__,
+                        "--worker",
+                        str(products),
+                        "--base-url",
+                        base_url,
+                        "--data-dir",
+                        data_dir,
+                        "--platforms",
+                        str(args.platforms),
+                        "--concurrency",
+                        str(args.concurrency),
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+            results.append(json.loads(output))
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    return {
+        "benchmark": "update",
+        "latency_ms": args.latency_ms,
+        "synthetic_size_bytes": args.size,
+        "synthetic_platforms": args.platforms,
+        "concurrency": args.concurrency,
+        "results": results,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark checker updates")
+    parser.add_argument("--products", type=int, nargs="+", default=[4, 100, 1000])
+    parser.add_argument(
+        "--platforms",
+        type=int,
+        default=3,
+        choices=range(1, len(PLATFORMS) + 1),
+        help="Platforms per synthetic product",
+    )
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument(
+        "--size", type=int, default=2048, help="Synthetic response size in bytes"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=64, help="Requests in flight at once"
+    )
+    # Internal: run one measurement in this process
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.worker:
+        print(json.dumps(worker(args)))
+    else:
+        print(json.dumps(run(args), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
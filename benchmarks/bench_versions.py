@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Microbenchmark of version parsing, comparison, sorting and max-finding.
+
+Generates version strings in the formats the checkers store (Chrome/Edge
+four-part, Safari two-part, Firefox releases, betas and ESRs) and times:
+
+- ``parse``: parsing every distinct string once, with an empty cache
+- ``compare_keys``: comparisons of already parsed keys
+- ``compare_cached``: ``versions.compare`` on strings, keys from the cache
+- ``compare_reparse``: the same comparisons parsing both sides every time,
+  as a baseline
+- ``sort`` and ``max``: ``sort_versions`` and ``max_version`` over the list
+
+Prints a JSON report with total seconds and nanoseconds per operation.
+
+Usage:
+    python benchmarks/bench_versions.py [--comparisons 1000000] [--size 10000]
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from scripts import versions
+
+
+def generate(count: int, rand: random.Random) -> List[str]:
+    """Random version strings, in roughly the mix found in the data files."""
+    result = []
+    for _ in range(count):
+        kind = rand.random()
+        major = rand.randint(100, 160)
+        if kind < 0.5:
+            build, patch = rand.randint(1000, 9999), rand.randint(0, 200)
+            result.append(f"{major}.0.{build}.{patch}")
+        elif kind < 0.6:
+            result.append(f"{rand.randint(15, 27)}.{rand.randint(0, 9)}")
+        elif kind < 0.8:
+            result.append(f"{major}.0.{rand.randint(0, 5)}")
+        elif kind < 0.9:
+            result.append(f"{major}.0b{rand.randint(1, 12)}")
+        else:
+            result.append(f"{major}.{rand.randint(0, 9)}.0esr")
+    return result
+
+
+def timed(operations: int, function: Callable[[], Any]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    return {
+        "operations": operations,
+        "seconds": round(elapsed, 4),
+        "ns_per_op": round(elapsed / operations * 1e9, 1),
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rand = random.Random(args.seed)
+    strings = generate(args.size, rand)
+    pairs = [
+        (rand.randrange(args.size), rand.randrange(args.size))
+        for _ in range(args.comparisons)
+    ]
+    parse = versions.version_key.__wrapped__
+
+    versions.version_key.cache_clear()
+    results = {"parse": timed(len(strings), lambda: [parse(s) for s in strings])}
+
+    keys = [versions.version_key(s) for s in strings]
+
+    def compare_keys():
+        for i, j in pairs:
+            keys[i] < keys[j]
+
+    def compare_cached():
+        compare = versions.compare
+        for i, j in pairs:
+            compare(strings[i], strings[j])
+
+    def compare_reparse():
+        for i, j in pairs:
+            parse(strings[i]) < parse(strings[j])
+
+    results["compare_keys"] = timed(len(pairs), compare_keys)
+    results["compare_cached"] = timed(len(pairs), compare_cached)
+    if not args.skip_baseline:
+        results["compare_reparse"] = timed(len(pairs), compare_reparse)
+
+    versions.version_key.cache_clear()
+    results["sort"] = timed(len(strings), lambda: versions.sort_versions(strings))
+    results["max"] = timed(len(strings), lambda: versions.max_version(strings))
+
+    return {
+        "benchmark": "versions",
+        "distinct_versions": len(set(strings)),
+        "results": results,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark version comparisons")
+    parser.add_argument("--comparisons", type=int, default=1_000_000)
+    parser.add_argument(
+        "--size", type=int, default=10_000, help="Versions to sort and compare"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--skip-baseline",
+        action="store_true",
+        help="Do not time comparisons that re-parse both versions",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    print(json.dumps(run(parse_args(argv)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
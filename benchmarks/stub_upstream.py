@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Local stand-in for the upstream version APIs, used by the benchmarks.
+
+Serves, over HTTP/1.1 with keep-alive:
+
+    /chrome/{code}/channels/{channel}/versions  Chrome versionhistory shape
+    /edge/api/products                          Edge products feed shape
+    /firefox/firefox_versions.json              Mozilla product-details shape
+    /firefox/mobile_versions.json
+    /safari/index                               Safari release-notes index
+                                                (tests/fixtures copy)
+    /synthetic/{product}/{platform}.json        {"version": ...} padded to size
+
+Every response is delayed by the configured latency. Run it as a separate
+process so it does not compete with the code being measured:
+
+    python benchmarks/stub_upstream.py --port 0 --latency-ms 20 --size 2048
+
+The bound port is printed on the first line of stdout.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+CHROME_CODES = ("win", "mac", "ios", "android")
+CHROME_CHANNELS = ("stable", "beta", "dev", "canary")
+EDGE_PLATFORMS = ("Windows", "MacOS", "Linux", "iOS", "Android")
+
+
+def chrome_versions(count: int = 100) -> bytes:
+    """A versionhistory ``versions`` list, newest first."""
+    versions = [
+        {
+            "name": f"chrome/platforms/win/channels/stable/versions/151.0.{7922 - i}.0",
+            "version": f"151.0.{7922 - i}.0",
+        }
+        for i in range(count)
+    ]
+    return json.dumps({"versions": versions, "nextPageToken": ""}).encode()
+
+
+def edge_products() -> bytes:
+    """An Edge products feed with a few releases per channel and platform."""
+    products = []
+    for channel, major in (("Stable", 151), ("Beta", 152), ("Dev", 153)):
+        releases = [
+            {
+                "ReleaseId": 1000 * major + i,
+                "Platform": platform,
+                "Architecture": architecture,
+                "ProductVersion": f"{major}.0.3000.{i}",
+                "PublishedTime": "2026-10-01T00:00:00",
+                "Artifacts": [
+                    {
+                        "ArtifactName": "msi",
+                        "Location": f"https://example.com/{platform}/{i}.msi",
+                        "Hash": "0" * 64,
+                        "HashAlgorithm": "SHA256",
+                        "SizeInBytes": 170000000,
+                    }
+                ],
+            }
+            for i, platform in enumerate(EDGE_PLATFORMS)
+            for architecture in ("x64", "arm64")
+        ]
+        products.append({"Product": channel, "Releases": releases})
+    return json.dumps(products).encode()
+
+
+def firefox_desktop() -> bytes:
+    return json.dumps(
+        {
+            "FIREFOX_AURORA": "",
+            "FIREFOX_DEVEDITION": "152.0b3",
+            "FIREFOX_ESR": "140.4.0esr",
+            "FIREFOX_NIGHTLY": "153.0a1",
+            "LATEST_FIREFOX_DEVEL_VERSION": "152.0b3",
+            "LATEST_FIREFOX_VERSION": "151.0.1",
+        }
+    ).encode()
+
+
+def firefox_mobile() -> bytes:
+    return json.dumps(
+        {"version": "151.0", "ios_version": "151.1", "beta_version": "152.0b3"}
+    ).encode()
+
+
+def synthetic(product: str, platform: str, size: int) -> bytes:
+    """A minimal version document padded to roughly ``size`` bytes."""
+    document = {"product": product, "platform": platform, "version": "1.2.3"}
+    base = len(json.dumps(document)) + len(', "padding": ""')
+    document["padding"] = "x" * max(size - base, 0)
+    return json.dumps(document).encode()
+
+
+def build_routes() -> Dict[str, bytes]:
+    """Bodies for every fixed path."""
+    routes = {
+        f"/chrome/{code}/channels/{channel}/versions": chrome_versions()
+        for code in CHROME_CODES
+        for channel in CHROME_CHANNELS
+    }
+    routes["/edge/api/products"] = edge_products()
+    routes["/firefox/firefox_versions.json"] = firefox_desktop()
+    routes["/firefox/mobile_versions.json"] = firefox_mobile()
+    routes["/safari/index"] = (FIXTURES / "safari-release-notes.json").read_bytes()
+    return routes
+
+
+def _response(status: str, body: bytes) -> bytes:
+    return (
+        f"HTTP/1.1 {status}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    ).encode() + body
+
+
+class StubUpstream:
+    """Asyncio HTTP/1.1 server over the stub routes."""
+
+    def __init__(self, latency: float = 0.0, size: int = 1024):
+        self.latency = latency
+        self.size = size
+        self.responses = {
+            path: _response("200 OK", body) for path, body in build_routes().items()
+        }
+        self._synthetic: Dict[str, bytes] = {}
+        self.requests = 0
+
+    def respond(self, target: str) -> bytes:
+        path = target.split("?", 1)[0]
+        response = self.responses.get(path)
+        if response is not None:
+            return response
+        parts = path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "synthetic" and parts[2].endswith(".json"):
+            if path not in self._synthetic:
+                body = synthetic(parts[1], parts[2][: -len(".json")], self.size)
+                self._synthetic[path] = _response("200 OK", body)
+            return self._synthetic[path]
+        return _response("404 Not Found", b"{}")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                target = head.split(b" ", 2)[1].decode("latin-1")
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(self.respond(target))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(port: int, latency: float, size: int):
+    stub = StubUpstream(latency, size)
+    server = await asyncio.start_server(stub.handle, "127.0.0.1", port, backlog=4096)
+    print(server.sockets[0].getsockname()[1], flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve stub upstream APIs")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--size", type=int, default=1024, help="Synthetic response size in bytes"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        asyncio.run(serve(args.port, args.latency_ms / 1000, args.size))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,35 @@
+import asyncio
 import httpx
 import json
 import logging
-from datetime import datetime
+import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from jsonschema import validate, ValidationError
+from urllib.parse import urlencode
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from jsonschema import ValidationError
+
+from scripts.checkers.codec import JsonCodec, get_codec
+from scripts.checkers.events import current_feed, events_from_state
+from scripts.checkers.files import atomic_write_text
+from scripts.checkers.http_cache import NotModified, ValidatorCache, body_digest
+from scripts.checkers.schema import CompiledSchema, get_compiled_schema
+from scripts.checkers.session import client_options, current_session
+from scripts.checkers.state import ProductState
+from scripts.checkers.streaming import JsonArrayItems, PathPart
+from scripts.history import HistoryStore
+from scripts.versions import is_downgrade
 
 logger = logging.getLogger(__name__)
 
@@ -12,16 +37,43 @@ logger = logging.getLogger(__name__)
 class BaseVersionChecker:
     """Base class for version checkers with platform support."""
 
+    # Ask upstream APIs for the smallest payload that answers the question
+    minimal_requests = True
+
+    # Maximum number of platforms fetched at the same time by update()
+    max_concurrency = 8
+
+    # Whether update() stores a version older than the one already tracked.
+    # Off by default: a lagging mirror or CDN node would otherwise roll the
+    # data back until the next run.
+    allow_downgrades = False
+
     def __init__(self, product_name: str):
         """Initialize checker with product name.
 
         Args:
             product_name: Name of the product (e.g., 'chrome', 'firefox')
         """
+        self.product_name = product_name
         self.base_dir = Path(__file__).parent.parent.parent
         self.data_file = self.base_dir / "data" / f"{product_name}.json"
         self.schema_file = self.base_dir / "schemas" / "product.schema.json"
-        self.schema = self.load_schema()
+        # Decodes responses and data files, encodes data files
+        self.codec: JsonCodec = get_codec()
+        self.compiled_schema = self.load_compiled_schema()
+        self.schema = self.compiled_schema.schema
+        # URLs whose previously extracted versions are in the data file and
+        # may therefore be revalidated with a conditional request
+        self._revalidate_urls: Set[str] = set()
+        self._fetched_urls: Set[str] = set()
+        self.state: Optional[ProductState] = None
+        # Transfer accounting for this checker, see transfer_stats()
+        self.requests_made = 0
+        self.bytes_downloaded = 0
+        self.decode_seconds = 0.0
+        self.queue_wait_seconds = 0.0
+        # (platform, stored version, rejected version) from the last update()
+        self.rejected_downgrades: List[Tuple[str, str, str]] = []
 
     def get_initial_data(self) -> Dict[str, Any]:
         """Get initial data structure. Should be overridden by subclasses."""
@@ -30,13 +82,11 @@ class BaseVersionChecker:
     def ensure_data_file(self):
         """Create data file with initial structure if it doesn't exist."""
         if not self.data_file.exists():
-            self.data_file.parent.mkdir(parents=True, exist_ok=True)
             initial_data = self.get_initial_data()
             try:
-                validate(instance=initial_data, schema=self.schema)
-                with open(self.data_file, "w") as f:
-                    json.dump(initial_data, f, indent=2)
-                    f.write("\n")
+                serialized = self.serialize_data(initial_data)
+                self.compiled_schema.validate_document(serialized, initial_data)
+                atomic_write_text(self.data_file, serialized)
             except Exception as e:
                 logger.error(f"Failed to create initial data file: {e}")
                 raise
@@ -47,19 +97,23 @@ class BaseVersionChecker:
         self.ensure_data_file()
 
         try:
-            with open(self.data_file, "r") as f:
-                data = json.load(f)
-                validate(instance=data, schema=self.schema)
-                return data
+            with open(self.data_file, "rb") as f:
+                raw = f.read()
+            data = self.codec.loads(raw)
+            self.compiled_schema.validate_document(raw, data)
+            return data
         except Exception as e:
             logger.error(f"Error reading/validating data file: {e}")
             raise
 
     def load_schema(self) -> Dict[str, Any]:
         """Load the JSON schema for validation."""
+        return self.load_compiled_schema().schema
+
+    def load_compiled_schema(self) -> CompiledSchema:
+        """Get the shared compiled validator for the product schema."""
         try:
-            with open(self.schema_file, "r") as f:
-                return json.load(f)
+            return get_compiled_schema(self.schema_file)
         except FileNotFoundError:
             logger.error(f"Schema file not found at {self.schema_file}")
             raise
@@ -78,68 +132,452 @@ class BaseVersionChecker:
         """
         raise NotImplementedError("Subclasses must implement fetch_latest_version")
 
+    async def fetch_latest_versions(
+        self, platforms: List[str], max_concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Fetch the latest version information for several platforms.
+
+        The default calls ``fetch_latest_version`` for each platform
+        concurrently. Checkers whose upstream returns many platforms in one
+        payload override this to fetch once and extract every platform in a
+        single pass.
+
+        Args:
+            platforms: Target platforms
+            max_concurrency: Platforms fetched at once by the default
+                implementation (default: ``self.max_concurrency``)
+
+        Returns:
+            Mapping of platform to its version info dict, None if the fetch
+            failed, or the exception it raised (``NotModified`` included).
+            Platforms missing from the mapping count as failed.
+        """
+        semaphore = asyncio.Semaphore(max(max_concurrency or self.max_concurrency, 1))
+
+        async def fetch(platform: str) -> Any:
+            async with semaphore:
+                try:
+                    return await self.fetch_latest_version(platform)
+                except Exception as e:
+                    return e
+
+        results = await asyncio.gather(*(fetch(platform) for platform in platforms))
+        return dict(zip(platforms, results))
+
+    def load_state(self) -> ProductState:
+        """Load the data file into a fresh ``ProductState`` for this run."""
+        self.state = ProductState(
+            self.data_file,
+            self.read_current_data(),
+            self.compiled_schema,
+            self.serialize_data,
+        )
+        return self.state
+
     def get_supported_platforms(self) -> List[str]:
         """Get list of platforms supported by this product."""
-        data = self.read_current_data()
-        return data.get("platforms", [])
+        state = self.state or self.load_state()
+        return state.data.get("platforms", [])
+
+    def serialize_data(self, data: Dict[str, Any]) -> str:
+        """Serialize product data exactly as it is stored on disk."""
+        return self.codec.dumps_pretty(data)
 
     def write_updated_data(self, data: Dict[str, Any]):
         """Validate and write updated data back to the data file."""
         try:
-            validate(instance=data, schema=self.schema)
-
-            with open(self.data_file, "w") as f:
-                json.dump(data, f, indent=2)
-                f.write("\n")
+            serialized = self.serialize_data(data)
+            self.compiled_schema.validate_document(serialized, data)
+            atomic_write_text(self.data_file, serialized)
 
         except ValidationError as e:
             logger.error(f"Updated data fails schema validation: {e}")
             raise
 
+    def transfer_stats(self) -> Dict[str, Any]:
+        """Requests made, bytes on the wire, decode time and scheduler queue time."""
+        return {
+            "requests": self.requests_made,
+            "bytes_downloaded": self.bytes_downloaded,
+            "decode_ms": round(self.decode_seconds * 1000, 3),
+            "queue_wait_ms": round(self.queue_wait_seconds * 1000, 3),
+        }
+
+    def measure(
+        self, stage: str, platform: Optional[str] = None, url: Optional[str] = None
+    ) -> ContextManager[None]:
+        """Time a ``with`` block as ``stage`` in the run metrics.
+
+        Outside an ``HttpSession`` nothing is recorded.
+
+        Args:
+            stage: Stage name, e.g. ``"extract"`` (see ``metrics.STAGES``)
+            platform: Platform the work was for, if it was for one
+            url: URL whose response the work was on, if any
+        """
+        session = current_session()
+        if session is None:
+            return nullcontext()
+        return session.metrics.time(stage, self.product_name, platform, url)
+
+    def _observe(self, stage: str, seconds: float, **labels: Optional[str]):
+        session = current_session()
+        if session is not None:
+            session.metrics.observe(stage, seconds, self.product_name, **labels)
+
+    def _extensions(self) -> Dict[str, Any]:
+        # Lets the session scheduler share hosts fairly between products
+        return {"product": self.product_name}
+
+    def _count_request(self, response: httpx.Response):
+        self.requests_made += 1
+        self.queue_wait_seconds += response.extensions.get("queue_wait", 0.0)
+
     async def get_client(self) -> httpx.AsyncClient:
-        """Get a configured HTTP client."""
-        return httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0, connect=5.0),
-            headers={
-                "User-Agent": "Mozilla/5.0 (compatible; version-checker/1.0)",
-                "Accept": "application/json",
-            },
-            follow_redirects=True,
-        )
+        """Get a configured HTTP client.
+
+        Inside an ``HttpSession`` the run's pooled client is borrowed;
+        otherwise a standalone client is created. Either way the result is
+        meant to be used as ``async with await self.get_client() as client``.
+        """
+        session = current_session()
+        if session is not None:
+            return session.borrow()
+        return httpx.AsyncClient(**client_options())
+
+    async def fetch_json(
+        self, url: str, params: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """Fetch and decode a JSON document.
+
+        Inside an ``HttpSession`` identical requests are made once per run and
+        the decoded body is shared, so callers must treat it as read-only.
+
+        Args:
+            url: Document URL, also the key for conditional requests
+            params: Query parameters, e.g. to have the server trim the payload
+        """
+        key = url if not params else f"{url}?{urlencode(sorted(params.items()))}"
+        return await self.coalesce(url, key, lambda: self._get_json(url, params))
+
+    async def coalesce(
+        self, url: str, key: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Share the result of ``fetch`` for ``key`` within the current run.
+
+        Args:
+            url: URL the fetch requests, tracked for the validator cache
+            key: Coalescing key; results for equal keys are shared
+            fetch: Coroutine factory performing the request
+        """
+        session = current_session()
+        if session is None:
+            return await fetch()
+        self._fetched_urls.add(url)
+        return await session.coalesce(key, fetch)
 
-    async def update(self, platforms: Optional[List[str]] = None) -> bool:
-        """Update version information for specified platforms."""
+    def _conditional(self, url: str) -> Tuple[Optional[ValidatorCache], bool]:
+        """Validator cache for this run and whether ``url`` may be revalidated."""
+        session = current_session()
+        cache = session.validator_cache if session is not None else None
+        # Only short-circuit when the data file holds a version extracted
+        # from this URL; otherwise there is nothing to fall back to
+        return cache, cache is not None and url in self._revalidate_urls
+
+    async def _get_json(
+        self, url: str, params: Optional[Dict[str, str]] = None
+    ) -> Any:
+        cache, revalidate = self._conditional(url)
+        headers = cache.request_headers(url) if revalidate else {}
+        async with await self.get_client() as client:
+            response = await client.get(
+                url, headers=headers, params=params, extensions=self._extensions()
+            )
+            self._count_request(response)
+            self.bytes_downloaded += response.num_bytes_downloaded
+            if revalidate and response.status_code == 304:
+                cache.record_not_modified(url)
+                raise NotModified(url)
+            response.raise_for_status()
+
+            if cache is not None:
+                unchanged = cache.record_response(
+                    url,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    body_digest(response.content),
+                    revalidate,
+                )
+                if unchanged:
+                    raise NotModified(url)
+
+            start = time.perf_counter()
+            data = self.codec.loads(response.content)
+            elapsed = time.perf_counter() - start
+            self.decode_seconds += elapsed
+            self._observe("decode", elapsed, url=url)
+            return data
+
+    async def stream_json_find(
+        self,
+        url: str,
+        path: Sequence[PathPart],
+        predicate: Callable[[Any], bool],
+    ) -> Optional[Any]:
+        """Find the first matching item of an array without downloading it all.
+
+        The response body is parsed incrementally as it arrives; as soon as
+        an item of the array at ``path`` satisfies ``predicate`` the response
+        is closed and the rest of the document is never read.
+
+        Args:
+            url: Document to fetch
+            path: Object keys and array indexes leading to the array
+            predicate: Test applied to each item in order
+
+        Returns:
+            The first matching item, or None if no item matched
+
+        Raises:
+            ValueError: If the document has no array at ``path``
+        """
+        cache, revalidate = self._conditional(url)
+        headers = cache.request_headers(url) if revalidate else {}
+        parser = JsonArrayItems(path)
+        decode_seconds = 0.0
+        async with await self.get_client() as client:
+            async with client.stream(
+                "GET", url, headers=headers, extensions=self._extensions()
+            ) as response:
+                self._count_request(response)
+                try:
+                    if revalidate and response.status_code == 304:
+                        cache.record_not_modified(url)
+                        raise NotModified(url)
+                    response.raise_for_status()
+                    if cache is not None:
+                        # The body is never fully read, so no digest is kept
+                        cache.record_response(
+                            url,
+                            response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"),
+                            None,
+                            False,
+                        )
+
+                    async for chunk in response.aiter_bytes():
+                        start = time.perf_counter()
+                        items = parser.feed(chunk)
+                        decode_seconds += time.perf_counter() - start
+                        for item in items:
+                            if predicate(item):
+                                return item
+                        if parser.done:
+                            return None
+                finally:
+                    self.bytes_downloaded += response.num_bytes_downloaded
+                    self.decode_seconds += decode_seconds
+                    if decode_seconds:
+                        self._observe("decode", decode_seconds, url=url)
+
+        if not parser.found:
+            raise ValueError(f"No array at {'/'.join(map(str, path))} in {url}")
+        return None
+
+    @property
+    def history_dir(self) -> Path:
+        """Directory of the append-only version history, next to the data."""
+        return self.data_file.parent / "history"
+
+    def record_history(self, state: ProductState):
+        """Append the version changes in ``state`` to the history store."""
+        history = HistoryStore(self.history_dir)
+        timestamp = state.data["metadata"]["last_checked"]
+        for change in state.changes:
+            if change.field == "version":
+                history.append(
+                    self.product_name,
+                    change.platform,
+                    change.new,
+                    previous=change.old,
+                    timestamp=timestamp,
+                )
+
+    def _known_check_urls(
+        self, data: Dict[str, Any], platforms: List[str]
+    ) -> Set[str]:
+        """Check URLs for which every target platform has a real version."""
+        known: Set[str] = set()
+        placeholder: Set[str] = set()
+        entries = data["versions"].get("platforms", {})
+        for platform in platforms:
+            entry = entries.get(platform)
+            if entry is None:
+                continue
+            if entry.get("version", "0.0.0") == "0.0.0":
+                placeholder.add(entry["check_url"])
+            else:
+                known.add(entry["check_url"])
+            known.update(
+                channel["check_url"]
+                for channel in entry.get("channels", {}).values()
+                if "check_url" in channel
+            )
+        return known - placeholder
+
+    def _settle_validator_cache(self, success: bool):
+        """Commit or drop validators staged by this checker's requests."""
+        session = current_session()
+        if session is None or session.validator_cache is None:
+            return
+        if success:
+            session.validator_cache.commit(self._fetched_urls)
+        else:
+            session.validator_cache.invalidate(self._fetched_urls)
+
+    def _merge_channels(
+        self,
+        platform: str,
+        stored: Dict[str, Dict[str, Any]],
+        fetched: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Combine stored and freshly fetched channel versions of a platform.
+
+        A channel missing from ``fetched`` (not in the payload, or its
+        request failed) keeps its stored version, and channel downgrades
+        are rejected like stable ones.
+        """
+        channels = dict(stored)
+        for channel, info in fetched.items():
+            current = stored.get(channel, {}).get("version")
+            if not self.allow_downgrades and is_downgrade(current, info["version"]):
+                logger.warning(
+                    f"Ignoring {platform} {channel} downgrade from {current} "
+                    f"to {info['version']}"
+                )
+                self.rejected_downgrades.append(
+                    (f"{platform}/{channel}", current, info["version"])
+                )
+                continue
+            channels[channel] = info
+        return dict(sorted(channels.items()))
+
+    async def _fetch_platforms(
+        self, platforms: List[str], max_concurrency: int
+    ) -> List[Any]:
+        """Fetch all platforms through ``fetch_latest_versions``.
+
+        Returns:
+            One entry per platform, in the same order: the fetched info dict,
+            None, or the exception the fetch raised
+        """
+        try:
+            results = await self.fetch_latest_versions(platforms, max_concurrency)
+        except Exception as e:
+            # A failed batch fetch fails every platform it covered
+            return [e for _ in platforms]
+        return [results.get(platform) for platform in platforms]
+
+    async def update(
+        self,
+        platforms: Optional[List[str]] = None,
+        max_concurrency: Optional[int] = None,
+        touch_last_checked: bool = False,
+    ) -> bool:
+        """Update version information for specified platforms.
+
+        Platforms are fetched through ``fetch_latest_versions``, in one batch
+        when the checker supports it and concurrently per platform otherwise;
+        a failure on one platform does not affect the others. Results are
+        merged in platform order. The data file is only rewritten when a
+        platform entry changed. A version older than the stored one is
+        logged and ignored unless ``allow_downgrades`` is set; ignored
+        versions are listed in ``rejected_downgrades``. Rejecting a stable
+        version does not hold back the platform's channels.
+
+        Fetched info may carry other release channels as ``"channels":
+        {"beta": {"version": ..., "check_url": ...}, ...}``; they are stored
+        under the platform entry next to the stable ``version``.
+
+        Args:
+            platforms: Platforms to check (default: all supported platforms)
+            max_concurrency: Platforms fetched at once (default:
+                ``self.max_concurrency``)
+            touch_last_checked: Bump ``metadata.last_checked`` and rewrite
+                the file even if nothing changed
+        """
         try:
-            current_data = self.read_current_data()
+            state = self.load_state()
             target_platforms = platforms or self.get_supported_platforms()
             success = True
 
-            for platform in target_platforms:
+            self._revalidate_urls = self._known_check_urls(
+                state.data, target_platforms
+            )
+            self._fetched_urls = set()
+            self.rejected_downgrades = []
+            results = await self._fetch_platforms(
+                target_platforms, max_concurrency or self.max_concurrency
+            )
+
+            for platform, latest_info in zip(target_platforms, results):
                 try:
-                    latest_info = await self.fetch_latest_version(platform)
+                    if isinstance(latest_info, NotModified):
+                        if platform not in state.platforms:
+                            raise ValueError("unchanged upstream but no stored version")
+                        logger.info(f"{platform} unchanged upstream, keeping version")
+                        continue
+                    if isinstance(latest_info, Exception):
+                        raise latest_info
                     if not latest_info:
                         logger.error(f"Failed to fetch latest version for {platform}")
                         success = False
                         continue
 
-                    if "platforms" not in current_data["versions"]:
-                        current_data["versions"]["platforms"] = {}
+                    stored = state.platforms.get(platform, {})
+                    current = stored.get("version")
+                    if not self.allow_downgrades and is_downgrade(
+                        current, latest_info["version"]
+                    ):
+                        logger.warning(
+                            f"Ignoring {platform} downgrade from {current} to "
+                            f"{latest_info['version']} reported by "
+                            f"{latest_info['check_url']}"
+                        )
+                        self.rejected_downgrades.append(
+                            (platform, current, latest_info["version"])
+                        )
+                        # Keep the stored stable version; channels still update
+                        source = stored
+                    else:
+                        source = latest_info
 
-                    current_data["versions"]["platforms"][platform] = {
-                        "version": latest_info["version"],
-                        "check_url": latest_info["check_url"],
-                        "check_method": latest_info["check_method"],
+                    entry = {
+                        "version": source["version"],
+                        "check_url": source["check_url"],
+                        "check_method": source["check_method"],
                     }
+                    channels = self._merge_channels(
+                        platform,
+                        stored.get("channels", {}),
+                        latest_info.get("channels", {}),
+                    )
+                    if channels:
+                        entry["channels"] = channels
+                    state.set_platform(platform, entry)
 
                 except Exception as e:
                     logger.error(f"Error updating {platform} version: {e}")
                     success = False
 
-            current_data["metadata"]["last_checked"] = (
-                datetime.utcnow().isoformat() + "Z"
-            )
-
-            self.write_updated_data(current_data)
+            if state.save(touch_last_checked=touch_last_checked):
+                for stage, seconds in state.timings.items():
+                    self._observe(stage, seconds)
+                self.record_history(state)
+                feed = current_feed()
+                if feed is not None:
+                    await feed.publish(events_from_state(self.product_name, state))
+            self._settle_validator_cache(success)
             return success
 
         except Exception as e:
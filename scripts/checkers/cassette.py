@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from scripts.checkers.files import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_FORMAT_VERSION = 1
+
+# Headers that describe the original connection rather than the response
+_SKIPPED_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-length"}
+
+
+class CassetteMissError(httpx.TransportError):
+    """Raised in replay mode for a request that was never recorded.
+
+    It is an ``httpx.HTTPError``, so checkers report the platform as failed
+    like any other upstream error, but it is not retried.
+    """
+
+
+def interaction_key(method: str, url: str) -> str:
+    """Return the cassette key for a request: method plus URL, query sorted."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit(parts._replace(query=query, fragment=''))}"
+
+
+class Cassette:
+    """Directory of recorded HTTP interactions.
+
+    Layout:
+        index.json          key -> status, headers and body digest
+        bodies/<sha256>     raw response bodies, stored once per content
+
+    Bodies are kept exactly as received, still content-encoded, so replay
+    goes through the same decoding path as a live run.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.interactions: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    @property
+    def index_file(self) -> Path:
+        return self.path / "index.json"
+
+    def load(self):
+        try:
+            data = json.loads(self.index_file.read_text())
+        except FileNotFoundError:
+            return
+        if data.get("version") != CASSETTE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported cassette format in {self.index_file}")
+        self.interactions = data["interactions"]
+
+    def save(self):
+        atomic_write_text(
+            self.index_file,
+            json.dumps(
+                {
+                    "version": CASSETTE_FORMAT_VERSION,
+                    "interactions": dict(sorted(self.interactions.items())),
+                },
+                indent=2,
+            )
+            + "\n",
+        )
+
+    def put(self, key: str, status: int, headers: List[Tuple[str, str]], body: bytes):
+        """Record a response, replacing any earlier one for the same key."""
+        digest = hashlib.sha256(body).hexdigest()
+        body_file = self.path / "bodies" / digest
+        if not body_file.exists():
+            body_file.parent.mkdir(parents=True, exist_ok=True)
+            body_file.write_bytes(body)
+        self.interactions[key] = {
+            "status": status,
+            "headers": [
+                [name, value]
+                for name, value in headers
+                if name.lower() not in _SKIPPED_HEADERS
+            ],
+            "body": digest,
+        }
+
+    def get(self, key: str) -> Optional[Tuple[int, List[Tuple[str, str]], bytes]]:
+        """Return ``(status, headers, body)`` recorded for ``key``, if any."""
+        interaction = self.interactions.get(key)
+        if interaction is None:
+            return None
+        body = (self.path / "bodies" / interaction["body"]).read_bytes()
+        headers = [(name, value) for name, value in interaction["headers"]]
+        return interaction["status"], headers, body
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transport that passes requests through and records every response.
+
+    ``304 Not Modified`` answers are passed through but not recorded, since
+    replaying one to an unconditional request would leave nothing to parse.
+    The cassette index is written when the transport is closed.
+    """
+
+    def __init__(self, cassette: Cassette, inner: httpx.AsyncBaseTransport):
+        self.cassette = cassette
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._inner.handle_async_request(request)
+        try:
+            body = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        if response.status_code != 304:
+            key = interaction_key(request.method, str(request.url))
+            self.cassette.put(
+                key, response.status_code, response.headers.multi_items(), body
+            )
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(body),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        try:
+            await self._inner.aclose()
+        finally:
+            self.cassette.save()
+            logger.info(
+                f"Recorded {len(self.cassette.interactions)} interactions "
+                f"to {self.cassette.path}"
+            )
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Transport that answers from a cassette without touching the network."""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: float = 0.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        """Serve recorded responses.
+
+        Args:
+            cassette: Recorded interactions
+            latency: Seconds to wait before each response, to simulate the
+                network
+            sleep: Coroutine used to wait (injectable for tests)
+        """
+        self.cassette = cassette
+        self.latency = latency
+        self._sleep = sleep
+        self.hits = 0
+        self.misses = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        recorded = self.cassette.get(interaction_key(request.method, str(request.url)))
+        if recorded is None:
+            self.misses += 1
+            raise CassetteMissError(
+                f"No recorded response for {request.method} {request.url}",
+                request=request,
+            )
+        self.hits += 1
+        if self.latency:
+            await self._sleep(self.latency)
+        status, headers, body = recorded
+        headers.append(("Content-Length", str(len(body))))
+        return httpx.Response(status, headers=headers, stream=httpx.ByteStream(body))
+
+    async def aclose(self):
+        logger.info(
+            f"Replayed {self.hits} responses from {self.cassette.path} "
+            f"({self.misses} not recorded)"
+        )
+
+
+def cassette_transport(
+    mode: str, path: Path, latency: float = 0.0, **transport_options
+) -> httpx.AsyncBaseTransport:
+    """Build the transport for a record or replay run.
+
+    Args:
+        mode: ``"record"`` or ``"replay"``
+        path: Cassette directory
+        latency: Replay only: seconds to wait before each response
+        **transport_options: Record only: passed to ``httpx.AsyncHTTPTransport``
+
+    Returns:
+        A transport to pass as ``HttpSession(transport=...)``
+    """
+    if mode == "record":
+        return RecordingTransport(
+            Cassette(path), httpx.AsyncHTTPTransport(**transport_options)
+        )
+    if mode == "replay":
+        if not (Path(path) / "index.json").exists():
+            raise FileNotFoundError(f"No cassette at {path}")
+        return ReplayTransport(Cassette(path), latency=latency)
+    raise ValueError(f"Unknown cassette mode: {mode}")
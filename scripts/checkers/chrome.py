@@ -4,14 +4,15 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+import asyncio
 import httpx
 import logging
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
 from scripts.checkers.base_checker import BaseVersionChecker
+from scripts.checkers.http_cache import NotModified
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +28,8 @@ class ChromeVersionChecker(BaseVersionChecker):
             "ios": "ios",
             "android": "android",
         }
+        # Channels fetched next to stable, each from its own versions list
+        self.channels = ["beta", "dev", "canary"]
 
     def get_initial_data(self) -> Dict[str, Any]:
         """Get initial data structure for Chrome."""
@@ -48,35 +51,87 @@ class ChromeVersionChecker(BaseVersionChecker):
             "metadata": {"last_checked": datetime.utcnow().isoformat() + "Z"},
         }
 
-    def _get_platform_url(self, platform: str) -> str:
-        """Get the version check URL for a specific platform."""
-        return f"{self.base_url}/{self.platform_mapping[platform]}/channels/stable/versions"
+    def _get_platform_url(self, platform: str, channel: str = "stable") -> str:
+        """Get the version check URL for a specific platform and channel."""
+        code = self.platform_mapping[platform]
+        return f"{self.base_url}/{code}/channels/{channel}/versions"
+
+    def _request_params(self) -> Optional[Dict[str, str]]:
+        """Query parameters that trim the versions list to the newest entry."""
+        if not self.minimal_requests:
+            return None
+        return {"order_by": "version desc", "pageSize": "1"}
+
+    async def _fetch_channel_version(self, platform: str, channel: str) -> str:
+        """Fetch the newest version of one channel on a platform."""
+        url = self._get_platform_url(platform, channel)
+        data = await self.fetch_json(url, self._request_params())
+
+        with self.measure("extract", platform, url):
+            if not data or "versions" not in data or not data["versions"]:
+                raise ValueError(
+                    f"Invalid response format from Chrome API for {platform} "
+                    f"{channel}"
+                )
+            return data["versions"][0]["version"]
 
     async def fetch_latest_version(self, platform: str) -> Optional[Dict[str, Any]]:
-        """Fetch the latest Chrome version information for a specific platform."""
+        """Fetch the latest Chrome version information for a specific platform.
+
+        The stable and other channel lists are requested concurrently, so
+        inside an ``HttpSession`` they share the host's connection. A channel
+        that fails or is unchanged upstream is left out and keeps its stored
+        version; only a stable failure fails the platform.
+        """
         if platform not in self.platform_mapping:
             logger.error(f"Unsupported platform: {platform}")
             return None
 
         try:
             url = self._get_platform_url(platform)
-            async with await self.get_client() as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                data = response.json()
-
-                if not data or "versions" not in data or not data["versions"]:
-                    raise ValueError(
-                        f"Invalid response format from Chrome API for {platform}"
-                    )
-
-                version = data["versions"][0]["version"]
+            stable, *channels = await asyncio.gather(
+                self._fetch_channel_version(platform, "stable"),
+                *(
+                    self._fetch_channel_version(platform, channel)
+                    for channel in self.channels
+                ),
+                return_exceptions=True,
+            )
 
-                logger.info(
-                    f"Successfully fetched Chrome {platform} version: {version}"
-                )
-                return {"version": version, "check_url": url, "check_method": "api"}
+            fetched = {}
+            for channel, outcome in zip(self.channels, channels):
+                if isinstance(outcome, str):
+                    fetched[channel] = {
+                        "version": outcome,
+                        "check_url": self._get_platform_url(platform, channel),
+                    }
+                elif not isinstance(outcome, NotModified):
+                    logger.warning(
+                        f"Could not fetch Chrome {platform} {channel} version: "
+                        f"{outcome}"
+                    )
 
+            if isinstance(stable, NotModified):
+                # Stable is unchanged, but other channels may have moved
+                stored = self.state.get_platform(platform) if self.state else None
+                if stored is None or not fetched:
+                    raise stable
+                version = stored["version"]
+            elif isinstance(stable, BaseException):
+                raise stable
+            else:
+                version = stable
+
+            logger.info(f"Successfully fetched Chrome {platform} version: {version}")
+            return {
+                "version": version,
+                "check_url": url,
+                "check_method": "api",
+                "channels": fetched,
+            }
+
+        except NotModified:
+            raise
         except httpx.TimeoutException as e:
             logger.error(f"Timeout while fetching Chrome {platform} version: {e}")
             return None
@@ -96,12 +151,11 @@ class ChromeVersionChecker(BaseVersionChecker):
 
 
 async def main():
+    logging.basicConfig(level=logging.INFO)
     checker = ChromeVersionChecker()
     success = await checker.update()
     exit(0 if success else 1)
 
 
 if __name__ == "__main__":
-    import asyncio
-
     asyncio.run(main())
@@ -0,0 +1,133 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Type, Union
+
+# Exponent in a number, e.g. 1e+16: the stdlib and orjson spell it differently
+_EXPONENT = re.compile(rb"\d[eE][-+]?\d")
+
+
+class JsonCodec:
+    """JSON decoding and data-file encoding with the standard library.
+
+    ``dumps_pretty`` defines the on-disk format of ``data/*.json``; the
+    faster backends below must reproduce it byte for byte, so they fall
+    back to this implementation whenever they cannot guarantee that.
+    """
+
+    name = "stdlib"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode a JSON document.
+
+        Raises:
+            json.JSONDecodeError: If ``data`` is not valid JSON
+        """
+        return json.loads(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        """Encode ``obj`` as ``json.dumps(obj, indent=2)`` plus a newline."""
+        return json.dumps(obj, indent=2) + "\n"
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson for decoding and for pretty encoding.
+
+    orjson writes non-ASCII characters as UTF-8 and formats float exponents
+    without a sign or leading zero, where the stdlib escapes and pads them.
+    Output containing either is re-encoded with the stdlib; data files hold
+    ASCII strings only, so in practice they always take the fast path.
+    Documents orjson refuses (NaN when decoding; integers beyond 64 bits or
+    non-string keys when encoding) are handed to the stdlib as well. Note
+    that orjson decodes integers beyond 64 bits as floats.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._pretty = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError:
+            return super().loads(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        try:
+            encoded = self._orjson.dumps(obj, option=self._pretty)
+        except TypeError:
+            return super().dumps_pretty(obj)
+        if not encoded.isascii() or _EXPONENT.search(encoded):
+            return super().dumps_pretty(obj)
+        return encoded.decode("ascii")
+
+
+class MsgspecCodec(JsonCodec):
+    """msgspec for decoding; pretty encoding stays with the stdlib.
+
+    msgspec's formatter does not lay documents out exactly like
+    ``json.dumps(indent=2)``, so only decoding is delegated to it.
+    """
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._decode = msgspec.json.decode
+        self._error = msgspec.DecodeError
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decode(data)
+        except self._error:
+            return super().loads(data)
+
+
+# Backends in order of preference
+CODECS: Dict[str, Type[JsonCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "stdlib": JsonCodec,
+}
+
+_default: Optional[JsonCodec] = None
+
+
+def available_codecs() -> List[str]:
+    """Names of the backends that can be used in this environment."""
+    names = []
+    for name, codec_class in CODECS.items():
+        try:
+            codec_class()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """Return a JSON codec.
+
+    Args:
+        name: Backend to use (see ``CODECS``); by default the fastest one
+            installed, chosen once per process
+
+    Raises:
+        ImportError: If the requested backend is not installed
+        KeyError: If ``name`` is not a known backend
+    """
+    global _default
+    if name is not None:
+        return CODECS[name]()
+    if _default is None:
+        for codec_class in CODECS.values():
+            try:
+                _default = codec_class()
+            except ImportError:
+                continue
+            break
+    return _default
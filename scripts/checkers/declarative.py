@@ -0,0 +1,249 @@
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import httpx
+
+from scripts.checkers.base_checker import BaseVersionChecker
+from scripts.checkers.codec import get_codec
+from scripts.checkers.http_cache import NotModified
+from scripts.checkers.schema import get_compiled_schema
+
+logger = logging.getLogger(__name__)
+
+DEFINITION_SCHEMA = (
+    Path(__file__).parent.parent.parent / "schemas" / "checker-definition.schema.json"
+)
+
+# Keys a platform entry may override from the top level of a definition
+FETCH_KEYS = ("url", "params", "path", "strip_prefix")
+
+
+def load_definition(path: Path) -> Dict[str, Any]:
+    """Read and validate a checker definition file.
+
+    Args:
+        path: JSON definition file
+
+    Returns:
+        The parsed definition
+
+    Raises:
+        jsonschema.ValidationError: If the definition is malformed
+    """
+    with open(path, "rb") as f:
+        definition = get_codec().loads(f.read())
+    get_compiled_schema(DEFINITION_SCHEMA).validate(definition)
+    return definition
+
+
+def _template(value: str, variables: Mapping[str, str]) -> str:
+    return value.format_map(variables)
+
+
+def extract(document: Any, path: Sequence[Any], variables: Mapping[str, str]) -> Any:
+    """Follow a definition ``path`` through a decoded JSON document.
+
+    Steps are object keys, array indexes, or ``{"match": {...}}`` objects
+    selecting the first array item whose fields equal the (templated)
+    values, compared case-insensitively when ``ignore_case`` is set.
+
+    Raises:
+        ValueError: If a step does not resolve
+    """
+    current = document
+    for step in path:
+        if isinstance(step, dict):
+            ignore_case = step.get("ignore_case", False)
+            wanted = {
+                field: _template(value, variables)
+                for field, value in step["match"].items()
+            }
+            if ignore_case:
+                wanted = {field: value.lower() for field, value in wanted.items()}
+
+            def matches(item: Any) -> bool:
+                if not isinstance(item, dict):
+                    return False
+                for field, value in wanted.items():
+                    actual = item.get(field)
+                    if not isinstance(actual, str):
+                        return False
+                    if (actual.lower() if ignore_case else actual) != value:
+                        return False
+                return True
+
+            current = next((item for item in current if matches(item)), None)
+            if current is None:
+                raise ValueError(f"No item matches {wanted}")
+        else:
+            try:
+                current = current[step]
+            except (KeyError, IndexError, TypeError):
+                raise ValueError(f"Path step {step!r} not found") from None
+    return current
+
+
+class JsonApiChecker(BaseVersionChecker):
+    """Checker driven by a declarative definition instead of code.
+
+    A definition names the product, gives a URL template (with optional
+    query parameters) and an extraction ``path``, at the top level and/or
+    per platform. See ``schemas/checker-definition.schema.json``.
+
+    Platforms whose templated request is identical share one fetch and
+    one decoded document.
+    """
+
+    def __init__(self, definition: Mapping[str, Any]):
+        """Create a checker from a validated definition.
+
+        Args:
+            definition: Parsed definition (see ``load_definition``)
+        """
+        super().__init__(definition["identifier"])
+        self.definition = definition
+        self.check_method = definition.get("check_method", "api")
+        self.platform_specs: Dict[str, Dict[str, Any]] = {}
+        for platform, overrides in definition["platforms"].items():
+            spec = {key: definition[key] for key in FETCH_KEYS if key in definition}
+            spec.update(
+                (key, overrides[key]) for key in FETCH_KEYS if key in overrides
+            )
+            missing = [key for key in ("url", "path") if key not in spec]
+            if missing:
+                raise ValueError(
+                    f"Definition {self.product_name} gives no {', '.join(missing)} "
+                    f"for {platform}"
+                )
+            variables = {"platform": platform, **overrides.get("vars", {})}
+            spec["url"] = _template(spec["url"], variables)
+            spec["params"] = {
+                name: _template(value, variables)
+                for name, value in spec.get("params", {}).items()
+            }
+            spec["variables"] = variables
+            self.platform_specs[platform] = spec
+
+    def get_initial_data(self) -> Dict[str, Any]:
+        """Get initial data structure from the definition."""
+        return {
+            "name": self.definition["name"],
+            "identifier": self.product_name,
+            "type": self.definition["type"],
+            "platforms": self.get_supported_platforms(),
+            "versions": {
+                "platforms": {
+                    platform: {
+                        "version": "0.0.0",  # Placeholder version
+                        "check_url": spec["url"],
+                        "check_method": self.check_method,
+                    }
+                    for platform, spec in self.platform_specs.items()
+                }
+            },
+            "metadata": {"last_checked": datetime.utcnow().isoformat() + "Z"},
+        }
+
+    def get_supported_platforms(self) -> List[str]:
+        """Return list of supported platforms."""
+        return list(self.platform_specs)
+
+    def _params(self, spec: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        return spec["params"] if self.minimal_requests and spec["params"] else None
+
+    def _extract_version(self, document: Any, platform: str) -> str:
+        spec = self.platform_specs[platform]
+        version = extract(document, spec["path"], spec["variables"])
+        if not isinstance(version, str) or not version:
+            raise ValueError(f"Extracted value {version!r} is not a version string")
+        prefix = spec.get("strip_prefix")
+        if prefix and version.startswith(prefix):
+            version = version[len(prefix) :]
+        return version
+
+    def _version_info(self, platform: str, version: str) -> Dict[str, Any]:
+        return {
+            "version": version,
+            "check_url": self.platform_specs[platform]["url"],
+            "check_method": self.check_method,
+        }
+
+    async def fetch_latest_version(self, platform: str) -> Optional[Dict[str, Any]]:
+        """Fetch the latest version information for a specific platform."""
+        results = await self.fetch_latest_versions([platform])
+        result = results[platform]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def fetch_latest_versions(
+        self, platforms: List[str], max_concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Fetch each distinct request once and extract every platform from it.
+
+        Distinct requests are made concurrently, at most ``max_concurrency``
+        (default: ``self.max_concurrency``) at a time.
+        """
+        name = self.definition["name"]
+        results: Dict[str, Any] = {}
+        groups: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[str]] = {}
+        for platform in platforms:
+            spec = self.platform_specs.get(platform)
+            if spec is None:
+                logger.error(f"Unsupported platform: {platform}")
+                results[platform] = None
+                continue
+            key = (spec["url"], tuple(sorted((self._params(spec) or {}).items())))
+            groups.setdefault(key, []).append(platform)
+
+        semaphore = asyncio.Semaphore(max(max_concurrency or self.max_concurrency, 1))
+
+        async def fetch_group(
+            url: str, params: Tuple[Tuple[str, str], ...], group: List[str]
+        ):
+            try:
+                async with semaphore:
+                    logger.info(f"Fetching {name} versions from {url}")
+                    document = await self.fetch_json(url, dict(params) or None)
+            except NotModified as e:
+                results.update((platform, e) for platform in group)
+                return
+            except httpx.TimeoutException as e:
+                logger.error(f"Timeout while fetching {name} versions: {e}")
+                results.update((platform, None) for platform in group)
+                return
+            except httpx.HTTPError as e:
+                logger.error(f"HTTP error while fetching {name} versions: {e}")
+                results.update((platform, None) for platform in group)
+                return
+            except Exception as e:
+                logger.error(
+                    f"Unexpected error while fetching {name} versions: {str(e)}",
+                    exc_info=True,
+                )
+                results.update((platform, None) for platform in group)
+                return
+
+            for platform in group:
+                try:
+                    with self.measure("extract", platform, url):
+                        version = self._extract_version(document, platform)
+                except ValueError as e:
+                    logger.error(f"Error parsing {name} version for {platform}: {e}")
+                    results[platform] = None
+                    continue
+                logger.info(
+                    f"Successfully fetched {name} {platform} version: {version}"
+                )
+                results[platform] = self._version_info(platform, version)
+
+        await asyncio.gather(
+            *(
+                fetch_group(url, params, group)
+                for (url, params), group in groups.items()
+            )
+        )
+        return results
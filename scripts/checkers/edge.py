@@ -10,8 +10,8 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List
 
 from scripts.checkers.base_checker import BaseVersionChecker
+from scripts.checkers.http_cache import NotModified
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +22,8 @@ class EdgeVersionChecker(BaseVersionChecker):
         super().__init__("edge")
         self.api_url = "https://edgeupdates.microsoft.com/api/products"
         self.supported_platforms = ["windows", "macos", "linux", "ios", "android"]
+        # Products of the feed tracked as channels besides Stable
+        self.channel_products = {"Beta": "beta", "Dev": "dev", "Canary": "canary"}
 
     def get_initial_data(self) -> Dict[str, Any]:
         """Get initial data structure for Edge."""
@@ -43,37 +45,56 @@ class EdgeVersionChecker(BaseVersionChecker):
             "metadata": {"last_checked": datetime.utcnow().isoformat() + "Z"},
         }
 
-    def _extract_version_from_json(
+    def _index_versions(self, data: List[Dict[str, Any]]) -> Dict[str, Dict[str, str]]:
+        """Map each platform to its version per channel in one pass over the payload.
+
+        Returns:
+            ``{platform: {"stable": ..., "beta": ..., ...}}``; a channel a
+            platform has no release on is left out
+        """
+        products = {product["Product"]: product for product in data}
+        if "Stable" not in products:
+            raise ValueError("No stable product found")
+
+        versions: Dict[str, Dict[str, str]] = {}
+        for name, channel in [("Stable", "stable"), *self.channel_products.items()]:
+            product = products.get(name)
+            if product is None:
+                continue
+            # Releases of one platform share a version, so the first one wins
+            for release in product["Releases"]:
+                versions.setdefault(release["Platform"].lower(), {}).setdefault(
+                    channel, release["ProductVersion"]
+                )
+        return versions
+
+    def _extract_versions_from_json(
         self, data: List[Dict[str, Any]], platform: str
-    ) -> Optional[str]:
-        """Extract the latest stable version for a specific platform."""
+    ) -> Optional[Dict[str, str]]:
+        """Extract the latest version per channel for a specific platform."""
         try:
-            # Find the stable product
-            stable_product = next(
-                (product for product in data if product["Product"] == "Stable"),
-                None,
-            )
-            if not stable_product:
-                raise ValueError("No stable product found")
-
-            # Find releases for the specified platform
-            platform_releases = [
-                release
-                for release in stable_product["Releases"]
-                if release["Platform"].lower() == platform
-            ]
-            if not platform_releases:
+            versions = self._index_versions(data).get(platform, {})
+            if "stable" not in versions:
                 raise ValueError(f"No releases found for platform {platform}")
-
-            # Get the latest version (they should all be the same per platform)
-            version = platform_releases[0]["ProductVersion"]
-            logger.info(f"Found Edge version {version} for {platform}")
-            return version
+            logger.info(f"Found Edge versions {versions} for {platform}")
+            return versions
 
         except (KeyError, IndexError) as e:
             logger.error(f"Error parsing Edge version data for {platform}: {e}")
             return None
 
+    def _version_info(self, versions: Dict[str, str]) -> Dict[str, Any]:
+        return {
+            "version": versions["stable"],
+            "check_url": self.api_url,
+            "check_method": "api",
+            "channels": {
+                channel: {"version": version}
+                for channel, version in versions.items()
+                if channel != "stable"
+            },
+        }
+
     async def fetch_latest_version(self, platform: str) -> Optional[Dict[str, Any]]:
         """Fetch the latest Edge version information for a specific platform."""
         if platform not in self.supported_platforms:
@@ -81,23 +102,21 @@ class EdgeVersionChecker(BaseVersionChecker):
             return None
 
         try:
-            async with await self.get_client() as client:
-                logger.info(f"Fetching Edge version from {self.api_url}")
-                response = await client.get(self.api_url)
-                response.raise_for_status()
-                data = response.json()
-
-                version = self._extract_version_from_json(data, platform)
-                if not version:
-                    return None
-
-                logger.info(f"Successfully fetched Edge {platform} version: {version}")
-                return {
-                    "version": version,
-                    "check_url": self.api_url,
-                    "check_method": "api",
-                }
+            logger.info(f"Fetching Edge version from {self.api_url}")
+            data = await self.fetch_json(self.api_url)
+
+            with self.measure("extract", platform, self.api_url):
+                versions = self._extract_versions_from_json(data, platform)
+            if not versions:
+                return None
+
+            logger.info(
+                f"Successfully fetched Edge {platform} version: {versions['stable']}"
+            )
+            return self._version_info(versions)
 
+        except NotModified:
+            raise
         except httpx.TimeoutException as e:
             logger.error(f"Timeout while fetching Edge {platform} version: {e}")
             return None
@@ -111,12 +130,61 @@ class EdgeVersionChecker(BaseVersionChecker):
             )
             return None
 
+    async def fetch_latest_versions(
+        self, platforms: List[str], max_concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Fetch the products feed once and extract every requested platform."""
+        results: Dict[str, Any] = {}
+        for platform in platforms:
+            if platform not in self.supported_platforms:
+                logger.error(f"Unsupported platform: {platform}")
+                results[platform] = None
+        wanted = [platform for platform in platforms if platform not in results]
+        if not wanted:
+            return results
+
+        try:
+            logger.info(f"Fetching Edge versions from {self.api_url}")
+            data = await self.fetch_json(self.api_url)
+            with self.measure("extract", url=self.api_url):
+                versions = self._index_versions(data)
+        except NotModified as e:
+            results.update((platform, e) for platform in wanted)
+            return results
+        except httpx.TimeoutException as e:
+            logger.error(f"Timeout while fetching Edge versions: {e}")
+            versions = {}
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error while fetching Edge versions: {e}")
+            versions = {}
+        except Exception as e:
+            logger.error(
+                f"Unexpected error while fetching Edge versions: {str(e)}",
+                exc_info=True,
+            )
+            versions = {}
+
+        for platform in wanted:
+            channels = versions.get(platform, {})
+            if "stable" in channels:
+                logger.info(
+                    f"Successfully fetched Edge {platform} version: "
+                    f"{channels['stable']}"
+                )
+                results[platform] = self._version_info(channels)
+            else:
+                if versions:
+                    logger.error(f"No Edge releases found for platform {platform}")
+                results[platform] = None
+        return results
+
     def get_supported_platforms(self) -> List[str]:
         """Return list of supported platforms."""
         return self.supported_platforms
 
 
 async def main():
+    logging.basicConfig(level=logging.INFO)
     checker = EdgeVersionChecker()
     success = await checker.update()
     exit(0 if success else 1)
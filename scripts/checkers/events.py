@@ -0,0 +1,302 @@
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from contextvars import ContextVar
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+import httpx
+
+from scripts.checkers.resilience import RetryPolicy, parse_retry_after
+from scripts.checkers.state import ProductState
+from scripts.lookup import DEFAULT_EVENTS_FILE
+
+logger = logging.getLogger(__name__)
+
+_current_feed: ContextVar[Optional["ChangeFeed"]] = ContextVar(
+    "current_change_feed", default=None
+)
+
+
+def current_feed() -> Optional["ChangeFeed"]:
+    """Return the change feed open for the current run, if any."""
+    return _current_feed.get()
+
+
+class ChangeEvent(NamedTuple):
+    """A platform's version moving from one value to another."""
+
+    product: str
+    platform: str
+    old: str
+    new: str
+    check_url: str
+    detected_at: str
+
+    @property
+    def id(self) -> str:
+        """Stable identifier consumers can deduplicate redelivered events by."""
+        key = f"{self.product}|{self.platform}|{self.new}|{self.detected_at}"
+        return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, **self._asdict()}
+
+
+def events_from_state(product: str, state: ProductState) -> List[ChangeEvent]:
+    """Change events for the version changes recorded in ``state``.
+
+    Replacing the placeholder of a new data file is not a release and
+    produces no event.
+    """
+    detected_at = state.data["metadata"]["last_checked"]
+    return [
+        ChangeEvent(
+            product,
+            change.platform,
+            change.old,
+            change.new,
+            state.platforms[change.platform]["check_url"],
+            detected_at,
+        )
+        for change in state.changes
+        if change.field == "version" and change.old not in (None, "0.0.0")
+    ]
+
+
+class EventSink:
+    """Destination for change events."""
+
+    async def emit(self, events: Sequence[ChangeEvent]):
+        raise NotImplementedError
+
+    async def aclose(self):
+        return None
+
+
+class NdjsonSink(EventSink):
+    """Appends events as JSON lines to a file that is never rewritten.
+
+    Each batch is written with a single ``write`` call on a file opened for
+    appending, so concurrent readers (like the SSE endpoint) only ever see
+    whole lines once they are flushed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    async def emit(self, events: Sequence[ChangeEvent]):
+        if not events:
+            return
+        lines = "".join(
+            json.dumps(event.as_dict(), separators=(",", ":")) + "\n"
+            for event in events
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(lines)
+
+
+class WebhookStats:
+    """Delivery counters of a ``WebhookSink``."""
+
+    def __init__(self):
+        self.batches = 0
+        self.delivered = 0
+        self.retries = 0
+        self.dropped = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+
+class WebhookSink(EventSink):
+    """POSTs events to webhook URLs in batches, retrying failed deliveries.
+
+    Events are queued and sent as ``{"events": [...]}`` once ``batch_size``
+    of them are waiting or ``flush_interval`` seconds after the first one
+    arrived, whichever comes first. Timeouts, connection errors and
+    retryable statuses (see ``RetryPolicy``) are retried with jittered
+    backoff; a batch that still fails is logged and dropped. Delivery is
+    at least once, so receivers should deduplicate by event ``id``.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        policy: Optional[RetryPolicy] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rand: Callable[[], float] = random.random,
+    ):
+        """Configure delivery.
+
+        Args:
+            urls: Endpoints every batch is POSTed to
+            batch_size: Most events sent in one request
+            flush_interval: Longest time an event waits for a batch to fill
+            policy: Retries per batch (default: ``RetryPolicy(max_retries=5)``)
+            transport: Transport for the webhook client (default: the network)
+            sleep: Coroutine used to wait between retries
+            rand: Uniform random numbers for the backoff jitter
+        """
+        self.urls = list(urls)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy or RetryPolicy(max_retries=5)
+        self.stats = WebhookStats()
+        self._transport = transport
+        self._sleep = sleep
+        self._rand = rand
+        self._pending: List[ChangeEvent] = []
+        self._client: Optional[httpx.AsyncClient] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._deliveries: List[asyncio.Task] = []
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=self._transport, timeout=httpx.Timeout(10.0, connect=5.0)
+            )
+        return self._client
+
+    async def emit(self, events: Sequence[ChangeEvent]):
+        self._pending.extend(events)
+        while len(self._pending) >= self.batch_size:
+            self._send(self._take())
+        if self._pending and self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    def _take(self) -> List[ChangeEvent]:
+        batch = self._pending[: self.batch_size]
+        del self._pending[: self.batch_size]
+        return batch
+
+    async def _flush_later(self):
+        try:
+            await asyncio.sleep(self.flush_interval)
+        finally:
+            self._flusher = None
+        while self._pending:
+            self._send(self._take())
+
+    def _send(self, batch: List[ChangeEvent]):
+        self.stats.batches += 1
+        body = {"events": [event.as_dict() for event in batch]}
+        for url in self.urls:
+            task = asyncio.create_task(self._deliver(url, body, len(batch)))
+            self._deliveries.append(task)
+            task.add_done_callback(self._deliveries.remove)
+
+    async def _deliver(self, url: str, body: Dict[str, Any], count: int):
+        client = self._get_client()
+        retry = 0
+        while True:
+            delay = None
+            try:
+                response = await client.post(url, json=body)
+            except (httpx.TimeoutException, httpx.NetworkError) as e:
+                reason = type(e).__name__
+            else:
+                if response.is_success:
+                    self.stats.delivered += count
+                    return
+                reason = f"HTTP {response.status_code}"
+                if response.status_code not in self.policy.statuses:
+                    logger.error(f"Webhook {url} rejected {count} events: {reason}")
+                    self.stats.dropped += count
+                    return
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+
+            if retry >= self.policy.max_retries:
+                logger.error(f"Giving up delivering {count} events to {url}: {reason}")
+                self.stats.dropped += count
+                return
+            if delay is None or delay > self.policy.max_retry_after:
+                delay = self.policy.backoff(retry, self._rand)
+            retry += 1
+            self.stats.retries += 1
+            logger.info(f"Retrying webhook {url} in {delay:.2f}s ({reason})")
+            await self._sleep(delay)
+
+    async def aclose(self):
+        """Send what is still queued and wait for every delivery to finish."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        while self._pending:
+            self._send(self._take())
+        await asyncio.gather(*self._deliveries, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        logger.info(f"Webhook delivery stats: {self.stats.as_dict()}")
+
+
+class ChangeFeed:
+    """Fans change events out to every configured sink for one run.
+
+    Usage:
+        async with ChangeFeed([NdjsonSink(path)]):
+            await checker.update()
+
+    While the feed is open, ``BaseVersionChecker.update`` publishes the
+    version changes it saved. A failing sink is logged and does not stop
+    the others or fail the check.
+    """
+
+    def __init__(self, sinks: Sequence[EventSink]):
+        self.sinks = list(sinks)
+        self.published = 0
+        self._token = None
+
+    @classmethod
+    def create(
+        cls,
+        events_file: Optional[Path] = None,
+        webhooks: Sequence[str] = (),
+        batch_size: int = 100,
+    ) -> "ChangeFeed":
+        """Build a feed from the usual command line options."""
+        sinks: List[EventSink] = []
+        if events_file is not None:
+            sinks.append(NdjsonSink(events_file))
+        if webhooks:
+            sinks.append(WebhookSink(webhooks, batch_size=batch_size))
+        return cls(sinks)
+
+    async def publish(self, events: Sequence[ChangeEvent]):
+        if not events:
+            return
+        self.published += len(events)
+        for sink in self.sinks:
+            try:
+                await sink.emit(events)
+            except Exception as e:
+                logger.error(f"{type(sink).__name__} failed to emit events: {e}")
+
+    async def __aenter__(self) -> "ChangeFeed":
+        self._token = _current_feed.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        _current_feed.reset(self._token)
+        self._token = None
+        for sink in self.sinks:
+            try:
+                await sink.aclose()
+            except Exception as e:
+                logger.error(f"{type(sink).__name__} failed to close: {e}")
@@ -0,0 +1,42 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def _new_file_mode() -> int:
+    """Permissions ``open()`` would give a new file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def atomic_write_text(path: Path, text: str):
+    """Write a file so readers only ever see the old or the new contents.
+
+    The text is written to a temporary file in the same directory, flushed
+    to disk with fsync and then renamed over the target. The file keeps the
+    permissions of the one it replaces (a new file gets the usual
+    umask-based ones), rather than the owner-only mode of temporary files.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = _new_file_mode()
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -4,14 +4,15 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+import asyncio
 import httpx
 import logging
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
 from scripts.checkers.base_checker import BaseVersionChecker
+from scripts.checkers.http_cache import NotModified
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +29,23 @@ class FirefoxVersionChecker(BaseVersionChecker):
             "ios": "mobile",
             "android": "mobile",
         }
+        # product-details keys of each channel; LATEST_FIREFOX_DEVEL_VERSION
+        # is the current beta, FIREFOX_DEVEDITION the Developer Edition build
+        self.desktop_channel_keys = {
+            "stable": "LATEST_FIREFOX_VERSION",
+            "beta": "LATEST_FIREFOX_DEVEL_VERSION",
+            "dev": "FIREFOX_DEVEDITION",
+            "nightly": "FIREFOX_NIGHTLY",
+            "esr": "FIREFOX_ESR",
+        }
+        self.mobile_channel_keys = {
+            "android": {
+                "stable": "version",
+                "beta": "beta_version",
+                "nightly": "nightly_version",
+            },
+            "ios": {"stable": "ios_version", "beta": "ios_beta_version"},
+        }
 
     def get_initial_data(self) -> Dict[str, Any]:
         """Get initial data structure for Firefox."""
@@ -53,51 +71,77 @@ class FirefoxVersionChecker(BaseVersionChecker):
             "metadata": {"last_checked": datetime.utcnow().isoformat() + "Z"},
         }
 
-    async def _fetch_desktop_version(self) -> Optional[str]:
-        """Fetch the latest Firefox desktop version."""
+    async def _fetch_desktop_versions(self) -> Optional[Dict[str, str]]:
+        """Fetch the latest Firefox desktop version of every channel."""
         try:
-            async with await self.get_client() as client:
-                logger.info(f"Fetching Firefox desktop version from {self.desktop_url}")
-                response = await client.get(self.desktop_url)
-                response.raise_for_status()
-                data = response.json()
+            logger.info(f"Fetching Firefox desktop version from {self.desktop_url}")
+            data = await self.fetch_json(self.desktop_url)
 
+            with self.measure("extract", url=self.desktop_url):
                 if "LATEST_FIREFOX_VERSION" not in data:
                     raise ValueError("Invalid response format from Firefox desktop API")
 
-                version = data["LATEST_FIREFOX_VERSION"]
-                logger.info(f"Successfully fetched Firefox desktop version: {version}")
-                return version
+                versions = {
+                    channel: data[key]
+                    for channel, key in self.desktop_channel_keys.items()
+                    if data.get(key)
+                }
+            logger.info(f"Successfully fetched Firefox desktop versions: {versions}")
+            return versions
 
+        except NotModified:
+            raise
         except Exception as e:
             logger.error(f"Error fetching Firefox desktop version: {e}")
             return None
 
-    async def _fetch_mobile_versions(self) -> Optional[Dict[str, str]]:
-        """Fetch the latest Firefox mobile versions."""
+    async def _fetch_mobile_versions(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """Fetch the latest Firefox mobile versions of every channel."""
         try:
-            async with await self.get_client() as client:
-                logger.info(f"Fetching Firefox mobile versions from {self.mobile_url}")
-                response = await client.get(self.mobile_url)
-                response.raise_for_status()
-                data = response.json()
+            logger.info(f"Fetching Firefox mobile versions from {self.mobile_url}")
+            data = await self.fetch_json(self.mobile_url)
 
+            with self.measure("extract", url=self.mobile_url):
                 if "version" not in data:
                     raise ValueError("Invalid response format from Firefox mobile API")
 
-                # Use iOS-specific version if available, otherwise use common version
-                ios_version = data.get("ios_version") or data["version"]
-                android_version = data["version"]
-
-                logger.info(
-                    f"Successfully fetched Firefox mobile versions - Android: {android_version}, iOS: {ios_version}"
-                )
-                return {"ios": ios_version, "android": android_version}
-
+                versions = {
+                    platform: {
+                        channel: data[key]
+                        for channel, key in channel_keys.items()
+                        if data.get(key)
+                    }
+                    for platform, channel_keys in self.mobile_channel_keys.items()
+                }
+                # Use iOS-specific version if available, otherwise common version
+                versions["ios"].setdefault("stable", data["version"])
+
+            logger.info(
+                f"Successfully fetched Firefox mobile versions - "
+                f"Android: {versions['android']['stable']}, "
+                f"iOS: {versions['ios']['stable']}"
+            )
+            return versions
+
+        except NotModified:
+            raise
         except Exception as e:
             logger.error(f"Error fetching Firefox mobile versions: {e}")
             return None
 
+    @staticmethod
+    def _version_info(versions: Dict[str, str], check_url: str) -> Dict[str, Any]:
+        return {
+            "version": versions["stable"],
+            "check_url": check_url,
+            "check_method": "api",
+            "channels": {
+                channel: {"version": version}
+                for channel, version in versions.items()
+                if channel != "stable"
+            },
+        }
+
     async def fetch_latest_version(self, platform: str) -> Optional[Dict[str, Any]]:
         """Fetch the latest Firefox version information for a specific platform."""
         if platform not in self.platform_mapping:
@@ -108,42 +152,81 @@ class FirefoxVersionChecker(BaseVersionChecker):
             platform_type = self.platform_mapping[platform]
 
             if platform_type == "desktop":
-                version = await self._fetch_desktop_version()
-                if not version:
+                versions = await self._fetch_desktop_versions()
+                if not versions:
                     return None
-                return {
-                    "version": version,
-                    "check_url": self.desktop_url,
-                    "check_method": "api",
-                }
+                return self._version_info(versions, self.desktop_url)
             else:  # mobile
-                versions = await self._fetch_mobile_versions()
-                if not versions:
+                mobile_versions = await self._fetch_mobile_versions()
+                if not mobile_versions:
                     return None
-                return {
-                    "version": versions[
-                        platform
-                    ],  # platform will be either "ios" or "android"
-                    "check_url": self.mobile_url,
-                    "check_method": "api",
-                }
+                # platform will be either "ios" or "android"
+                return self._version_info(mobile_versions[platform], self.mobile_url)
 
+        except NotModified:
+            raise
         except Exception as e:
             logger.error(f"Error fetching Firefox {platform} version: {e}")
             return None
 
+    async def fetch_latest_versions(
+        self, platforms: List[str], max_concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Fetch each product-details file at most once for all platforms.
+
+        The mobile file carries both the iOS and Android versions, so mobile
+        platforms share a single fetch and parse.
+        """
+        results: Dict[str, Any] = {}
+        for platform in platforms:
+            if platform not in self.platform_mapping:
+                logger.error(f"Unsupported platform: {platform}")
+                results[platform] = None
+        needed = {
+            self.platform_mapping[platform]
+            for platform in platforms
+            if platform not in results
+        }
+
+        fetches = {}
+        if "desktop" in needed:
+            fetches["desktop"] = self._fetch_desktop_versions()
+        if "mobile" in needed:
+            fetches["mobile"] = self._fetch_mobile_versions()
+        fetched = dict(
+            zip(
+                fetches,
+                await asyncio.gather(*fetches.values(), return_exceptions=True),
+            )
+        )
+
+        for platform in platforms:
+            if platform in results:
+                continue
+            platform_type = self.platform_mapping[platform]
+            outcome = fetched[platform_type]
+            if isinstance(outcome, BaseException) or not outcome:
+                results[platform] = outcome
+                continue
+            if platform_type == "desktop":
+                results[platform] = self._version_info(outcome, self.desktop_url)
+            else:
+                results[platform] = self._version_info(
+                    outcome[platform], self.mobile_url
+                )
+        return results
+
     def get_supported_platforms(self) -> List[str]:
         """Return list of supported platforms."""
         return list(self.platform_mapping.keys())
 
 
 async def main():
+    logging.basicConfig(level=logging.INFO)
     checker = FirefoxVersionChecker()
     success = await checker.update()
     exit(0 if success else 1)
 
 
 if __name__ == "__main__":
-    import asyncio
-
     asyncio.run(main())
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from scripts.checkers.files import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever checkers start extracting more from the same documents, so
+# warm caches do not answer "not modified" before the new fields were ever
+# parsed (2: release channels)
+CACHE_FORMAT_VERSION = 2
+
+
+class NotModified(Exception):
+    """Raised when an upstream document is unchanged since the last run.
+
+    Checkers should let this propagate so ``update()`` can keep the version
+    extracted on the previous run instead of parsing the body again.
+    """
+
+    def __init__(self, url: str):
+        super().__init__(f"Not modified: {url}")
+        self.url = url
+
+
+def body_digest(content: bytes) -> str:
+    """Return the digest stored for a response body."""
+    return hashlib.sha256(content).hexdigest()
+
+
+class ValidatorCache:
+    """On-disk store of HTTP validators (ETag / Last-Modified) per URL.
+
+    Only validators and body digests are persisted, never bodies, so the
+    file is small and safe to keep in the GitHub Actions cache. New entries
+    are staged during a run and only committed for products whose update
+    succeeded; a failed product drops its entries so the next run refetches.
+    """
+
+    def __init__(self, path: Path):
+        """Load the cache file, starting empty if it is missing or unreadable.
+
+        Args:
+            path: Location of the JSON cache file
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable HTTP cache {self.path}: {e}")
+            return {}
+
+        if data.get("version") != CACHE_FORMAT_VERSION:
+            logger.info(f"Discarding HTTP cache with old format: {self.path}")
+            return {}
+        return data.get("entries", {})
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for a URL, if validators are known."""
+        entry = self.entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record_not_modified(self, url: str):
+        """Count a 304 response for a URL."""
+        self.hits += 1
+
+    def record_response(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        digest: Optional[str],
+        revalidate: bool = True,
+    ) -> bool:
+        """Stage validators from a full response.
+
+        Args:
+            url: Request URL
+            etag: ``ETag`` response header, if any
+            last_modified: ``Last-Modified`` response header, if any
+            digest: Digest of the response body, if it was read in full
+            revalidate: Whether an unchanged body may be reported as such
+
+        Returns:
+            True if ``revalidate`` is set and the body is identical to the one
+            seen on the last run
+        """
+        previous = self.entries.get(url)
+        unchanged = (
+            revalidate
+            and digest is not None
+            and previous is not None
+            and previous.get("digest") == digest
+        )
+        if unchanged:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self._pending[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "digest": digest,
+        }
+        return unchanged
+
+    def commit(self, urls: Iterable[str]):
+        """Keep staged validators for URLs whose results were applied."""
+        for url in urls:
+            if url in self._pending:
+                self.entries[url] = self._pending.pop(url)
+
+    def invalidate(self, urls: Iterable[str]):
+        """Forget URLs so they are fetched in full on the next run."""
+        for url in urls:
+            self._pending.pop(url, None)
+            self.entries.pop(url, None)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def save(self):
+        """Atomically write committed entries back to disk."""
+        payload = {"version": CACHE_FORMAT_VERSION, "entries": self.entries}
+        text = json.dumps(payload, indent=2, sort_keys=True) + "\n"
+        atomic_write_text(self.path, text)
@@ -0,0 +1,326 @@
+import json
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from scripts.checkers.files import atomic_write_text
+
+# Upper bounds, in seconds, of the histogram buckets
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Stages in the order a check goes through them
+STAGES = (
+    "connect",
+    "tls",
+    "ttfb",
+    "download",
+    "decode",
+    "extract",
+    "validate",
+    "write",
+)
+
+# Request phases measured by the session transport
+REQUEST_PHASES = ("connect", "tls", "ttfb", "download")
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """``(le, count)`` pairs, ending with ``+Inf``."""
+        pairs = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            pairs.append((repr(float(bound)), running))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+
+class Observation(NamedTuple):
+    """Time spent in one stage of a check."""
+
+    stage: str
+    seconds: float
+    product: str
+    platform: Optional[str]
+    url: Optional[str]
+
+
+class RequestRecord(NamedTuple):
+    """One HTTP exchange as seen by the session transport."""
+
+    product: str
+    url: str
+    status: int
+    num_bytes: int
+    phases: Dict[str, float]
+
+
+def summarize(values: Sequence[float]) -> Dict[str, Any]:
+    """Count, total, mean, p95 and max of durations in seconds, in ms."""
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "total_ms": round(sum(ordered) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p95_ms": round(
+            ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000, 3
+        ),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def _labels(**labels: Any) -> str:
+    def escape(value: Any) -> str:
+        return (
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+
+    return ",".join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+class RunMetrics:
+    """Stage timings, bytes and status codes collected during one run.
+
+    Every observation is kept with its product, platform and URL so the run
+    report can break timings down at each level; histograms per stage and
+    product are maintained alongside for the OpenMetrics export.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.observations: List[Observation] = []
+        self.requests: List[RequestRecord] = []
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe(
+        self,
+        stage: str,
+        seconds: float,
+        product: str,
+        platform: Optional[str] = None,
+        url: Optional[str] = None,
+    ):
+        """Record ``seconds`` spent in ``stage``."""
+        self.observations.append(Observation(stage, seconds, product, platform, url))
+        key = (stage, product)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    @contextmanager
+    def time(
+        self,
+        stage: str,
+        product: str,
+        platform: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> Iterator[None]:
+        """Observe the time spent in the ``with`` block, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, product, platform, url)
+
+    def record_request(
+        self,
+        product: str,
+        url: str,
+        status: int,
+        num_bytes: int,
+        phases: Dict[str, float],
+    ):
+        """Record a finished HTTP exchange and observe its phases.
+
+        Args:
+            product: Product the request was made for
+            url: Requested URL
+            status: Response status code
+            num_bytes: Body bytes received, before content decoding
+            phases: Seconds per phase (see ``REQUEST_PHASES``); a phase
+                that did not happen, like connect on a reused connection,
+                is left out
+        """
+        self.requests.append(RequestRecord(product, url, status, num_bytes, phases))
+        for phase in REQUEST_PHASES:
+            if phase in phases:
+                self.observe(phase, phases[phase], product, url=url)
+
+    def _grouped(self, key) -> Dict[Any, Dict[str, List[float]]]:
+        groups: Dict[Any, Dict[str, List[float]]] = {}
+        for observation in self.observations:
+            group = key(observation)
+            if group is not None:
+                stages = groups.setdefault(group, {})
+                stages.setdefault(observation.stage, []).append(observation.seconds)
+        return groups
+
+    @staticmethod
+    def _stage_summaries(stages: Dict[str, List[float]]) -> Dict[str, Any]:
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        return {
+            stage: summarize(stages[stage])
+            for stage in sorted(stages, key=lambda s: (order.get(s, len(order)), s))
+        }
+
+    @staticmethod
+    def _transfers(records: List[RequestRecord]) -> Dict[str, Any]:
+        statuses: Dict[str, int] = {}
+        for record in records:
+            statuses[str(record.status)] = statuses.get(str(record.status), 0) + 1
+        return {
+            "requests": len(records),
+            "bytes": sum(record.num_bytes for record in records),
+            "statuses": dict(sorted(statuses.items())),
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """Break the run down by stage, product, platform and URL."""
+        stages = self._grouped(lambda o: "all")
+        by_product = self._grouped(lambda o: o.product)
+        by_platform = self._grouped(
+            lambda o: (o.product, o.platform) if o.platform else None
+        )
+        by_url = self._grouped(lambda o: o.url)
+        product_requests: Dict[str, List[RequestRecord]] = {}
+        url_requests: Dict[str, List[RequestRecord]] = {}
+        for record in self.requests:
+            product_requests.setdefault(record.product, []).append(record)
+            url_requests.setdefault(record.url, []).append(record)
+
+        products = {}
+        for product in sorted(by_product):
+            products[product] = {
+                **self._transfers(product_requests.get(product, [])),
+                "stages": self._stage_summaries(by_product[product]),
+            }
+
+        platforms: Dict[str, Dict[str, Any]] = {}
+        for product, platform in sorted(by_platform):
+            platforms.setdefault(product, {})[platform] = self._stage_summaries(
+                by_platform[(product, platform)]
+            )
+
+        urls = {}
+        for url in sorted(by_url):
+            urls[url] = {
+                **self._transfers(url_requests.get(url, [])),
+                "stages": self._stage_summaries(by_url[url]),
+            }
+
+        return {
+            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "stages": self._stage_summaries(stages.get("all", {})),
+            "products": products,
+            "platforms": platforms,
+            "urls": urls,
+            "requests": [
+                {
+                    "product": record.product,
+                    "url": record.url,
+                    "status": record.status,
+                    "bytes": record.num_bytes,
+                    **{
+                        f"{phase}_ms": round(record.phases[phase] * 1000, 3)
+                        for phase in REQUEST_PHASES
+                        if phase in record.phases
+                    },
+                }
+                for record in self.requests
+            ],
+        }
+
+    def openmetrics(self, prefix: str = "version_tracker") -> str:
+        """Render the metrics in the OpenMetrics text format.
+
+        The output is also accepted by the node_exporter textfile collector.
+        """
+        lines = [
+            f"# TYPE {prefix}_stage_seconds histogram",
+            f"# HELP {prefix}_stage_seconds Time spent per check stage.",
+            f"# UNIT {prefix}_stage_seconds seconds",
+        ]
+        for (stage, product), histogram in sorted(self.histograms.items()):
+            labels = _labels(stage=stage, product=product)
+            for bound, count in histogram.cumulative():
+                lines.append(
+                    f'{prefix}_stage_seconds_bucket{{{labels},le="{bound}"}} {count}'
+                )
+            lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {histogram.count}")
+            lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {histogram.sum!r}")
+
+        requests: Dict[Tuple[str, str, int], int] = {}
+        received: Dict[Tuple[str, str], int] = {}
+        for record in self.requests:
+            host = urlsplit(record.url).hostname or ""
+            key = (record.product, host, record.status)
+            requests[key] = requests.get(key, 0) + 1
+            received[key[:2]] = received.get(key[:2], 0) + record.num_bytes
+
+        lines += [
+            f"# TYPE {prefix}_http_requests counter",
+            f"# HELP {prefix}_http_requests HTTP responses received.",
+        ]
+        for (product, host, status), count in sorted(requests.items()):
+            labels = _labels(product=product, host=host, status=status)
+            lines.append(f"{prefix}_http_requests_total{{{labels}}} {count}")
+
+        lines += [
+            f"# TYPE {prefix}_http_received_bytes counter",
+            f"# HELP {prefix}_http_received_bytes Response body bytes on the wire.",
+            f"# UNIT {prefix}_http_received_bytes bytes",
+        ]
+        for (product, host), num_bytes in sorted(received.items()):
+            labels = _labels(product=product, host=host)
+            lines.append(f"{prefix}_http_received_bytes_total{{{labels}}} {num_bytes}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(
+        self, textfile: Optional[Path] = None, report_file: Optional[Path] = None
+    ):
+        """Write the OpenMetrics textfile and/or the JSON report, atomically."""
+        if textfile is not None:
+            atomic_write_text(Path(textfile), self.openmetrics())
+        if report_file is not None:
+            atomic_write_text(
+                Path(report_file), json.dumps(self.report(), indent=2) + "\n"
+            )
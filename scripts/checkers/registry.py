@@ -0,0 +1,152 @@
+"""Lazy registry of version checkers.
+
+Checkers come from three places:
+
+- the Python checkers shipped in ``scripts.checkers``
+- declarative definitions in ``definitions/*.json`` (see ``declarative.py``)
+- the ``version_tracker.checkers`` entry point group, whose entries load
+  either a ``BaseVersionChecker`` subclass or a definition mapping
+
+Listing names imports nothing: built-ins are known by module path,
+definitions by file name and entry points by their metadata. A checker's
+module (or definition file) is only loaded when that product is created.
+"""
+import importlib
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "version_tracker.checkers"
+DEFINITIONS_DIR = Path(__file__).parent.parent.parent / "definitions"
+
+BUILTIN_CHECKERS = {
+    "chrome": "scripts.checkers.chrome:ChromeVersionChecker",
+    "edge": "scripts.checkers.edge:EdgeVersionChecker",
+    "firefox": "scripts.checkers.firefox:FirefoxVersionChecker",
+    "safari": "scripts.checkers.safari:SafariVersionChecker",
+}
+
+# Returns a ready-to-use checker instance
+CheckerFactory = Callable[[], Any]
+
+
+def _entry_points() -> List[Any]:
+    from importlib.metadata import entry_points
+
+    try:
+        return list(entry_points(group=ENTRY_POINT_GROUP))
+    except TypeError:
+        # Python 3.9: entry_points() takes no arguments
+        return list(entry_points().get(ENTRY_POINT_GROUP, []))
+
+
+def _import_object(reference: str) -> Any:
+    module_name, _, attribute = reference.partition(":")
+    obj = importlib.import_module(module_name)
+    for part in attribute.split(".") if attribute else ():
+        obj = getattr(obj, part)
+    return obj
+
+
+def _factory_for(obj: Any, origin: str) -> CheckerFactory:
+    """Turn a loaded checker class or definition mapping into a factory."""
+    from scripts.checkers.base_checker import BaseVersionChecker
+
+    if isinstance(obj, type) and issubclass(obj, BaseVersionChecker):
+        return obj
+    if isinstance(obj, Mapping):
+        from scripts.checkers.declarative import DEFINITION_SCHEMA, JsonApiChecker
+        from scripts.checkers.schema import get_compiled_schema
+
+        get_compiled_schema(DEFINITION_SCHEMA).validate(obj)
+        return lambda: JsonApiChecker(obj)
+    raise TypeError(f"{origin} is neither a checker class nor a definition")
+
+
+class CheckerRegistry:
+    """Maps product names to checkers without importing them up front."""
+
+    def __init__(
+        self,
+        definitions_dir: Optional[Path] = DEFINITIONS_DIR,
+        builtins: Optional[Mapping[str, str]] = None,
+        use_entry_points: bool = True,
+    ):
+        """Collect checker names from every source.
+
+        When two sources register the same name, the first one wins: built-in
+        Python checkers, then definitions, then entry points.
+
+        Args:
+            definitions_dir: Directory of ``<product>.json`` definitions
+                (None: no definitions)
+            builtins: Built-in ``name -> "module:Class"`` references
+                (default: ``BUILTIN_CHECKERS``)
+            use_entry_points: Also register installed plugins
+        """
+        self._loaders: Dict[str, Callable[[], CheckerFactory]] = {}
+        self._factories: Dict[str, CheckerFactory] = {}
+
+        for name, reference in (
+            BUILTIN_CHECKERS if builtins is None else builtins
+        ).items():
+            self._register(name, self._reference_loader(reference))
+
+        if definitions_dir is not None and definitions_dir.is_dir():
+            for path in sorted(definitions_dir.glob("*.json")):
+                self._register(path.stem, self._definition_loader(path))
+
+        if use_entry_points:
+            for entry_point in _entry_points():
+                self._register(entry_point.name, self._entry_point_loader(entry_point))
+
+    def _register(self, name: str, loader: Callable[[], CheckerFactory]):
+        if name in self._loaders:
+            logger.warning(f"Ignoring duplicate checker registration for {name}")
+            return
+        self._loaders[name] = loader
+
+    @staticmethod
+    def _reference_loader(reference: str) -> Callable[[], CheckerFactory]:
+        return lambda: _factory_for(_import_object(reference), reference)
+
+    @staticmethod
+    def _definition_loader(path: Path) -> Callable[[], CheckerFactory]:
+        def load() -> CheckerFactory:
+            from scripts.checkers.declarative import JsonApiChecker, load_definition
+
+            definition = load_definition(path)
+            if definition["identifier"] != path.stem:
+                raise ValueError(
+                    f"Definition {path} has identifier {definition['identifier']}"
+                )
+            return lambda: JsonApiChecker(definition)
+
+        return load
+
+    @staticmethod
+    def _entry_point_loader(entry_point: Any) -> Callable[[], CheckerFactory]:
+        return lambda: _factory_for(entry_point.load(), entry_point.value)
+
+    def names(self) -> List[str]:
+        """Return the registered product names, sorted."""
+        return sorted(self._loaders)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._loaders
+
+    def factory(self, name: str) -> CheckerFactory:
+        """Load (once) and return the factory for a product.
+
+        Raises:
+            KeyError: If no checker is registered under ``name``
+        """
+        if name not in self._factories:
+            self._factories[name] = self._loaders[name]()
+        return self._factories[name]
+
+    def create(self, name: str) -> Any:
+        """Create a checker instance for a product."""
+        return self.factory(name)()
@@ -0,0 +1,316 @@
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Transport errors worth retrying: the host may answer the next attempt
+TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.ProtocolError)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request to a host whose breaker is open.
+
+    It is an ``httpx.HTTPError``, so checkers treat it like any other
+    transport failure.
+    """
+
+
+class RetryPolicy:
+    """How failed requests are retried.
+
+    Delays use exponential backoff with full jitter: before retry ``n`` the
+    client sleeps a random time between 0 and ``min(max_delay,
+    base_delay * 2**n)``. A ``Retry-After`` header replaces that delay, as
+    long as it is no longer than ``max_retry_after``; a longer wait gives up
+    instead of stalling the run.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        max_retry_after: float = 30.0,
+        retry_budget: Optional[int] = None,
+        statuses: FrozenSet[int] = RETRYABLE_STATUSES,
+    ):
+        """Configure the policy.
+
+        Args:
+            max_retries: Retries per request after the first attempt
+            base_delay: Backoff ceiling in seconds for the first retry
+            max_delay: Largest backoff ceiling in seconds
+            max_retry_after: Longest ``Retry-After`` in seconds worth waiting for
+            retry_budget: Retries allowed across the whole run (default: no
+                limit beyond ``max_retries`` per request)
+            statuses: Response status codes that are retried
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_budget = retry_budget
+        self.statuses = statuses
+
+    def backoff(self, retry: int, rand: Callable[[], float] = random.random) -> float:
+        """Return the jittered delay before retry number ``retry`` (from 0)."""
+        ceiling = min(self.max_delay, self.base_delay * (2**retry))
+        return ceiling * rand()
+
+
+def parse_retry_after(
+    value: Optional[str], now: Optional[float] = None
+) -> Optional[float]:
+    """Parse a ``Retry-After`` header into seconds from now.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+        now: Current Unix time (default: ``time.time()``)
+
+    Returns:
+        Non-negative seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(when.timestamp() - (time.time() if now is None else now), 0.0)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host.
+
+    ``closed``: requests flow normally. After ``failure_threshold``
+    consecutive failures it turns ``open`` and rejects requests for
+    ``reset_timeout`` seconds. It then turns ``half_open`` and lets a single
+    trial request through: success closes it, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and (
+            self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.trips += 1
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """End a request that neither succeeded nor failed against the host.
+
+        In the half-open state this lets the next request be the trial, so
+        a trial cut short (cancelled, or an error that says nothing about
+        the host) cannot leave the breaker waiting forever.
+        """
+        self._trial_in_flight = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class ResilienceStats:
+    """Retry and circuit-breaker counters for a run."""
+
+    def __init__(self):
+        self.retries = 0
+        self.retries_by_host: Dict[str, int] = {}
+        self.gave_up = 0
+        self.budget_exhausted = 0
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "retries_by_host": dict(self.retries_by_host),
+            "gave_up": self.gave_up,
+            "budget_exhausted": self.budget_exhausted,
+            "breakers": {
+                host: breaker.as_dict() for host, breaker in self.breakers.items()
+            },
+        }
+
+
+class RetryingTransport(httpx.AsyncBaseTransport):
+    """Transport that retries transient failures and trips per-host breakers.
+
+    Timeouts, connection and protocol errors and responses with a retryable
+    status are retried for idempotent methods. Every failed attempt counts against the
+    host's breaker; once it opens, requests to that host fail immediately
+    with ``CircuitOpenError`` instead of waiting on a dead upstream.
+    """
+
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        policy: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        stats: Optional[ResilienceStats] = None,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        rand: Callable[[], float] = random.random,
+    ):
+        """Wrap a transport.
+
+        Args:
+            inner: Transport that sends the requests
+            policy: Retry policy (default: ``RetryPolicy()``)
+            failure_threshold: Consecutive failures that open a host's breaker
+            reset_timeout: Seconds a breaker stays open before a trial request
+            stats: Counters to update (default: a new ``ResilienceStats``)
+            sleep: Coroutine used to wait between attempts
+            clock: Monotonic clock used by the breakers
+            rand: Source of jitter in [0, 1)
+        """
+        self._inner = inner
+        self.policy = policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.stats = stats or ResilienceStats()
+        self._sleep = sleep
+        self._clock = clock
+        self._rand = rand
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        if host not in self.stats.breakers:
+            self.stats.breakers[host] = CircuitBreaker(
+                self.failure_threshold, self.reset_timeout, self._clock
+            )
+        return self.stats.breakers[host]
+
+    def _may_retry(self, retry: int, host: str) -> bool:
+        """Account for one more retry if the policy and run budget allow it."""
+        if retry >= self.policy.max_retries:
+            self.stats.gave_up += 1
+            return False
+        budget = self.policy.retry_budget
+        if budget is not None and self.stats.retries >= budget:
+            logger.warning(f"Retry budget of {budget} exhausted, not retrying {host}")
+            self.stats.budget_exhausted += 1
+            self.stats.gave_up += 1
+            return False
+        self.stats.retries += 1
+        self.stats.retries_by_host[host] = self.stats.retries_by_host.get(host, 0) + 1
+        return True
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        breaker = self.breaker(host)
+        retryable_method = request.method in IDEMPOTENT_METHODS
+        retry = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"Circuit open for {host}, not requesting {request.url}",
+                    request=request,
+                )
+
+            try:
+                response = await self._inner.handle_async_request(request)
+            except TRANSIENT_ERRORS as e:
+                breaker.record_failure()
+                if not (retryable_method and self._may_retry(retry, host)):
+                    raise
+                delay = self.policy.backoff(retry, self._rand)
+                reason = type(e).__name__
+            except BaseException:
+                breaker.release_trial()
+                raise
+            else:
+                if response.status_code not in self.policy.statuses:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                too_long = self.policy.max_retry_after
+                if retry_after is not None and retry_after > too_long:
+                    logger.warning(
+                        f"{host} asked to retry after {retry_after:.0f}s, giving up"
+                    )
+                    self.stats.gave_up += 1
+                    return response
+                if not (retryable_method and self._may_retry(retry, host)):
+                    return response
+                delay = (
+                    retry_after
+                    if retry_after is not None
+                    else self.policy.backoff(retry, self._rand)
+                )
+                reason = f"HTTP {response.status_code}"
+                await response.aclose()
+
+            retry += 1
+            logger.info(
+                f"Retrying {request.url} in {delay:.2f}s "
+                f"(attempt {retry + 1}, {reason})"
+            )
+            await self._sleep(delay)
+
+    async def aclose(self):
+        await self._inner.aclose()
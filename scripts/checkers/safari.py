@@ -10,14 +10,20 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List
 
 from scripts.checkers.base_checker import BaseVersionChecker
+from scripts.checkers.http_cache import NotModified
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Location of the release notes list in the index document
+RELEASE_NOTES_PATH = ["interfaceLanguages", "swift", 0, "children"]
+
 
 class SafariVersionChecker(BaseVersionChecker):
     """Checker for Safari versions."""
 
+    # Parse the (large) index incrementally and stop at the first release
+    streaming = True
+
     def __init__(self):
         super().__init__("safari")
         self.api_url = (
@@ -46,6 +52,18 @@ class SafariVersionChecker(BaseVersionChecker):
             "metadata": {"last_checked": datetime.utcnow().isoformat() + "Z"},
         }
 
+    def _is_release_entry(self, child: Dict[str, Any]) -> bool:
+        """Whether an index entry is the release notes of a non-beta version."""
+        if child["type"] == "groupMarker" or "Beta" in child.get("title", ""):
+            return False
+        return bool(child.get("path", ""))
+
+    def _version_from_entry(self, child: Dict[str, Any]) -> str:
+        """Extract the version from a release notes entry."""
+        # Extract version from path like "/documentation/safari-release-notes/safari-18_2-release-notes"
+        path_parts = child["path"].split("/")[-1].split("-")
+        return path_parts[1].replace("_", ".")
+
     def _extract_version_from_json(self, data: Dict[str, Any]) -> Optional[str]:
         """Extract the latest version number from the Safari release notes JSON."""
         try:
@@ -54,19 +72,24 @@ class SafariVersionChecker(BaseVersionChecker):
 
             # Find first non-groupMarker entry
             for child in children:
-                if child["type"] == "groupMarker" or "Beta" in child.get("title", ""):
-                    continue
+                if self._is_release_entry(child):
+                    return self._version_from_entry(child)
 
-                # Extract version from path like "/documentation/safari-release-notes/safari-18_2-release-notes"
-                path = child.get("path", "")
-                if not path:
-                    continue
+            raise ValueError("No valid version entry found in release notes")
 
-                path_parts = path.split("/")[-1].split("-")
-                version = path_parts[1].replace("_", ".")
-                return version
+        except (KeyError, IndexError) as e:
+            logger.error(f"Error parsing Safari version data: {e}")
+            return None
 
-            raise ValueError("No valid version entry found in release notes")
+    async def _stream_latest_version(self) -> Optional[str]:
+        """Find the latest version while the index is still downloading."""
+        try:
+            child = await self.stream_json_find(
+                self.api_url, RELEASE_NOTES_PATH, self._is_release_entry
+            )
+            if child is None:
+                raise ValueError("No valid version entry found in release notes")
+            return self._version_from_entry(child)
 
         except (KeyError, IndexError) as e:
             logger.error(f"Error parsing Safari version data: {e}")
@@ -79,23 +102,31 @@ class SafariVersionChecker(BaseVersionChecker):
             return None
 
         try:
-            async with await self.get_client() as client:
+            if self.streaming:
+                logger.info(f"Streaming Safari version from {self.api_url}")
+                version = await self.coalesce(
+                    self.api_url,
+                    f"{self.api_url}#latest",
+                    self._stream_latest_version,
+                )
+            else:
                 logger.info(f"Fetching Safari version from {self.api_url}")
-                response = await client.get(self.api_url)
-                response.raise_for_status()
-                data = response.json()
-
-                version = self._extract_version_from_json(data)
-                if not version:
-                    return None
-
-                logger.info(f"Successfully fetched Safari version: {version}")
-                return {
-                    "version": version,
-                    "check_url": self.api_url,
-                    "check_method": "api",
-                }
-
+                data = await self.fetch_json(self.api_url)
+                with self.measure("extract", platform, self.api_url):
+                    version = self._extract_version_from_json(data)
+
+            if not version:
+                return None
+
+            logger.info(f"Successfully fetched Safari version: {version}")
+            return {
+                "version": version,
+                "check_url": self.api_url,
+                "check_method": "api",
+            }
+
+        except NotModified:
+            raise
         except httpx.TimeoutException as e:
             logger.error(f"Timeout while fetching Safari version: {e}")
             return None
@@ -115,6 +146,7 @@ class SafariVersionChecker(BaseVersionChecker):
 
 
 async def main():
+    logging.basicConfig(level=logging.INFO)
     checker = SafariVersionChecker()
     success = await checker.update()
     exit(0 if success else 1)
@@ -0,0 +1,249 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``burst``."""
+
+    def __init__(
+        self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self) -> bool:
+        """Take a token if one is available."""
+        self._refill(self._clock())
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def wait_time(self) -> float:
+        """Seconds until the next token is available."""
+        self._refill(self._clock())
+        return max((1 - self._tokens) / self.rate, 0.0)
+
+
+class _Ticket:
+    __slots__ = ("host", "product", "future", "enqueued")
+
+    def __init__(
+        self, host: str, product: str, future: asyncio.Future, enqueued: float
+    ):
+        self.host = host
+        self.product = product
+        self.future = future
+        self.enqueued = enqueued
+
+
+class SchedulerStats:
+    """Queue wait times recorded by the scheduler, per product."""
+
+    def __init__(self):
+        self.waits: Dict[str, List[float]] = {}
+        self.peak_active = 0
+        self.peak_queued = 0
+
+    def record(self, product: str, wait: float):
+        self.waits.setdefault(product, []).append(wait)
+
+    def as_dict(self) -> Dict[str, Any]:
+        products = {}
+        for product, waits in self.waits.items():
+            ordered = sorted(waits)
+            products[product or "-"] = {
+                "requests": len(ordered),
+                "mean_wait_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+                "p95_wait_ms": round(
+                    ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000, 3
+                ),
+                "max_wait_ms": round(ordered[-1] * 1000, 3),
+            }
+        return {
+            "peak_active": self.peak_active,
+            "peak_queued": self.peak_queued,
+            "products": products,
+        }
+
+
+class RequestScheduler:
+    """Admission control for outgoing requests.
+
+    A request may start once all of these hold:
+
+    - fewer than ``max_concurrency`` requests are in flight overall
+    - fewer than ``max_per_host`` are in flight to its host
+    - the host's token bucket has a token (``host_rate`` requests per second,
+      bursts of up to ``host_burst``)
+
+    Waiting requests are queued per product and admitted round-robin across
+    products, so a product with many platforms cannot starve the others.
+    Within a product, requests keep their arrival order except that one
+    blocked on its host does not hold up requests to other hosts.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 20,
+        max_per_host: int = 6,
+        host_rate: Optional[float] = 10.0,
+        host_burst: float = 10.0,
+        host_rates: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Configure the limits.
+
+        Args:
+            max_concurrency: Requests in flight across all hosts
+            max_per_host: Requests in flight to any single host
+            host_rate: Default requests per second per host (None: unlimited)
+            host_burst: Tokens a host's bucket holds when idle
+            host_rates: Per-host overrides of ``host_rate``
+            clock: Monotonic clock
+        """
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.host_rates = dict(host_rates or {})
+        self.stats = SchedulerStats()
+        self._clock = clock
+        self._active = 0
+        self._active_by_host: Dict[str, int] = {}
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._queues: "OrderedDict[str, Deque[_Ticket]]" = OrderedDict()
+        self._order: Deque[str] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._last_served: Optional[str] = None
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        if host not in self._buckets:
+            rate = self.host_rates.get(host, self.host_rate)
+            self._buckets[host] = (
+                TokenBucket(rate, max(self.host_burst, 1), self._clock)
+                if rate
+                else None
+            )
+        return self._buckets[host]
+
+    async def acquire(self, host: str, product: str = "") -> float:
+        """Wait for permission to send a request.
+
+        Every successful call must be paired with ``release(host)`` once the
+        response has been consumed.
+
+        Args:
+            host: Host the request goes to
+            product: Product the request is made for, used for fairness
+
+        Returns:
+            Seconds the request spent queued
+        """
+        loop = asyncio.get_running_loop()
+        ticket = _Ticket(host, product, loop.create_future(), self._clock())
+        if product not in self._queues:
+            self._queues[product] = deque()
+            if self._order and self._order[-1] == self._last_served:
+                # Join the round ahead of the product that was just served
+                self._order.insert(len(self._order) - 1, product)
+            else:
+                self._order.append(product)
+        self._queues[product].append(ticket)
+        self.stats.peak_queued = max(self.stats.peak_queued, self.queued)
+        self._dispatch()
+
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.future.done() and not ticket.future.cancelled():
+                self.release(host)
+            else:
+                self._remove(ticket)
+            raise
+
+        wait = self._clock() - ticket.enqueued
+        self.stats.record(product, wait)
+        return wait
+
+    def release(self, host: str):
+        """Return the slot taken by ``acquire``."""
+        self._active -= 1
+        self._active_by_host[host] -= 1
+        self._dispatch()
+
+    def _remove(self, ticket: _Ticket):
+        queue = self._queues.get(ticket.product)
+        if queue is None or ticket not in queue:
+            return
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[ticket.product]
+            self._order.remove(ticket.product)
+
+    def _eligible(self, queue: Deque[_Ticket]) -> Optional[_Ticket]:
+        for ticket in queue:
+            if ticket.future.done():
+                # Cancelled; its acquire() call removes it when it resumes
+                continue
+            if self._active_by_host.get(ticket.host, 0) >= self.max_per_host:
+                continue
+            bucket = self._bucket(ticket.host)
+            if bucket is None or bucket.try_take():
+                return ticket
+        return None
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._active < self.max_concurrency and self._order:
+            for _ in range(len(self._order)):
+                product = self._order[0]
+                self._order.rotate(-1)
+                ticket = self._eligible(self._queues[product])
+                if ticket is not None:
+                    break
+            else:
+                break
+
+            self._remove(ticket)
+            self._last_served = ticket.product
+            self._active += 1
+            self._active_by_host[ticket.host] = (
+                self._active_by_host.get(ticket.host, 0) + 1
+            )
+            self.stats.peak_active = max(self.stats.peak_active, self._active)
+            ticket.future.set_result(None)
+
+        if self._order and self._active < self.max_concurrency:
+            # Everything left is waiting on a host: on a free slot (which
+            # release() reports) or on a token, which needs a timer
+            waits = [
+                bucket.wait_time()
+                for bucket in (
+                    self._bucket(ticket.host)
+                    for queue in self._queues.values()
+                    for ticket in queue
+                    if self._active_by_host.get(ticket.host, 0) < self.max_per_host
+                )
+                if bucket is not None
+            ]
+            if waits:
+                self._timer = asyncio.get_running_loop().call_later(
+                    min(waits), self._dispatch
+                )
@@ -0,0 +1,93 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+from jsonschema import validators
+from jsonschema.exceptions import best_match
+
+from scripts.checkers.codec import get_codec
+
+_cache: Dict[Path, Tuple[int, "CompiledSchema"]] = {}
+_cache_lock = threading.Lock()
+
+
+class CompiledSchema:
+    """A schema checked and compiled once, shared by every checker.
+
+    Besides plain ``validate``, documents can be validated by their
+    serialized form: once a given serialization has passed, validating the
+    same bytes again is a digest lookup instead of a full schema walk.
+    """
+
+    def __init__(self, schema: Dict[str, Any], max_remembered: int = 1024):
+        """Compile a schema.
+
+        Args:
+            schema: Parsed JSON schema
+            max_remembered: Number of validated document digests to keep
+        """
+        validator_class = validators.validator_for(schema)
+        validator_class.check_schema(schema)
+        self.schema = schema
+        self._validator = validator_class(schema)
+        self._validated: "OrderedDict[str, None]" = OrderedDict()
+        self._max_remembered = max_remembered
+        self._lock = threading.Lock()
+        self.full_validations = 0
+
+    def validate(self, instance: Any):
+        """Validate an instance, raising the most relevant ValidationError."""
+        self.full_validations += 1
+        error = best_match(self._validator.iter_errors(instance))
+        if error is not None:
+            raise error
+
+    def validate_document(self, serialized: Union[str, bytes], instance: Any):
+        """Validate ``instance``, skipping the work if ``serialized`` passed before.
+
+        Args:
+            serialized: The exact JSON text ``instance`` was read from or will
+                be written as
+            instance: The decoded document
+        """
+        if isinstance(serialized, str):
+            serialized = serialized.encode("utf-8")
+        digest = hashlib.sha256(serialized).hexdigest()
+
+        with self._lock:
+            if digest in self._validated:
+                self._validated.move_to_end(digest)
+                return
+
+        self.validate(instance)
+
+        with self._lock:
+            self._validated[digest] = None
+            while len(self._validated) > self._max_remembered:
+                self._validated.popitem(last=False)
+
+
+def get_compiled_schema(schema_file: Path) -> CompiledSchema:
+    """Return the process-wide compiled schema for a file.
+
+    The schema is reloaded only when the file's modification time changes.
+
+    Raises:
+        FileNotFoundError: If the schema file does not exist
+        json.JSONDecodeError: If the schema file is not valid JSON
+    """
+    path = Path(schema_file).resolve()
+    mtime = path.stat().st_mtime_ns
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    with open(path, "rb") as f:
+        compiled = CompiledSchema(get_codec().loads(f.read()))
+
+    with _cache_lock:
+        _cache[path] = (mtime, compiled)
+    return compiled
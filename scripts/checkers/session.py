@@ -0,0 +1,403 @@
+import asyncio
+import importlib.util
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from scripts.checkers.http_cache import ValidatorCache
+from scripts.checkers.metrics import RunMetrics
+from scripts.checkers.resilience import (
+    ResilienceStats,
+    RetryingTransport,
+    RetryPolicy,
+)
+from scripts.checkers.scheduler import RequestScheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; version-checker/1.0)",
+    "Accept": "application/json",
+}
+
+# Content codings advertised to servers, in preference order, with the
+# optional packages httpx decodes them with (any one of them will do)
+_ENCODING_PREFERENCE = (
+    ("zstd", ("zstandard",)),
+    ("br", ("brotli", "brotlicffi")),
+    ("gzip", ()),
+    ("deflate", ()),
+)
+
+_current_session: ContextVar[Optional["HttpSession"]] = ContextVar(
+    "current_http_session", default=None
+)
+
+
+def current_session() -> Optional["HttpSession"]:
+    """Return the session owned by the current run, if any."""
+    return _current_session.get()
+
+
+def accept_encoding() -> str:
+    """Return the ``Accept-Encoding`` value for the codings httpx can decode.
+
+    gzip and deflate are always available; brotli and zstd depend on optional
+    decoder packages (``brotli``/``brotlicffi``, ``zstandard``), so they are
+    advertised only when one of those is installed.
+    """
+    return ", ".join(
+        encoding
+        for encoding, packages in _ENCODING_PREFERENCE
+        if not packages
+        or any(importlib.util.find_spec(package) for package in packages)
+    )
+
+
+def client_options() -> Dict[str, Any]:
+    """Keyword arguments shared by every client the checkers create."""
+    headers = dict(DEFAULT_HEADERS)
+    headers["Accept-Encoding"] = accept_encoding()
+    return {
+        "timeout": DEFAULT_TIMEOUT,
+        "headers": headers,
+        "follow_redirects": True,
+    }
+
+
+class SessionStats:
+    """Counters describing how the pooled client was used during a run."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.connections_by_host: Dict[str, int] = {}
+        self.coalesced = 0
+
+    @property
+    def connections_reused(self) -> int:
+        """Requests that were served over an already open connection."""
+        return max(self.requests - self.connections_opened, 0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "tls_handshakes": self.tls_handshakes,
+            "connections_by_host": dict(self.connections_by_host),
+            "coalesced": self.coalesced,
+        }
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that counts its bytes and reports them once closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[int], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+        self.num_bytes = 0
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self.num_bytes += len(chunk)
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release(self.num_bytes)
+
+
+class _PooledTransport(httpx.AsyncBaseTransport):
+    """Transport that admits requests through the scheduler and traces them.
+
+    The product a request is made for is read from the ``"product"`` request
+    extension; the time it spent queued is reported in the ``"queue_wait"``
+    response extension. Connect, TLS, time to first byte and download time
+    are recorded in the session's ``metrics`` once the response is closed.
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, session: "HttpSession"):
+        self._inner = inner
+        self._session = session
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        product = request.extensions.get("product", "")
+        scheduler = self._session.scheduler
+        wait = await scheduler.acquire(host, product)
+        phases: Dict[str, float] = {}
+        try:
+            self._session.stats.requests += 1
+            request.extensions["trace"] = self._session._tracer(host, phases)
+            start = time.perf_counter()
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            scheduler.release(host)
+            raise
+        headers_received = time.perf_counter()
+        # Whatever the connection setup did not take was spent waiting for
+        # the server to answer
+        phases["ttfb"] = max(
+            headers_received
+            - start
+            - phases.get("connect", 0.0)
+            - phases.get("tls", 0.0),
+            0.0,
+        )
+
+        def release(num_bytes: int):
+            scheduler.release(host)
+            phases["download"] = time.perf_counter() - headers_received
+            self._session.metrics.record_request(
+                product, str(request.url), response.status_code, num_bytes, phases
+            )
+
+        response.extensions["queue_wait"] = wait
+        response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+class _BorrowedClient:
+    """Async context manager that lends the shared client without closing it."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
+
+    async def __aenter__(self) -> httpx.AsyncClient:
+        return self._client
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+class HttpSession:
+    """Pooled HTTP client owned by a run and shared by all checkers.
+
+    Usage:
+        async with HttpSession() as session:
+            await checker.update()
+
+    While the session is open, ``BaseVersionChecker.get_client`` lends out
+    the pooled client instead of building a new one, so every platform check
+    against the same host reuses one kept-alive connection.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_connections_per_host: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        host_rate: Optional[float] = 10.0,
+        host_burst: float = 10.0,
+        host_rates: Optional[Dict[str, float]] = None,
+        keepalive_expiry: float = 30.0,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_cached_responses: int = 64,
+        response_ttl: Optional[float] = None,
+        validator_cache: Optional[ValidatorCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 60.0,
+    ):
+        """Configure the pool.
+
+        Args:
+            max_connections: Total connections the pool may hold open
+            max_connections_per_host: Concurrent requests allowed per host
+                (default: 6 streams over one HTTP/2 connection, or 1 over
+                HTTP/1.1 so each host costs a single TCP and TLS handshake)
+            max_concurrency: Concurrent requests allowed in total (default:
+                ``max_connections``)
+            host_rate: Requests per second allowed per host (None: unlimited)
+            host_burst: Requests a host may receive back to back when idle
+            host_rates: Per-host overrides of ``host_rate``
+            keepalive_expiry: Seconds an idle connection is kept for reuse
+            http2: Enable HTTP/2; defaults to on when ``h2`` is installed
+            transport: Underlying transport (default: a pooled network transport)
+            max_cached_responses: Decoded responses kept for coalescing
+            response_ttl: Seconds a decoded response is shared after it
+                arrived (default: for the whole session; 0: only requests
+                still in flight are shared), for long-lived sessions
+            validator_cache: Persistent ETag/Last-Modified cache for
+                conditional requests (default: none)
+            retry_policy: Retries for transient failures (default:
+                ``RetryPolicy()``)
+            breaker_threshold: Consecutive failures that open a host's
+                circuit breaker
+            breaker_reset: Seconds a breaker stays open before a trial request
+        """
+        if http2 is None:
+            http2 = importlib.util.find_spec("h2") is not None
+        self.http2 = http2
+        if max_connections_per_host is None:
+            max_connections_per_host = 6 if http2 else 1
+        self.max_connections_per_host = max_connections_per_host
+        self.scheduler = RequestScheduler(
+            max_concurrency=max_concurrency or max_connections,
+            max_per_host=max_connections_per_host,
+            host_rate=host_rate,
+            host_burst=host_burst,
+            host_rates=host_rates,
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.stats = SessionStats()
+        self.metrics = RunMetrics()
+        self._transport = transport
+        self.max_cached_responses = max_cached_responses
+        self.response_ttl = response_ttl
+        self.validator_cache = validator_cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.resilience = ResilienceStats()
+        self._responses: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self._arrived: Dict[str, float] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._token = None
+
+    def _tracer(self, host: str, phases: Optional[Dict[str, float]] = None):
+        """httpcore trace hook counting connections and timing their setup.
+
+        Args:
+            host: Host the request goes to
+            phases: Receives ``connect`` and ``tls`` durations in seconds
+                when the request opened a new connection
+        """
+        stats = self.stats
+        phases = {} if phases is None else phases
+        started: Dict[str, float] = {}
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            if event_name == "connection.connect_tcp.started":
+                started["connect"] = time.perf_counter()
+            elif event_name == "connection.connect_tcp.complete":
+                stats.connections_opened += 1
+                stats.connections_by_host[host] = (
+                    stats.connections_by_host.get(host, 0) + 1
+                )
+                if "connect" in started:
+                    phases["connect"] = time.perf_counter() - started["connect"]
+            elif event_name == "connection.start_tls.started":
+                started["tls"] = time.perf_counter()
+            elif event_name == "connection.start_tls.complete":
+                stats.tls_handshakes += 1
+                if "tls" in started:
+                    phases["tls"] = time.perf_counter() - started["tls"]
+
+        return trace
+
+    def _build_transport(self) -> httpx.AsyncBaseTransport:
+        if self._transport is not None:
+            return self._transport
+        return httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("HttpSession is not open")
+        return self._client
+
+    def borrow(self) -> _BorrowedClient:
+        """Lend the shared client for use in an ``async with`` block."""
+        return _BorrowedClient(self.client)
+
+    async def coalesce(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fetch`` once per key and share its result within the run.
+
+        Concurrent callers await the same in-flight future; later callers get
+        the already decoded result until it is older than ``response_ttl``.
+        Failures are shared with callers that were already waiting but are
+        not cached, so a later call fetches again.
+
+        Args:
+            key: Cache key, normally the request URL
+            fetch: Coroutine factory producing the decoded response
+
+        Returns:
+            The value produced by ``fetch``
+        """
+        future = self._responses.get(key)
+        if future is not None and self._expired(key, future):
+            del self._responses[key]
+            future = None
+        if future is not None:
+            self._responses.move_to_end(key)
+            self.stats.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(fetch())
+        self._responses[key] = future
+
+        def settle(done: asyncio.Future):
+            if self._responses.get(key) is not done:
+                return
+            if done.cancelled() or done.exception() is not None:
+                del self._responses[key]
+            elif self.response_ttl is not None:
+                self._arrived[key] = time.monotonic()
+
+        future.add_done_callback(settle)
+        while len(self._responses) > self.max_cached_responses:
+            evicted, _ = self._responses.popitem(last=False)
+            self._arrived.pop(evicted, None)
+        return await asyncio.shield(future)
+
+    def _expired(self, key: str, future: asyncio.Future) -> bool:
+        if self.response_ttl is None or not future.done():
+            return False
+        arrived = self._arrived.get(key)
+        return arrived is None or time.monotonic() - arrived >= self.response_ttl
+
+    async def __aenter__(self) -> "HttpSession":
+        # Retries wrap the pooled transport so a request waiting out its
+        # backoff does not hold one of the host's connection slots
+        transport = RetryingTransport(
+            _PooledTransport(self._build_transport(), self),
+            self.retry_policy,
+            failure_threshold=self.breaker_threshold,
+            reset_timeout=self.breaker_reset,
+            stats=self.resilience,
+        )
+        self._client = httpx.AsyncClient(transport=transport, **client_options())
+        self._token = _current_session.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        _current_session.reset(self._token)
+        self._token = None
+        for future in self._responses.values():
+            future.cancel()
+        self._responses.clear()
+        self._arrived.clear()
+        client, self._client = self._client, None
+        await client.aclose()
+        logger.info(f"HTTP session stats: {self.stats.as_dict()}")
+        logger.info(f"HTTP retry stats: {self.resilience.as_dict()}")
+        logger.info(f"HTTP scheduler stats: {self.scheduler.stats.as_dict()}")
+        if self.validator_cache is not None:
+            cache = self.validator_cache
+            cache.save()
+            logger.info(
+                f"HTTP validator cache: {cache.hits} hits, {cache.misses} misses "
+                f"({cache.hit_rate:.0%} hit rate)"
+            )
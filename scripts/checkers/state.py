@@ -0,0 +1,127 @@
+import copy
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from scripts.checkers.files import atomic_write_text
+from scripts.checkers.schema import CompiledSchema
+
+logger = logging.getLogger(__name__)
+
+
+class FieldChange(NamedTuple):
+    """A single field of a platform entry that changed during a run."""
+
+    platform: str
+    field: str
+    old: Any
+    new: Any
+
+
+class ProductState:
+    """Product data loaded once per run, with change tracking.
+
+    Checkers modify the data through ``set_platform`` so the state knows
+    which fields really changed; ``changes`` accumulates them in the order
+    they were applied. ``save`` only touches the file when there is a real
+    change (or when explicitly asked to bump ``last_checked``) and replaces
+    it atomically.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        data: Dict[str, Any],
+        compiled_schema: CompiledSchema,
+        serialize: Callable[[Dict[str, Any]], str],
+    ):
+        """Wrap already loaded and validated product data.
+
+        Args:
+            path: Data file the state is written back to
+            data: Parsed product data
+            compiled_schema: Schema used to validate before writing
+            serialize: Function producing the on-disk representation
+        """
+        self.path = Path(path)
+        self.data = data
+        self.compiled_schema = compiled_schema
+        self.serialize = serialize
+        self.changes: List[FieldChange] = []
+        # Seconds the last save spent validating and writing (serialization
+        # included), for the run metrics
+        self.timings: Dict[str, float] = {}
+        self._unsaved = False
+        self._last_checked_touched = False
+
+    @property
+    def platforms(self) -> Dict[str, Dict[str, Any]]:
+        """Per-platform entries, keyed by platform name."""
+        return self.data["versions"].setdefault("platforms", {})
+
+    @property
+    def dirty(self) -> bool:
+        """Whether any platform field changed since the last save."""
+        return self._unsaved
+
+    def get_platform(self, platform: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a platform entry, or None if it is not stored."""
+        entry = self.platforms.get(platform)
+        return copy.deepcopy(entry) if entry is not None else None
+
+    def set_platform(self, platform: str, entry: Dict[str, Any]) -> List[FieldChange]:
+        """Replace a platform entry, recording the fields that differ.
+
+        Returns:
+            The changes this call introduced (empty if nothing changed)
+        """
+        previous = self.platforms.get(platform, {})
+        changes = [
+            FieldChange(platform, field, previous.get(field), entry.get(field))
+            for field in sorted(set(previous) | set(entry))
+            if previous.get(field) != entry.get(field)
+        ]
+        if changes:
+            self.platforms[platform] = copy.deepcopy(entry)
+            self.changes.extend(changes)
+            self._unsaved = True
+        return changes
+
+    def touch_last_checked(self, timestamp: Optional[str] = None):
+        """Set ``metadata.last_checked`` (default: now, in UTC)."""
+        self.data["metadata"]["last_checked"] = timestamp or (
+            datetime.utcnow().isoformat() + "Z"
+        )
+        self._last_checked_touched = True
+
+    def save(self, touch_last_checked: bool = False) -> bool:
+        """Write the state back if anything changed.
+
+        ``last_checked`` is bumped whenever versions changed. On a no-op run
+        it is only bumped, and the file only rewritten, when
+        ``touch_last_checked`` is set.
+
+        Returns:
+            True if the file was written
+        """
+        if not self.dirty and not touch_last_checked:
+            logger.info(f"No changes for {self.path.name}, not rewriting it")
+            return False
+
+        if not self._last_checked_touched:
+            self.touch_last_checked()
+        start = time.perf_counter()
+        serialized = self.serialize(self.data)
+        serialized_at = time.perf_counter()
+        self.compiled_schema.validate_document(serialized, self.data)
+        validated_at = time.perf_counter()
+        atomic_write_text(self.path, serialized)
+        self.timings = {
+            "validate": validated_at - serialized_at,
+            "write": serialized_at - start + time.perf_counter() - validated_at,
+        }
+        self._unsaved = False
+        self._last_checked_touched = False
+        return True
@@ -0,0 +1,164 @@
+import codecs
+import json
+import re
+from typing import Any, List, Optional, Sequence, Union
+
+PathPart = Union[str, int]
+
+# Characters that matter to the structure scanner outside of strings
+_STRUCTURE = re.compile(r'["{}\[\]:,]')
+# Characters that can end (or escape within) a string
+_STRING_END = re.compile(r'["\\]')
+_DECODER = json.JSONDecoder()
+
+
+class _Frame:
+    __slots__ = ("is_object", "key", "index", "expect_key")
+
+    def __init__(self, is_object: bool):
+        self.is_object = is_object
+        self.key: Optional[str] = None
+        self.index = 0
+        self.expect_key = is_object
+
+
+class JsonArrayItems:
+    """Incrementally extract the items of one array from streamed JSON.
+
+    Bytes are fed as they arrive. The scanner tracks only enough structure
+    to find the array at ``path`` (object keys and array indexes, e.g.
+    ``["interfaceLanguages", "swift", 0, "children"]``); each item of that
+    array is decoded as soon as it is complete. Text that has been consumed
+    is discarded, so memory stays proportional to the largest single item
+    rather than to the document.
+    """
+
+    def __init__(self, path: Sequence[PathPart]):
+        """Create a parser for the array at ``path``.
+
+        Args:
+            path: Object keys and array indexes leading to the target array
+        """
+        self.path = list(path)
+        self.found = False
+        self.done = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._string_start = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Consume the next chunk of the document.
+
+        Returns:
+            Items of the target array completed by this chunk
+        """
+        if self.done:
+            return []
+        self._buffer += self._decoder.decode(chunk)
+        if not self.found:
+            self._scan()
+        items = self._read_items() if self.found else []
+        self._compact()
+        return items
+
+    def _current_path(self) -> List[PathPart]:
+        return [
+            frame.key if frame.is_object else frame.index for frame in self._stack
+        ]
+
+    def _scan(self):
+        """Walk the structure until the target array opens."""
+        buffer = self._buffer
+        position = self._position
+        while True:
+            if self._in_string:
+                match = _STRING_END.search(buffer, position)
+                if match is None:
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(buffer):
+                        # Escape split across chunks: revisit once more arrives
+                        position = match.start()
+                        break
+                    position = match.end() + 1
+                    continue
+                self._in_string = False
+                position = match.end()
+                if self._string_is_key:
+                    self._stack[-1].key = json.loads(
+                        buffer[self._string_start : position]
+                    )
+                continue
+
+            match = _STRUCTURE.search(buffer, position)
+            if match is None:
+                position = len(buffer)
+                break
+            char = match.group()
+            position = match.end()
+            top = self._stack[-1] if self._stack else None
+
+            if char == '"':
+                self._in_string = True
+                self._string_is_key = top is not None and top.expect_key
+                self._string_start = match.start()
+            elif char == "{":
+                self._stack.append(_Frame(True))
+            elif char == "[":
+                opens_target = self._current_path() == self.path
+                self._stack.append(_Frame(False))
+                if opens_target:
+                    self.found = True
+                    break
+            elif char in "}]":
+                self._stack.pop()
+            elif char == ":":
+                top.expect_key = False
+            elif char == ",":
+                if top.is_object:
+                    top.expect_key = True
+                    top.key = None
+                else:
+                    top.index += 1
+
+        self._position = position
+
+    def _read_items(self) -> List[Any]:
+        items = []
+        buffer = self._buffer
+        position = self._position
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position >= len(buffer):
+                break
+            if buffer[position] == "]":
+                self.done = True
+                position += 1
+                break
+            try:
+                item, end = _DECODER.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Item not complete yet
+                break
+            if end == len(buffer) and isinstance(item, (int, float)):
+                # A number at the end of the buffer may still be growing
+                break
+            items.append(item)
+            position = end
+        self._position = position
+        return items
+
+    def _compact(self):
+        # While still scanning, keep a partial string so a key can be decoded
+        if self._in_string and not self.found:
+            start = self._string_start
+        else:
+            start = self._position
+        self._buffer = self._buffer[start:]
+        self._position -= start
+        self._string_start -= start
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""``version-tracker`` command line entry point.
+
+Usage:
+    version-tracker list
+    version-tracker get PRODUCT [PLATFORM]
+    version-tracker check [--product NAME ...] [--platform NAME ...]
+    version-tracker serve [--port 8080]
+    version-tracker history {at,log} ...
+    version-tracker daemon [--product NAME ...] [--base-interval 3600]
+
+Only the standard library is imported up front. Each command imports what
+it needs when it runs, so ``--help``, ``list`` and ``get`` never load the
+HTTP client or the schema validator.
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Commands implemented by another module's ``main(argv)``
+DELEGATED: Dict[str, Tuple[str, str]] = {
+    "check": ("scripts.run_all", "Run the version checkers and update data files"),
+    "serve": ("scripts.server", "Serve the version data over HTTP"),
+    "history": ("scripts.history", "Query the version change history"),
+    "daemon": ("scripts.daemon", "Poll the checkers continuously"),
+}
+
+
+def _list(args: argparse.Namespace) -> int:
+    from scripts.checkers.registry import CheckerRegistry
+
+    for name in CheckerRegistry().names():
+        print(name)
+    return 0
+
+
+def _get(args: argparse.Namespace) -> int:
+    import json
+
+    from scripts.lookup import VersionIndex, thaw
+
+    index = VersionIndex(Path(args.data_dir)) if args.data_dir else VersionIndex()
+    if args.platform:
+        version = index.get_version(args.product, args.platform)
+        if version is None:
+            print(
+                f"Unknown product or platform: {args.product}/{args.platform}",
+                file=sys.stderr,
+            )
+            return 1
+        print(version)
+        return 0
+
+    product = index.get_product(args.product)
+    if product is None:
+        print(f"Unknown product: {args.product}", file=sys.stderr)
+        return 1
+    print(json.dumps(thaw(product), indent=2))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="version-tracker", description="Track software versions"
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    commands.add_parser("list", help="List the products that can be checked")
+
+    get = commands.add_parser("get", help="Print a tracked version")
+    get.add_argument("product")
+    get.add_argument("platform", nargs="?")
+    get.add_argument("--data-dir", help="Directory of product data files")
+
+    for name, (_, help_text) in DELEGATED.items():
+        # Arguments are parsed by the command's own module
+        commands.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+
+HANDLERS: Dict[str, Callable[[argparse.Namespace], int]] = {
+    "list": _list,
+    "get": _get,
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv: List[str] = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] in DELEGATED:
+        import importlib
+
+        module = importlib.import_module(DELEGATED[argv[0]][0])
+        # So the command's own argparse usage reads "version-tracker <command>"
+        program = sys.argv[0]
+        sys.argv[0] = f"version-tracker {argv[0]}"
+        try:
+            return module.main(argv[1:])
+        finally:
+            sys.argv[0] = program
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    return HANDLERS[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+"""Long-running checker daemon with per-product adaptive polling.
+
+Keeps every checker resident on one event loop and one pooled HTTP session
+and polls each product on its own schedule:
+
+- a check that finds nothing new stretches the product's interval by
+  ``--backoff``, up to ``--max-interval``
+- a detected change resets it to ``--base-interval``
+- during the product's release windows (hours of the week in which its
+  versions changed before, according to ``data/history``) it is polled
+  every ``--min-interval``
+- every delay is jittered by ``--jitter`` so products do not poll in lockstep
+
+Check, request and change counts and detection latency per product are
+written to a JSON report every ``--report-interval`` seconds and on exit.
+
+Usage:
+    python -m scripts.daemon [--product NAME ...] [--base-interval 3600]
+        [--min-interval 300] [--max-interval 21600] [--duration SECONDS]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import signal
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from scripts.checkers.registry import CheckerRegistry
+from scripts.history import DEFAULT_HISTORY_DIR, HistoryStore
+from scripts.lookup import DEFAULT_EVENTS_FILE
+
+if TYPE_CHECKING:
+    import httpx
+
+    from scripts.checkers.base_checker import BaseVersionChecker
+    from scripts.checkers.events import ChangeFeed
+    from scripts.checkers.session import HttpSession
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+HOURS_PER_WEEK = 7 * 24
+
+
+class IntervalPolicy(NamedTuple):
+    """How a product's polling interval adapts, in seconds."""
+
+    min_interval: float = 300.0
+    base_interval: float = 3600.0
+    max_interval: float = 6 * 3600.0
+    backoff: float = 1.5
+    jitter: float = 0.1
+
+
+def _hour_of_week(moment: datetime) -> int:
+    moment = moment.astimezone(timezone.utc)
+    return moment.weekday() * 24 + moment.hour
+
+
+class ReleaseWindows:
+    """Hours of the week (UTC) in which a product's versions changed before."""
+
+    def __init__(self, moments: Iterable[datetime] = (), spread_hours: int = 1):
+        """Count past releases per hour of the week.
+
+        Args:
+            moments: Times at which versions changed
+            spread_hours: Hours on each side of a past release that still
+                count as inside its window
+        """
+        self.counts = [0] * HOURS_PER_WEEK
+        self.spread_hours = spread_hours
+        for moment in moments:
+            self.add(moment)
+
+    @classmethod
+    def from_history(
+        cls,
+        history: HistoryStore,
+        product: str,
+        since: Optional[datetime] = None,
+        spread_hours: int = 1,
+    ) -> "ReleaseWindows":
+        """Build the windows from recorded changes of ``product``.
+
+        The first version recorded for a platform marks when tracking
+        started, not a release, so it is skipped.
+        """
+        records = history.changes(
+            product, since=since.isoformat() if since is not None else None
+        )
+        return cls(
+            (
+                datetime.fromisoformat(record["timestamp"].replace("Z", "+00:00"))
+                for record in records
+                if record.get("previous") not in (None, "0.0.0")
+            ),
+            spread_hours,
+        )
+
+    @property
+    def releases(self) -> int:
+        return sum(self.counts)
+
+    def add(self, moment: datetime):
+        self.counts[_hour_of_week(moment)] += 1
+
+    def active(self, moment: datetime) -> bool:
+        """Whether ``moment`` falls in or next to an hour with past releases."""
+        hour = _hour_of_week(moment)
+        return any(
+            self.counts[(hour + offset) % HOURS_PER_WEEK]
+            for offset in range(-self.spread_hours, self.spread_hours + 1)
+        )
+
+
+class ProductSchedule:
+    """Adaptive polling interval and counters for one product.
+
+    Detection latency cannot be measured exactly, because upstreams do not
+    say when a version was published. What is known is that the change
+    happened after the previous successful check, so the time since that
+    check is recorded as an upper bound.
+    """
+
+    def __init__(
+        self,
+        product: str,
+        policy: IntervalPolicy = IntervalPolicy(),
+        windows: Optional[ReleaseWindows] = None,
+    ):
+        self.product = product
+        self.policy = policy
+        self.windows = windows or ReleaseWindows()
+        self.interval = policy.base_interval
+        self.checks = 0
+        self.failures = 0
+        self.changes = 0
+        self.requests = 0
+        self.last_success: Optional[float] = None
+        self.next_check: Optional[float] = None
+        self.detection_latencies: List[float] = []
+
+    def record(self, now: float, success: bool, changed: bool, requests: int = 0):
+        """Account for a finished check and adapt the interval.
+
+        Args:
+            now: Time the check finished (seconds since the epoch)
+            success: Whether every platform was checked
+            changed: Whether any version changed
+            requests: HTTP responses the check received
+        """
+        self.checks += 1
+        self.requests += requests
+        if not success:
+            self.failures += 1
+        if changed:
+            self.changes += 1
+            if self.last_success is not None:
+                self.detection_latencies.append(now - self.last_success)
+            self.windows.add(datetime.fromtimestamp(now, timezone.utc))
+            self.interval = self.policy.base_interval
+        elif success:
+            self.interval = min(
+                self.interval * self.policy.backoff, self.policy.max_interval
+            )
+        if success:
+            self.last_success = now
+
+    def in_window(self, now: float) -> bool:
+        return self.windows.active(datetime.fromtimestamp(now, timezone.utc))
+
+    def next_delay(
+        self, now: float, rand: Callable[[], float] = random.random
+    ) -> float:
+        """Seconds until the next check, jittered.
+
+        Args:
+            now: Current time (seconds since the epoch)
+            rand: Uniform random number in ``[0, 1)``
+        """
+        delay = self.interval
+        if self.in_window(now):
+            delay = min(delay, self.policy.min_interval)
+        delay *= 1 + self.policy.jitter * (2 * rand() - 1)
+        self.next_check = now + delay
+        return delay
+
+    def as_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.detection_latencies)
+        return {
+            "checks": self.checks,
+            "failures": self.failures,
+            "changes": self.changes,
+            "requests": self.requests,
+            "interval_s": round(self.interval, 1),
+            "next_check": (
+                datetime.fromtimestamp(self.next_check, timezone.utc).isoformat()
+                if self.next_check is not None
+                else None
+            ),
+            "historical_releases": self.windows.releases,
+            "detection_latency_bound_s": (
+                {
+                    "count": len(latencies),
+                    "mean": round(sum(latencies) / len(latencies), 1),
+                    "max": round(latencies[-1], 1),
+                }
+                if latencies
+                else {"count": 0}
+            ),
+        }
+
+
+class Daemon:
+    """Polls resident checkers, each on its own adaptive schedule."""
+
+    def __init__(
+        self,
+        checkers: Mapping[str, "BaseVersionChecker"],
+        policy: IntervalPolicy = IntervalPolicy(),
+        history: Optional[HistoryStore] = None,
+        window_hours: int = 1,
+        history_days: int = 365,
+        http_cache: Optional[Path] = None,
+        report_file: Optional[Path] = None,
+        metrics_file: Optional[Path] = None,
+        report_interval: float = 300.0,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+        change_feed: Optional["ChangeFeed"] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rand: Callable[[], float] = random.random,
+    ):
+        """Set up the schedules.
+
+        Args:
+            checkers: Checkers to poll, by product name
+            policy: Interval bounds, backoff and jitter
+            history: Version history the release windows are learned from
+                (default: none, so there are no windows until changes are
+                seen)
+            window_hours: Hours on each side of a past release that are
+                polled at ``policy.min_interval``
+            history_days: How far back the history is taken into account
+            http_cache: Validator cache file for conditional requests
+            report_file: JSON report written periodically and on exit
+            metrics_file: OpenMetrics textfile covering the last report
+                period
+            report_interval: Seconds between report writes
+            transport: Transport under the pooled session (default: the
+                network)
+            change_feed: Where detected version changes are published
+                (default: nowhere)
+            clock: Wall clock (seconds since the epoch)
+            sleep: Coroutine used to wait between checks
+            rand: Uniform random numbers for the jitter
+        """
+        self.checkers = dict(checkers)
+        self.policy = policy
+        self.http_cache = http_cache
+        self.report_file = report_file
+        self.metrics_file = metrics_file
+        self.report_interval = report_interval
+        self.transport = transport
+        self.change_feed = change_feed
+        self._clock = clock
+        self._sleep = sleep
+        self._rand = rand
+        self._stopped: Optional[asyncio.Event] = None
+        self.started: Optional[float] = None
+        self.session: Optional["HttpSession"] = None
+
+        since = datetime.fromtimestamp(clock(), timezone.utc) - timedelta(
+            days=history_days
+        )
+        self.schedules = {
+            name: ProductSchedule(
+                name,
+                policy,
+                ReleaseWindows.from_history(history, name, since, window_hours)
+                if history is not None
+                else ReleaseWindows(spread_hours=window_hours),
+            )
+            for name in self.checkers
+        }
+
+    async def poll(self, name: str) -> bool:
+        """Check one product now and feed the outcome to its schedule.
+
+        Returns:
+            Whether a version changed
+        """
+        checker = self.checkers[name]
+        requests_before = checker.requests_made
+        # Only changes loaded by this update count, not the previous poll's
+        checker.state = None
+        try:
+            success = await checker.update()
+        except Exception as e:
+            logger.error(f"Checker {name} raised: {e}")
+            success = False
+        # Replacing the placeholder of a new data file is not a release
+        changed = checker.state is not None and any(
+            change.field == "version" and change.old not in (None, "0.0.0")
+            for change in checker.state.changes
+        )
+        self.schedules[name].record(
+            self._clock(), success, changed, checker.requests_made - requests_before
+        )
+        if changed:
+            logger.info(f"New {name} version detected")
+        cache = self.session.validator_cache if self.session is not None else None
+        if cache is not None:
+            try:
+                cache.save()
+            except Exception as e:
+                # Losing validators costs full downloads, not the poll loop
+                logger.error(f"Could not save the validator cache: {e}")
+        return changed
+
+    async def _poll_forever(self, name: str):
+        schedule = self.schedules[name]
+        while True:
+            await self.poll(name)
+            delay = schedule.next_delay(self._clock(), self._rand)
+            logger.info(f"Next {name} check in {delay:.0f}s")
+            await self._sleep(delay)
+
+    async def _report_forever(self):
+        while True:
+            await self._sleep(self.report_interval)
+            self.write_report()
+
+    def report(self) -> Dict[str, Any]:
+        now = self._clock()
+        return {
+            "generated_at": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            "uptime_s": round(now - self.started, 1) if self.started else 0.0,
+            "products": {
+                name: schedule.as_dict()
+                for name, schedule in sorted(self.schedules.items())
+            },
+        }
+
+    def write_report(self):
+        """Write the JSON report and the metrics of the period that just ended."""
+        from scripts.checkers.files import atomic_write_text
+        from scripts.checkers.metrics import RunMetrics
+        from scripts.checkers.scheduler import SchedulerStats
+
+        if self.report_file is not None:
+            atomic_write_text(
+                self.report_file, json.dumps(self.report(), indent=2) + "\n"
+            )
+        if self.session is not None:
+            if self.metrics_file is not None:
+                self.session.metrics.write(self.metrics_file)
+            # Start a new period so a resident process does not grow forever
+            self.session.metrics = RunMetrics()
+            self.session.scheduler.stats = SchedulerStats()
+
+    def stop(self):
+        """Ask ``run`` to finish after the checks in progress."""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def run(self) -> Dict[str, Any]:
+        """Poll until ``stop`` is called.
+
+        Returns:
+            The final report
+        """
+        from scripts.checkers.events import ChangeFeed
+        from scripts.checkers.http_cache import ValidatorCache
+        from scripts.checkers.session import HttpSession
+
+        self._stopped = asyncio.Event()
+        self.started = self._clock()
+        validator_cache = ValidatorCache(self.http_cache) if self.http_cache else None
+        # Responses are only shared while in flight: every poll must see
+        # what upstream serves now
+        self.session = HttpSession(
+            validator_cache=validator_cache, response_ttl=0, transport=self.transport
+        )
+        async with self.change_feed or ChangeFeed([]), self.session:
+            tasks = [
+                asyncio.create_task(self._poll_forever(name)) for name in self.checkers
+            ]
+            if self.report_file is not None or self.metrics_file is not None:
+                tasks.append(asyncio.create_task(self._report_forever()))
+            try:
+                await self._stopped.wait()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                self.write_report()
+            report = self.report()
+        self.session = None
+        logger.info(f"Daemon report: {report}")
+        return report
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    defaults = IntervalPolicy()
+    parser = argparse.ArgumentParser(description="Poll version checkers continuously")
+    parser.add_argument(
+        "--product",
+        action="append",
+        dest="products",
+        help="Only poll this product (repeatable)",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=defaults.min_interval,
+        help="Seconds between checks inside a release window (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--base-interval",
+        type=float,
+        default=defaults.base_interval,
+        help="Seconds between checks after a change (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=defaults.max_interval,
+        help="Longest interval reached by backing off (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--backoff",
+        type=float,
+        default=defaults.backoff,
+        help="Interval growth after a check without changes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=defaults.jitter,
+        help="Relative random spread of every delay (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--window-hours",
+        type=int,
+        default=1,
+        help="Hours around past releases polled at --min-interval "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--history-days",
+        type=int,
+        default=365,
+        help="Days of history used to find release windows (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--history-dir",
+        type=Path,
+        default=DEFAULT_HISTORY_DIR,
+        help="Version history directory (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--http-cache",
+        type=Path,
+        default=CACHE_DIR / "http-validators.json",
+        help="ETag/Last-Modified cache file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-http-cache",
+        action="store_const",
+        const=None,
+        dest="http_cache",
+        help="Always download full responses",
+    )
+    parser.add_argument(
+        "--events-file",
+        type=Path,
+        default=DEFAULT_EVENTS_FILE,
+        help="Append-only NDJSON feed of version changes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-events",
+        action="store_const",
+        const=None,
+        dest="events_file",
+        help="Do not append version changes to the feed",
+    )
+    parser.add_argument(
+        "--webhook",
+        action="append",
+        dest="webhooks",
+        metavar="URL",
+        help="POST version changes to this URL (repeatable)",
+    )
+    parser.add_argument(
+        "--webhook-batch-size",
+        type=int,
+        default=100,
+        help="Most change events per webhook request (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--report-file",
+        type=Path,
+        default=CACHE_DIR / "daemon-report.json",
+        help="Per-product report (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        default=CACHE_DIR / "metrics" / "version_tracker.prom",
+        help="OpenMetrics textfile (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=300.0,
+        help="Seconds between report writes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        help="Stop after this many seconds (default: run until interrupted)",
+    )
+    return parser.parse_args(argv)
+
+
+def create_checkers(
+    registry: CheckerRegistry, names: Sequence[str]
+) -> Dict[str, "BaseVersionChecker"]:
+    """Create the checkers to poll, skipping any that fail to load.
+
+    A broken definition or plugin only takes its own product out of the
+    rotation; the error is logged.
+    """
+    checkers = {}
+    for name in names:
+        try:
+            checkers[name] = registry.create(name)
+        except Exception as e:
+            logger.error(f"Could not load checker {name}: {e}", exc_info=True)
+    return checkers
+
+
+async def _serve(daemon: Daemon, duration: Optional[float]):
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, daemon.stop)
+    if duration is not None:
+        loop.call_later(duration, daemon.stop)
+    await daemon.run()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    registry = CheckerRegistry()
+    selected = args.products or registry.names()
+    unknown = [name for name in selected if name not in registry]
+    if unknown:
+        logger.error(f"Unknown product(s): {', '.join(unknown)}")
+        return 2
+
+    checkers = create_checkers(registry, selected)
+    if not checkers:
+        logger.error("No checker could be loaded")
+        return 1
+
+    from scripts.checkers.events import ChangeFeed
+
+    daemon = Daemon(
+        checkers,
+        IntervalPolicy(
+            min_interval=args.min_interval,
+            base_interval=args.base_interval,
+            max_interval=args.max_interval,
+            backoff=args.backoff,
+            jitter=args.jitter,
+        ),
+        history=HistoryStore(args.history_dir),
+        window_hours=args.window_hours,
+        history_days=args.history_days,
+        http_cache=args.http_cache,
+        report_file=args.report_file,
+        metrics_file=args.metrics_file,
+        report_interval=args.report_interval,
+        change_feed=ChangeFeed.create(
+            args.events_file, args.webhooks or (), args.webhook_batch_size
+        ),
+    )
+    asyncio.run(_serve(daemon, args.duration))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Append-only version history with point-in-time lookups.
+
+Every version change detected by a checker is appended as one JSON line to
+``data/history/<product>.jsonl``. Files are indexed in memory per
+(product, platform) on first use, so lookups are binary searches.
+
+Usage:
+    python -m scripts.history at chrome windows 2026-08-01
+    python -m scripts.history log chrome [--platform windows]
+        [--since 2026-01-01] [--until 2026-06-30]
+"""
+import argparse
+import json
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_HISTORY_DIR = Path(__file__).parent.parent / "data" / "history"
+
+
+def normalize_timestamp(value: Optional[str] = None) -> str:
+    """Return a UTC timestamp in the fixed-width form used by the store.
+
+    Fixed width keeps timestamps ordered as plain strings. Accepts ISO 8601
+    dates and datetimes; naive values are taken to be UTC.
+
+    Args:
+        value: Timestamp to normalize (default: now)
+    """
+    if value is None:
+        moment = datetime.now(timezone.utc)
+    else:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+    moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.isoformat(timespec="microseconds") + "Z"
+
+
+class _PlatformIndex:
+    """Records for one (product, platform), ordered by timestamp."""
+
+    def __init__(self):
+        self.timestamps: List[str] = []
+        self.records: List[Dict[str, Any]] = []
+
+    def add(self, record: Dict[str, Any]):
+        timestamp = record["timestamp"]
+        if not self.timestamps or timestamp >= self.timestamps[-1]:
+            self.timestamps.append(timestamp)
+            self.records.append(record)
+        else:
+            position = bisect_right(self.timestamps, timestamp)
+            self.timestamps.insert(position, timestamp)
+            self.records.insert(position, record)
+
+
+class HistoryStore:
+    """Per-product JSONL history files with an in-memory timestamp index."""
+
+    def __init__(self, directory: Path = DEFAULT_HISTORY_DIR):
+        """Open a history directory.
+
+        Args:
+            directory: Directory holding ``<product>.jsonl`` files
+        """
+        self.directory = Path(directory)
+        self._indexes: Dict[str, Dict[str, _PlatformIndex]] = {}
+
+    def _path(self, product: str) -> Path:
+        return self.directory / f"{product}.jsonl"
+
+    def _index(self, product: str) -> Dict[str, _PlatformIndex]:
+        if product not in self._indexes:
+            index: Dict[str, _PlatformIndex] = {}
+            path = self._path(product)
+            if path.exists():
+                with open(path, "r") as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            index.setdefault(
+                                record["platform"], _PlatformIndex()
+                            ).add(record)
+            self._indexes[product] = index
+        return self._indexes[product]
+
+    def append(
+        self,
+        product: str,
+        platform: str,
+        version: str,
+        previous: Optional[str] = None,
+        timestamp: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Append one version change.
+
+        Returns:
+            The record that was written
+        """
+        record = {
+            "timestamp": normalize_timestamp(timestamp),
+            "platform": platform,
+            "version": version,
+            "previous": previous,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self._path(product), "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        if product in self._indexes:
+            self._indexes[product].setdefault(platform, _PlatformIndex()).add(record)
+        return record
+
+    def products(self) -> List[str]:
+        """Products that have any recorded history."""
+        return sorted(path.stem for path in self.directory.glob("*.jsonl"))
+
+    def platforms(self, product: str) -> List[str]:
+        """Platforms with recorded history for a product."""
+        return sorted(self._index(product))
+
+    def version_at(self, product: str, platform: str, when: str) -> Optional[str]:
+        """Version that was current at ``when``.
+
+        Returns:
+            The version, or None if nothing was recorded at or before ``when``
+        """
+        index = self._index(product).get(platform)
+        if index is None:
+            return None
+        position = bisect_right(index.timestamps, normalize_timestamp(when))
+        if position == 0:
+            return None
+        return index.records[position - 1]["version"]
+
+    def changes(
+        self,
+        product: str,
+        platform: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Changes recorded in ``[since, until]``, oldest first.
+
+        Args:
+            product: Product identifier
+            platform: Only this platform (default: all platforms)
+            since: Inclusive lower bound (default: beginning of history)
+            until: Inclusive upper bound (default: now)
+        """
+        index = self._index(product)
+        selected = [platform] if platform else sorted(index)
+        found: List[Tuple[str, Dict[str, Any]]] = []
+        for name in selected:
+            platform_index = index.get(name)
+            if platform_index is None:
+                continue
+            start = (
+                bisect_left(platform_index.timestamps, normalize_timestamp(since))
+                if since
+                else 0
+            )
+            end = (
+                bisect_right(platform_index.timestamps, normalize_timestamp(until))
+                if until
+                else len(platform_index.timestamps)
+            )
+            found.extend(
+                (platform_index.timestamps[i], platform_index.records[i])
+                for i in range(start, end)
+            )
+        found.sort(key=lambda item: item[0])
+        return [record for _, record in found]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query version history")
+    parser.add_argument(
+        "--history-dir",
+        type=Path,
+        default=DEFAULT_HISTORY_DIR,
+        help="History directory (default: %(default)s)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    at = commands.add_parser("at", help="Version current at a point in time")
+    at.add_argument("product")
+    at.add_argument("platform")
+    at.add_argument("when", help="ISO 8601 date or datetime (UTC)")
+
+    log = commands.add_parser("log", help="List recorded changes")
+    log.add_argument("product")
+    log.add_argument("--platform")
+    log.add_argument("--since")
+    log.add_argument("--until")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    store = HistoryStore(args.history_dir)
+
+    if args.command == "at":
+        version = store.version_at(args.product, args.platform, args.when)
+        if version is None:
+            print(
+                f"No {args.product} {args.platform} version recorded before {args.when}",
+                file=sys.stderr,
+            )
+            return 1
+        print(version)
+        return 0
+
+    for record in store.changes(args.product, args.platform, args.since, args.until):
+        print(
+            f"{record['timestamp']}  {record['platform']:<8} "
+            f"{record['previous'] or '-'} -> {record['version']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
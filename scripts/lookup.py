@@ -0,0 +1,183 @@
+"""Fast read-side access to the tracked versions in ``data/*.json``.
+
+Files are parsed once into an immutable in-memory index keyed by
+(identifier, platform); lookups are dictionary hits with no disk I/O.
+``reload()`` re-parses only files whose modification time changed.
+
+This module only depends on the standard library so consumers can import
+it without pulling in the checker dependencies.
+
+Usage:
+    from scripts import lookup
+
+    lookup.get_version("chrome", "windows")
+    lookup.is_newer("chrome", "windows", "120.0.6099.129")
+"""
+import json
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from scripts.versions import version_key
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
+# Change feed appended to by the checkers (see ``scripts.checkers.events``)
+DEFAULT_EVENTS_FILE = DEFAULT_DATA_DIR / "changes.ndjson"
+
+
+class _Snapshot(NamedTuple):
+    # file path -> (mtime_ns, identifier, read-only product data)
+    files: Mapping[Path, Tuple[int, str, Mapping[str, Any]]]
+    products: Mapping[str, Mapping[str, Any]]
+    entries: Mapping[Tuple[str, str], Mapping[str, Any]]
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable (JSON-serializable) copy of indexed data."""
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    return value
+
+
+class VersionIndex:
+    """Immutable index over a directory of product data files."""
+
+    def __init__(self, data_dir: Path = DEFAULT_DATA_DIR):
+        """Create an index; files are loaded on first lookup.
+
+        Args:
+            data_dir: Directory containing ``<product>.json`` files
+        """
+        self.data_dir = Path(data_dir)
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+
+    def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.reload()
+            snapshot = self._snapshot
+        return snapshot
+
+    def reload(self) -> bool:
+        """Pick up added, changed and removed data files.
+
+        Only files whose modification time changed are parsed again.
+
+        Returns:
+            True if the index changed
+        """
+        with self._lock:
+            previous = self._snapshot.files if self._snapshot else {}
+            files: Dict[Path, Tuple[int, str, Mapping[str, Any]]] = {}
+            for path in sorted(self.data_dir.glob("*.json")):
+                mtime = path.stat().st_mtime_ns
+                cached = previous.get(path)
+                if cached is not None and cached[0] == mtime:
+                    files[path] = cached
+                    continue
+                with open(path, "r") as f:
+                    data = json.load(f)
+                files[path] = (mtime, data.get("identifier", path.stem), _freeze(data))
+
+            if self._snapshot is not None and files == previous:
+                return False
+
+            products: Dict[str, Mapping[str, Any]] = {}
+            entries: Dict[Tuple[str, str], Mapping[str, Any]] = {}
+            for _, identifier, data in files.values():
+                products[identifier] = data
+                for platform, entry in data["versions"]["platforms"].items():
+                    entries[(identifier, platform)] = entry
+
+            self._snapshot = _Snapshot(
+                MappingProxyType(files),
+                MappingProxyType(products),
+                MappingProxyType(entries),
+            )
+            return True
+
+    def list_products(self) -> List[str]:
+        """Identifiers of all tracked products, sorted."""
+        return sorted(self._current().products)
+
+    def get_product(self, product: str) -> Optional[Mapping[str, Any]]:
+        """Read-only data for a product, or None if it is not tracked."""
+        return self._current().products.get(product)
+
+    def get_entry(self, product: str, platform: str) -> Optional[Mapping[str, Any]]:
+        """Read-only platform entry (version, check_url, ...), or None."""
+        return self._current().entries.get((product, platform))
+
+    def get_version(
+        self, product: str, platform: str, channel: str = "stable"
+    ) -> Optional[str]:
+        """Tracked version for a product on a platform, or None.
+
+        Channels other than ``"stable"`` (``"beta"``, ``"esr"``, ...) are
+        only known for products whose checker tracks them.
+        """
+        entry = self._current().entries.get((product, platform))
+        if entry is None:
+            return None
+        if channel == "stable":
+            return entry["version"]
+        channel_entry = entry.get("channels", {}).get(channel)
+        return channel_entry["version"] if channel_entry is not None else None
+
+    def is_newer(
+        self, product: str, platform: str, version: str, channel: str = "stable"
+    ) -> bool:
+        """Whether the tracked version is newer than ``version``.
+
+        Returns False if the product, platform or channel is not tracked.
+
+        Raises:
+            InvalidVersion: If either version cannot be parsed (see
+                ``scripts.versions``)
+        """
+        current = self.get_version(product, platform, channel)
+        if current is None:
+            return False
+        return version_key(current) > version_key(version)
+
+
+_default_index = VersionIndex()
+
+
+def reload() -> bool:
+    """Reload the default index; see ``VersionIndex.reload``."""
+    return _default_index.reload()
+
+
+def list_products() -> List[str]:
+    """Identifiers of all tracked products in the default data directory."""
+    return _default_index.list_products()
+
+
+def get_product(product: str) -> Optional[Mapping[str, Any]]:
+    """Read-only data for a product from the default index."""
+    return _default_index.get_product(product)
+
+
+def get_version(product: str, platform: str, channel: str = "stable") -> Optional[str]:
+    """Tracked version for a product on a platform from the default index."""
+    return _default_index.get_version(product, platform, channel)
+
+
+def is_newer(
+    product: str, platform: str, version: str, channel: str = "stable"
+) -> bool:
+    """Whether the tracked version is newer than ``version``."""
+    return _default_index.is_newer(product, platform, version, channel)
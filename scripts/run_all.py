@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""Run every version checker concurrently in a single process.
+
+Usage:
+    python -m scripts.run_all [--product NAME ...] [--platform NAME ...]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from scripts.checkers.registry import CheckerRegistry
+from scripts.lookup import DEFAULT_EVENTS_FILE
+
+if TYPE_CHECKING:
+    import httpx
+
+    from scripts.checkers.base_checker import BaseVersionChecker
+    from scripts.checkers.events import ChangeFeed
+    from scripts.checkers.resilience import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HTTP_CACHE = Path(__file__).parent.parent / ".cache" / "http-validators.json"
+DEFAULT_METRICS_DIR = Path(__file__).parent.parent / ".cache" / "metrics"
+
+
+def log_transfer_stats(checkers: Dict[str, "BaseVersionChecker"]):
+    """Log per-checker and total transfer stats (see ``transfer_stats``)."""
+    total = {
+        "requests": 0,
+        "bytes_downloaded": 0,
+        "decode_ms": 0.0,
+        "queue_wait_ms": 0.0,
+    }
+    for name, checker in checkers.items():
+        stats = checker.transfer_stats()
+        logger.info(f"Transfer stats for {name}: {stats}")
+        for key in total:
+            total[key] += stats[key]
+    total["decode_ms"] = round(total["decode_ms"], 3)
+    total["queue_wait_ms"] = round(total["queue_wait_ms"], 3)
+    logger.info(f"Transfer stats for run: {total}")
+
+
+async def run_checkers(
+    products: Optional[Sequence[str]] = None,
+    platforms: Optional[Sequence[str]] = None,
+    http_cache: Optional[Path] = None,
+    touch_last_checked: bool = False,
+    retry_policy: Optional["RetryPolicy"] = None,
+    registry: Optional[CheckerRegistry] = None,
+    transport: Optional["httpx.AsyncBaseTransport"] = None,
+    metrics_file: Optional[Path] = None,
+    report_file: Optional[Path] = None,
+    change_feed: Optional["ChangeFeed"] = None,
+) -> int:
+    """Run the selected checkers together on the current event loop.
+
+    Args:
+        products: Product names to run (default: all discovered products)
+        platforms: Platforms to check (default: each product's own platforms)
+        http_cache: Validator cache file for conditional requests (default:
+            no conditional requests)
+        touch_last_checked: Rewrite data files with a new ``last_checked``
+            even when no version changed
+        retry_policy: Retries for transient HTTP failures (default:
+            ``RetryPolicy()``)
+        registry: Where checkers are looked up (default: built-ins,
+            ``definitions/`` and installed plugins)
+        transport: Transport under the pooled session, e.g. a cassette
+            recorder or replayer (default: the network)
+        metrics_file: OpenMetrics textfile with the run's stage histograms
+            and request counters (default: not written)
+        report_file: JSON report of the run's timings by stage, product,
+            platform and URL (default: not written)
+        change_feed: Where detected version changes are published
+            (default: nowhere)
+
+    Returns:
+        Process exit code: 0 if every check succeeded, 1 if any failed or
+        could not be loaded, 2 if the filters selected nothing
+    """
+    registry = registry or CheckerRegistry()
+    selected = list(products) if products else registry.names()
+
+    unknown = [name for name in selected if name not in registry]
+    if unknown:
+        logger.error(f"Unknown product(s): {', '.join(unknown)}")
+        return 2
+
+    jobs = []
+    instances = {}
+    load_failed = False
+    for name in selected:
+        try:
+            checker = registry.create(name)
+            supported = checker.get_supported_platforms()
+        except Exception as e:
+            # A broken definition or plugin only fails its own product
+            logger.error(f"Could not load checker {name}: {e}", exc_info=True)
+            load_failed = True
+            continue
+        target_platforms: Optional[List[str]] = None
+        if platforms:
+            target_platforms = [p for p in platforms if p in supported]
+            if not target_platforms:
+                logger.info(f"Skipping {name}: no matching platforms")
+                continue
+        job = checker.update(target_platforms, touch_last_checked=touch_last_checked)
+        jobs.append((name, job))
+        instances[name] = checker
+
+    if not jobs:
+        if load_failed:
+            return 1
+        logger.error("No checks selected")
+        return 2
+
+    # The HTTP stack is only imported once there is something to check
+    from scripts.checkers.events import ChangeFeed
+    from scripts.checkers.http_cache import ValidatorCache
+    from scripts.checkers.session import HttpSession
+
+    validator_cache = ValidatorCache(http_cache) if http_cache else None
+    async with change_feed or ChangeFeed([]):
+        async with HttpSession(
+            validator_cache=validator_cache,
+            retry_policy=retry_policy,
+            transport=transport,
+        ) as session:
+            results = await asyncio.gather(
+                *(job for _, job in jobs), return_exceptions=True
+            )
+
+    log_transfer_stats(instances)
+    logger.info(f"Stage timings: {session.metrics.report()['stages']}")
+    if metrics_file or report_file:
+        session.metrics.write(metrics_file, report_file)
+
+    success = not load_failed
+    for (name, _), result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Checker {name} raised: {result}")
+            success = False
+        elif not result:
+            logger.error(f"Checker {name} reported failures")
+            success = False
+        else:
+            logger.info(f"Checker {name} completed successfully")
+
+    return 0 if success else 1
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run all version checkers")
+    parser.add_argument(
+        "--product",
+        action="append",
+        dest="products",
+        help="Only run this product (repeatable)",
+    )
+    parser.add_argument(
+        "--platform",
+        action="append",
+        dest="platforms",
+        help="Only check this platform (repeatable)",
+    )
+    parser.add_argument(
+        "--http-cache",
+        type=Path,
+        default=DEFAULT_HTTP_CACHE,
+        help="ETag/Last-Modified cache file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-http-cache",
+        action="store_const",
+        const=None,
+        dest="http_cache",
+        help="Always download full responses",
+    )
+    parser.add_argument(
+        "--touch-last-checked",
+        action="store_true",
+        help="Bump last_checked in every data file even if nothing changed",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Retries per request for timeouts and 5xx/429 (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--retry-budget",
+        type=int,
+        default=None,
+        help="Retries allowed across the whole run (default: unlimited)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        default=DEFAULT_METRICS_DIR / "version_tracker.prom",
+        help="OpenMetrics textfile written after the run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--report-file",
+        type=Path,
+        default=DEFAULT_METRICS_DIR / "run-report.json",
+        help="JSON timing report written after the run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-metrics",
+        action="store_true",
+        help="Write neither the metrics textfile nor the report",
+    )
+    parser.add_argument(
+        "--events-file",
+        type=Path,
+        default=DEFAULT_EVENTS_FILE,
+        help="Append-only NDJSON feed of version changes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-events",
+        action="store_const",
+        const=None,
+        dest="events_file",
+        help="Do not append version changes to the feed",
+    )
+    parser.add_argument(
+        "--webhook",
+        action="append",
+        dest="webhooks",
+        metavar="URL",
+        help="POST version changes to this URL (repeatable)",
+    )
+    parser.add_argument(
+        "--webhook-batch-size",
+        type=int,
+        default=100,
+        help="Most change events per webhook request (default: %(default)s)",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record",
+        type=Path,
+        metavar="DIR",
+        help="Save every upstream response to this cassette directory",
+    )
+    cassette.add_argument(
+        "--replay",
+        type=Path,
+        metavar="DIR",
+        help="Answer requests from this cassette directory, without network",
+    )
+    parser.add_argument(
+        "--replay-latency-ms",
+        type=float,
+        default=0.0,
+        help="Delay added to each replayed response (default: %(default)s)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    from scripts.checkers.events import ChangeFeed
+    from scripts.checkers.resilience import RetryPolicy
+
+    transport = None
+    if args.record or args.replay:
+        from scripts.checkers.cassette import cassette_transport
+
+        mode = "record" if args.record else "replay"
+        try:
+            transport = cassette_transport(
+                mode, args.record or args.replay, args.replay_latency_ms / 1000
+            )
+        except FileNotFoundError as e:
+            logger.error(str(e))
+            return 2
+        # Conditional requests would record 304s, and replayed runs must not
+        # touch the validators used by live runs
+        args.http_cache = None
+
+    return asyncio.run(
+        run_checkers(
+            args.products,
+            args.platforms,
+            args.http_cache,
+            args.touch_last_checked,
+            RetryPolicy(max_retries=args.max_retries, retry_budget=args.retry_budget),
+            transport=transport,
+            metrics_file=None if args.no_metrics else args.metrics_file,
+            report_file=None if args.no_metrics else args.report_file,
+            change_feed=ChangeFeed.create(
+                args.events_file, args.webhooks or (), args.webhook_batch_size
+            ),
+        )
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
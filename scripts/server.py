@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""Read-only HTTP service for the tracked version data.
+
+Serves:
+    GET /products                          identifiers of all products
+    GET /products/{identifier}             full product data
+    GET /products/{identifier}/{platform}  one platform entry
+    GET /events                            Server-Sent Events stream of
+                                           version changes
+
+Every response (body, strong ETag and headers) is serialized once whenever
+the data files change, so requests are answered straight from memory.
+Clients sending a matching ``If-None-Match`` get a 304.
+
+``/events`` follows the change feed that checkers append to
+``data/changes.ndjson``. Each event's id is the feed offset after it, so a
+client reconnecting with ``Last-Event-ID`` receives everything it missed.
+
+Usage:
+    python -m scripts.server [--host 127.0.0.1] [--port 8080]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from scripts.lookup import DEFAULT_DATA_DIR, DEFAULT_EVENTS_FILE, VersionIndex, thaw
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 16 * 1024
+# Largest request body read and discarded to keep a connection open
+MAX_BODY_BYTES = 64 * 1024
+# Events buffered for one SSE client before it is dropped as too slow
+MAX_QUEUED_EVENTS = 1024
+
+
+class PreparedResponse(NamedTuple):
+    """A response serialized ahead of time."""
+
+    etag: bytes
+    full: bytes  # status line, headers and body for a 200
+    head: bytes  # status line and headers only, for HEAD
+    not_modified: bytes  # complete 304 response
+
+
+def _status(code: int, reason: str, body: bytes, extra: str = "") -> bytes:
+    return (
+        f"HTTP/1.1 {code} {reason}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"{extra}\r\n"
+    ).encode() + body
+
+
+def prepare(document: Any) -> PreparedResponse:
+    """Serialize a document into ready-to-send responses."""
+    body = (json.dumps(document, indent=2) + "\n").encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = (
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"ETag: {etag}\r\n"
+        "Cache-Control: no-cache\r\n"
+        "\r\n"
+    ).encode()
+    not_modified = f"HTTP/1.1 304 Not Modified\r\nETag: {etag}\r\n\r\n".encode()
+    return PreparedResponse(etag.encode(), headers + body, headers, not_modified)
+
+
+NOT_FOUND = _status(404, "Not Found", b'{"error": "not found"}\n')
+METHOD_NOT_ALLOWED = _status(
+    405,
+    "Method Not Allowed",
+    b'{"error": "method not allowed"}\n',
+    "Allow: GET, HEAD\r\n",
+)
+BAD_REQUEST = _status(
+    400, "Bad Request", b'{"error": "bad request"}\n', "Connection: close\r\n"
+)
+
+
+EVENT_STREAM_HEADERS = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/event-stream\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"Connection: close\r\n"
+    b"\r\n"
+)
+KEEPALIVE = b": keep-alive\n\n"
+
+
+def format_event(offset: int, line: bytes) -> bytes:
+    """Encode one feed line as a Server-Sent Event."""
+    return b"id: %d\nevent: change\ndata: %s\n\n" % (offset, line)
+
+
+class EventTail:
+    """Follows an append-only NDJSON file by byte offset."""
+
+    def __init__(self, path: Path):
+        """Start following ``path`` from its current end."""
+        self.path = Path(path)
+        self.offset = self._size()
+
+    def _size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def read(self, start: int, end: Optional[int] = None) -> List[Tuple[int, bytes]]:
+        """Complete lines between two offsets.
+
+        Returns:
+            ``(offset after the line, line)`` pairs; a trailing partial line
+            is left for a later read
+        """
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                data = f.read() if end is None else f.read(max(end - start, 0))
+        except FileNotFoundError:
+            return []
+        lines = []
+        offset = start
+        for line in data.split(b"\n")[:-1]:
+            offset += len(line) + 1
+            if line:
+                lines.append((offset, line))
+        return lines
+
+    def poll(self) -> List[Tuple[int, bytes]]:
+        """Lines appended since the last poll."""
+        size = self._size()
+        if size < self.offset:
+            # The feed was replaced; follow the new file from its start
+            self.offset = 0
+        if size == self.offset:
+            return []
+        lines = self.read(self.offset)
+        if lines:
+            self.offset = lines[-1][0]
+        return lines
+
+
+def build_responses(index: VersionIndex) -> Dict[str, PreparedResponse]:
+    """Prepare every servable path from the current index."""
+    responses = {}
+    products = index.list_products()
+    responses["/products"] = prepare({"products": products})
+    for identifier in products:
+        data = thaw(index.get_product(identifier))
+        responses[f"/products/{identifier}"] = prepare(data)
+        for platform, entry in data["versions"]["platforms"].items():
+            responses[f"/products/{identifier}/{platform}"] = prepare(
+                dict(product=identifier, platform=platform, **entry)
+            )
+    return responses
+
+
+class VersionServer:
+    """Asyncio HTTP/1.1 server over precomputed responses."""
+
+    def __init__(
+        self,
+        data_dir: Path = DEFAULT_DATA_DIR,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        reload_interval: float = 5.0,
+        events_file: Optional[Path] = None,
+        events_interval: float = 1.0,
+        keepalive_interval: float = 15.0,
+    ):
+        """Configure the server.
+
+        Args:
+            data_dir: Directory containing ``<product>.json`` files
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            reload_interval: Seconds between checks for changed data files
+            events_file: Change feed streamed on ``/events`` (default:
+                ``changes.ndjson`` in ``data_dir``)
+            events_interval: Seconds between checks for new events
+            keepalive_interval: Seconds of silence after which an event
+                stream gets a comment line, so idle proxies keep it open
+        """
+        self.index = VersionIndex(data_dir)
+        self.host = host
+        self.port = port
+        self.reload_interval = reload_interval
+        self.events_interval = events_interval
+        self.keepalive_interval = keepalive_interval
+        self.responses: Dict[str, PreparedResponse] = {}
+        self.events = EventTail(
+            events_file or Path(data_dir) / DEFAULT_EVENTS_FILE.name
+        )
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._reloader: Optional[asyncio.Task] = None
+        self._tailer: Optional[asyncio.Task] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._subscribers: Dict[asyncio.Task, asyncio.Queue] = {}
+
+    def refresh(self) -> bool:
+        """Rebuild the prepared responses if any data file changed."""
+        if self.index.reload() or not self.responses:
+            self.responses = build_responses(self.index)
+            logger.info(f"Prepared {len(self.responses)} responses")
+            return True
+        return False
+
+    async def _reload_periodically(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to reload data files: {e}")
+
+    def publish_new_events(self) -> int:
+        """Send events appended to the feed to every stream.
+
+        Returns:
+            The number of new events
+        """
+        lines = self.events.poll()
+        if not lines:
+            return 0
+        chunk = b"".join(format_event(offset, line) for offset, line in lines)
+        for task, queue in list(self._subscribers.items()):
+            if queue.qsize() >= MAX_QUEUED_EVENTS:
+                logger.warning("Dropping an event stream client that fell behind")
+                del self._subscribers[task]
+                queue.put_nowait(None)
+            else:
+                queue.put_nowait(chunk)
+        return len(lines)
+
+    async def _tail_periodically(self):
+        while True:
+            await asyncio.sleep(self.events_interval)
+            try:
+                self.publish_new_events()
+            except Exception as e:
+                logger.error(f"Failed to read the change feed: {e}")
+
+    async def _stream_events(self, writer: asyncio.StreamWriter, last_event_id: str):
+        # None in the queue ends the stream
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.current_task()
+        # Subscribing and reading the backlog happen without yielding to the
+        # loop, so no event is missed or sent twice in between
+        self._subscribers[task] = queue
+        try:
+            writer.write(EVENT_STREAM_HEADERS)
+            if last_event_id.isdigit() and int(last_event_id) <= self.events.offset:
+                for offset, line in self.events.read(
+                    int(last_event_id), self.events.offset
+                ):
+                    writer.write(format_event(offset, line))
+            await writer.drain()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(
+                        queue.get(), self.keepalive_interval
+                    )
+                except asyncio.TimeoutError:
+                    chunk = KEEPALIVE
+                if chunk is None:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+        finally:
+            self._subscribers.pop(task, None)
+
+    def _respond(self, method: str, target: str, if_none_match: bytes) -> bytes:
+        if method not in ("GET", "HEAD"):
+            return METHOD_NOT_ALLOWED
+        path = target.split("?", 1)[0].rstrip("/")
+        prepared = self.responses.get(path)
+        if prepared is None:
+            return NOT_FOUND
+        if if_none_match and (
+            if_none_match == b"*"
+            or prepared.etag in (tag.strip() for tag in if_none_match.split(b","))
+        ):
+            return prepared.not_modified
+        return prepared.head if method == "HEAD" else prepared.full
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    raw = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(BAD_REQUEST)
+                    break
+
+                lines = raw.split(b"\r\n")
+                try:
+                    method, target, version = lines[0].decode("latin-1").split(" ")
+                except ValueError:
+                    writer.write(BAD_REQUEST)
+                    break
+
+                if_none_match = b""
+                last_event_id = b""
+                content_length = b"0"
+                chunked = False
+                close = version == "HTTP/1.0"
+                for line in lines[1:]:
+                    name, _, value = line.partition(b":")
+                    name = name.strip().lower()
+                    if name == b"if-none-match":
+                        # Repeated headers are one comma-separated list
+                        value = value.strip()
+                        if_none_match += b"," + value if if_none_match else value
+                    elif name == b"content-length":
+                        content_length = value.strip()
+                    elif name == b"transfer-encoding":
+                        chunked = b"chunked" in value.lower()
+                    elif name == b"last-event-id":
+                        last_event_id = value.strip()
+                    elif name == b"connection":
+                        token = value.strip().lower()
+                        if token == b"close":
+                            close = True
+                        elif token == b"keep-alive":
+                            close = False
+
+                # A body left unread would be parsed as the next request, so
+                # small ones are discarded and anything else ends the connection
+                if not content_length.isdigit():
+                    writer.write(BAD_REQUEST)
+                    break
+                if chunked or int(content_length) > MAX_BODY_BYTES:
+                    close = True
+                elif content_length != b"0":
+                    try:
+                        await reader.readexactly(int(content_length))
+                    except asyncio.IncompleteReadError:
+                        break
+
+                if method == "GET" and target.split("?", 1)[0] == "/events":
+                    await self._stream_events(writer, last_event_id.decode("latin-1"))
+                    break
+
+                writer.write(self._respond(method, target, if_none_match))
+                await writer.drain()
+                if close:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def start(self):
+        """Prepare responses and start listening."""
+        self.refresh()
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._reloader = asyncio.create_task(self._reload_periodically())
+        self._tailer = asyncio.create_task(self._tail_periodically())
+        logger.info(f"Serving version data on http://{self.host}:{self.port}")
+
+    async def close(self):
+        """Stop listening and cancel the background tasks."""
+        for task in (self._reloader, self._tailer):
+            if task is not None:
+                task.cancel()
+        if self._server is not None:
+            self._server.close()
+            handlers = list(self._connections)
+            for writer in self._connections.values():
+                writer.close()
+            # Event streams are waiting for events, not reading
+            for queue in self._subscribers.values():
+                queue.put_nowait(None)
+            # Closing the transports ends each handler's pending read
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve tracked version data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between checks for changed data files",
+    )
+    parser.add_argument(
+        "--events-file",
+        type=Path,
+        help="Change feed streamed on /events (default: DATA_DIR/changes.ndjson)",
+    )
+    parser.add_argument(
+        "--events-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checks for new change events",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    server = VersionServer(
+        args.data_dir,
+        args.host,
+        args.port,
+        args.reload_interval,
+        events_file=args.events_file,
+        events_interval=args.events_interval,
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Parsing and ordering of the version strings stored in ``data/*.json``.
+
+Versions are dotted numbers (``151.0.4129.72``, ``26.6``), optionally
+followed by a Firefox-style pre-release or ESR suffix (``154.0b5``,
+``155.0a1``, ``153.0rc1``, ``140.3.0esr``). Each string is parsed once into
+a small tuple of integers that compares in release order; keys are cached,
+so ordering many versions never parses the same string twice.
+
+Like ``scripts.lookup``, this module only depends on the standard library.
+
+Usage:
+    from scripts import versions
+
+    versions.compare("151.0.4129.72", "151.0.4129.9")   # 1
+    versions.max_version(["153.0.3", "154.0b5", "153.0"])  # "154.0b5"
+    versions.sort_versions(["26.6", "26.10", "26.6.1"])
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# (release numbers without trailing zeros, stage, stage number)
+VersionKey = Tuple[Tuple[int, ...], int, int]
+
+# Stages in release order; ESR builds are final releases
+_STAGES = {"a": 0, "b": 1, "rc": 2, "": 3, "esr": 3}
+
+_VERSION_RE = re.compile(r"v?(\d+(?:\.\d+)*)(?:(a|b|rc)(\d*)|(esr))?")
+
+# Value of new data files' platform entries before their first check
+PLACEHOLDER = "0.0.0"
+
+
+class InvalidVersion(ValueError):
+    """Raised for a string that is not a version this module understands."""
+
+
+@lru_cache(maxsize=16384)
+def version_key(version: str) -> VersionKey:
+    """Parse ``version`` into a key that sorts in release order.
+
+    Trailing zero components are ignored, so ``26.6`` and ``26.6.0`` have
+    the same key. A pre-release sorts before the release it leads to
+    (``154.0a1 < 154.0b5 < 154.0rc1 < 154.0``) and ``140.3.0esr`` equals
+    ``140.3.0``.
+
+    Raises:
+        InvalidVersion: If ``version`` cannot be parsed
+    """
+    if version.replace(".", "").isdigit() and version.isascii():
+        # Plain dotted release, the common case
+        release, stage, number, esr = version, None, None, None
+    else:
+        match = _VERSION_RE.fullmatch(version.strip())
+        if match is None:
+            raise InvalidVersion(f"Invalid version: {version!r}")
+        release, stage, number, esr = match.groups()
+    try:
+        parts = [int(part) for part in release.split(".")]
+    except ValueError:
+        raise InvalidVersion(f"Invalid version: {version!r}") from None
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts), _STAGES[stage or esr or ""], int(number or 0)
+
+
+def is_valid(version: str) -> bool:
+    """Whether ``version`` can be parsed."""
+    try:
+        version_key(version)
+    except InvalidVersion:
+        return False
+    return True
+
+
+def compare(a: str, b: str) -> int:
+    """Return -1, 0 or 1 as ``a`` is older than, equal to or newer than ``b``."""
+    key_a, key_b = version_key(a), version_key(b)
+    return (key_a > key_b) - (key_a < key_b)
+
+
+def is_prerelease(version: str) -> bool:
+    """Whether ``version`` is an alpha, beta or release candidate."""
+    return version_key(version)[1] < _STAGES[""]
+
+
+def sort_versions(versions: Iterable[str], reverse: bool = False) -> List[str]:
+    """Return ``versions`` sorted oldest first (newest first with ``reverse``).
+
+    Each distinct string is parsed at most once; equal versions keep their
+    input order.
+    """
+    return sorted(versions, key=version_key, reverse=reverse)
+
+
+def max_version(versions: Iterable[str]) -> Optional[str]:
+    """Newest of ``versions``, or None if there are none."""
+    return max(versions, key=version_key, default=None)
+
+
+def is_downgrade(old: Optional[str], new: str) -> bool:
+    """Whether replacing ``old`` with ``new`` would move backwards.
+
+    A missing or placeholder ``old`` and versions that cannot be parsed are
+    never considered a downgrade, so they cannot block an update.
+    """
+    if old is None or old == PLACEHOLDER:
+        return False
+    try:
+        return version_key(new) < version_key(old)
+    except InvalidVersion:
+        return False
@@ -1,3 +1,7 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 import httpx
 from typing import Dict, Any, Optional
@@ -7,6 +11,10 @@ class MockResponse:
     def __init__(self, status_code: int, json_data: Optional[Dict[str, Any]] = None):
         self.status_code = status_code
         self._json_data = json_data
+        self.headers = httpx.Headers()
+        self.content = json.dumps(json_data).encode()
+        self.num_bytes_downloaded = len(self.content)
+        self.extensions = {}
 
     def json(self) -> Dict[str, Any]:
         if self._json_data is None:
@@ -30,3 +38,84 @@ def mock_httpx_client(mocker):
     mock_context.__aenter__.return_value = mock_client
     mock_context.__aexit__.return_value = None
     return mock_client, mock_context
+
+
+class StubServer:
+    """Local HTTP/1.1 server with keep-alive that serves canned responses.
+
+    Routes map a path to a callable taking the request count for that path
+    and returning ``(status, headers, body)``.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = {}
+        self.connections = 0
+        self.request_headers = []
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def route(self, path: str, body=None, status: int = 200, headers=None):
+        """Serve a fixed JSON body (or a callable) at ``path``."""
+        if callable(body):
+            self.routes[path] = body
+        else:
+            payload = json.dumps(body).encode()
+            self.routes[path] = lambda count: (status, headers or {}, payload)
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                stub.connections += 1
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                stub.hits[path] = stub.hits.get(path, 0) + 1
+                stub.request_headers.append((self.path, dict(self.headers)))
+                if path not in stub.routes:
+                    status, headers, body = 404, {}, b"{}"
+                else:
+                    status, headers, body = stub.routes[path](stub.hits[path])
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    """Local HTTP stub server, started for the duration of one test."""
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
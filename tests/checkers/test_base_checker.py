@@ -0,0 +1,223 @@
+import asyncio
+import json
+
+import pytest
+from scripts.checkers.base_checker import BaseVersionChecker
+
+PLATFORMS = ["windows", "macos", "linux", "ios", "android"]
+
+
+class FakeChecker(BaseVersionChecker):
+    """Checker whose fetches are driven by the test."""
+
+    def __init__(self, data_dir, delays=None, failures=()):
+        super().__init__("fake")
+        self.data_file = data_dir / "fake.json"
+        self.delays = delays or {}
+        self.failures = set(failures)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def get_initial_data(self):
+        return {
+            "name": "Fake Product",
+            "identifier": "fake",
+            "type": "browser",
+            "platforms": PLATFORMS,
+            "versions": {
+                "platforms": {
+                    platform: {
+                        "version": "0.0.0",
+                        "check_url": f"https://example.com/{platform}",
+                        "check_method": "api",
+                    }
+                    for platform in PLATFORMS
+                }
+            },
+            "metadata": {"last_checked": "2025-01-01T00:00:00Z"},
+        }
+
+    async def fetch_latest_version(self, platform):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(platform, 0.05))
+            if platform in self.failures:
+                raise RuntimeError(f"{platform} upstream down")
+            return {
+                "version": f"1.0.{PLATFORMS.index(platform)}",
+                "check_url": f"https://example.com/{platform}",
+                "check_method": "api",
+            }
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_update_fetches_platforms_concurrently(tmp_path):
+    checker = FakeChecker(tmp_path)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    assert await checker.update() is True
+    elapsed = loop.time() - start
+
+    assert checker.peak_in_flight == len(PLATFORMS)
+    assert elapsed < 0.2
+
+
+@pytest.mark.asyncio
+async def test_update_respects_concurrency_bound(tmp_path):
+    checker = FakeChecker(tmp_path)
+
+    assert await checker.update(max_concurrency=2) is True
+    assert checker.peak_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_update_isolates_failures_and_keeps_order(tmp_path):
+    # Finish in reverse order to make sure merge order doesn't depend on timing
+    delays = {p: 0.01 * (len(PLATFORMS) - i) for i, p in enumerate(PLATFORMS)}
+    checker = FakeChecker(tmp_path, delays=delays, failures={"linux"})
+
+    assert await checker.update() is False
+
+    data = json.loads(checker.data_file.read_text())
+    platforms = data["versions"]["platforms"]
+    assert list(platforms) == PLATFORMS
+    assert platforms["linux"]["version"] == "0.0.0"
+    assert platforms["android"]["version"] == "1.0.4"
+    assert platforms["windows"]["version"] == "1.0.0"
+
+
+class BatchChecker(FakeChecker):
+    """Checker that answers every platform from one batch call."""
+
+    def __init__(self, data_dir, batch_error=None):
+        super().__init__(data_dir)
+        self.batch_error = batch_error
+        self.batch_calls = []
+
+    async def fetch_latest_version(self, platform):
+        raise AssertionError("update() should use the batch path")
+
+    async def fetch_latest_versions(self, platforms, max_concurrency=None):
+        self.batch_calls.append(list(platforms))
+        if self.batch_error:
+            raise self.batch_error
+        # "linux" is left out and must count as a failure
+        return {
+            platform: {
+                "version": "2.0",
+                "check_url": f"https://example.com/{platform}",
+                "check_method": "api",
+            }
+            for platform in platforms
+            if platform != "linux"
+        }
+
+
+@pytest.mark.asyncio
+async def test_update_prefers_batch_fetch(tmp_path):
+    checker = BatchChecker(tmp_path)
+
+    assert await checker.update() is False
+    assert checker.batch_calls == [PLATFORMS]
+
+    platforms = json.loads(checker.data_file.read_text())["versions"]["platforms"]
+    assert platforms["windows"]["version"] == "2.0"
+    assert platforms["linux"]["version"] == "0.0.0"
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_fails_every_platform(tmp_path):
+    checker = BatchChecker(tmp_path, batch_error=RuntimeError("upstream down"))
+
+    assert await checker.update(["windows", "macos"]) is False
+    platforms = json.loads(checker.data_file.read_text())["versions"]["platforms"]
+    assert platforms["windows"]["version"] == "0.0.0"
+
+
+@pytest.mark.asyncio
+async def test_update_ignores_downgrades(tmp_path):
+    checker = FakeChecker(tmp_path, delays={platform: 0 for platform in PLATFORMS})
+    assert await checker.update(["windows", "macos"])
+
+    stale = {"windows": "0.9", "macos": "1.0.1b2", "linux": "1.0.0"}
+
+    async def fetch_stale(platform):
+        return {
+            "version": stale[platform],
+            "check_url": f"https://example.com/{platform}",
+            "check_method": "api",
+        }
+
+    checker.fetch_latest_version = fetch_stale
+    assert await checker.update(["windows", "macos", "linux"])
+    versions = json.loads(checker.data_file.read_text())["versions"]["platforms"]
+    assert versions["windows"]["version"] == "1.0.0"
+    assert versions["macos"]["version"] == "1.0.1"
+    assert versions["linux"]["version"] == "1.0.0"
+    assert checker.rejected_downgrades == [
+        ("windows", "1.0.0", "0.9"),
+        ("macos", "1.0.1", "1.0.1b2"),
+    ]
+
+    checker.allow_downgrades = True
+    assert await checker.update(["windows"])
+    versions = json.loads(checker.data_file.read_text())["versions"]["platforms"]
+    assert versions["windows"]["version"] == "0.9"
+    assert checker.rejected_downgrades == []
+
+
+@pytest.mark.asyncio
+async def test_update_stores_channels(tmp_path):
+    checker = FakeChecker(tmp_path, delays={platform: 0 for platform in PLATFORMS})
+    fetched = {"beta": {"version": "2.0b1"}, "dev": {"version": "2.1a1"}}
+
+    async def fetch_with_channels(platform):
+        return {
+            "version": "1.0",
+            "check_url": f"https://example.com/{platform}",
+            "check_method": "api",
+            "channels": dict(fetched),
+        }
+
+    checker.fetch_latest_version = fetch_with_channels
+    assert await checker.update(["windows"])
+
+    # A channel missing from a fetch keeps its version; downgrades are ignored
+    fetched = {"beta": {"version": "2.0a9"}}
+    assert await checker.update(["windows"])
+    entry = json.loads(checker.data_file.read_text())["versions"]["platforms"]
+    assert entry["windows"]["channels"] == {
+        "beta": {"version": "2.0b1"},
+        "dev": {"version": "2.1a1"},
+    }
+    assert checker.rejected_downgrades == [("windows/beta", "2.0b1", "2.0a9")]
+
+
+@pytest.mark.asyncio
+async def test_stable_downgrade_still_updates_channels(tmp_path):
+    checker = FakeChecker(tmp_path, delays={platform: 0 for platform in PLATFORMS})
+    assert await checker.update(["windows"])
+
+    async def fetch_stale_stable(platform):
+        return {
+            "version": "0.9",
+            "check_url": "https://mirror.example.com/windows",
+            "check_method": "api",
+            "channels": {"beta": {"version": "2.0b1"}},
+        }
+
+    checker.fetch_latest_version = fetch_stale_stable
+    assert await checker.update(["windows"])
+
+    entry = json.loads(checker.data_file.read_text())["versions"]["platforms"]
+    assert entry["windows"] == {
+        "version": "1.0.0",
+        "check_url": "https://example.com/windows",
+        "check_method": "api",
+        "channels": {"beta": {"version": "2.0b1"}},
+    }
+    assert checker.rejected_downgrades == [("windows", "1.0.0", "0.9")]
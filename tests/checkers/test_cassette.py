@@ -0,0 +1,87 @@
+import gzip
+import json
+
+import httpx
+import pytest
+from scripts.checkers.cassette import (
+    Cassette,
+    CassetteMissError,
+    cassette_transport,
+    interaction_key,
+)
+from scripts.checkers.edge import EdgeVersionChecker
+from scripts.checkers.session import HttpSession
+from .test_edge import MOCK_EDGE_RESPONSE
+
+PLATFORMS = ["windows", "macos"]
+
+
+def edge_checker(url, tmp_path):
+    checker = EdgeVersionChecker()
+    checker.api_url = url
+    checker.data_file = tmp_path / "data" / "edge.json"
+    return checker
+
+
+def test_interaction_key_sorts_query():
+    assert interaction_key("get", "https://x.test/a?b=2&a=1#top") == (
+        "GET https://x.test/a?a=1&b=2"
+    )
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_update_offline(stub_server, tmp_path):
+    body = gzip.compress(json.dumps(MOCK_EDGE_RESPONSE).encode())
+    stub_server.route(
+        "/api/products", lambda count: (200, {"Content-Encoding": "gzip"}, body)
+    )
+    cassette_dir = tmp_path / "cassette"
+
+    recorder = cassette_transport("record", cassette_dir)
+    checker = edge_checker(stub_server.url("/api/products"), tmp_path)
+    async with HttpSession(http2=False, transport=recorder):
+        assert await checker.update(PLATFORMS)
+
+    # Bodies are stored as received, still compressed
+    assert list((cassette_dir / "bodies").iterdir())[0].read_bytes() == body
+    recorded = json.loads((tmp_path / "data" / "edge.json").read_text())
+    (tmp_path / "data" / "edge.json").unlink()
+    stub_server.stop()
+
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    replayer = cassette_transport("replay", cassette_dir, latency=0.05)
+    replayer._sleep = sleep
+    checker = edge_checker(stub_server.url("/api/products"), tmp_path)
+    async with HttpSession(http2=False, transport=replayer) as session:
+        assert await checker.update(PLATFORMS)
+
+    replayed = json.loads((tmp_path / "data" / "edge.json").read_text())
+    assert replayed["platforms"] == recorded["platforms"]
+    assert session.stats.connections_opened == 0
+    assert replayer.hits == 1
+    assert sleeps == [0.05]
+    # The stub server is stopped, so every byte came from the cassette
+    assert checker.bytes_downloaded == len(body)
+
+
+@pytest.mark.asyncio
+async def test_replay_miss_is_an_http_error(tmp_path):
+    cassette = Cassette(tmp_path)
+    cassette.put("GET https://x.test/known", 200, [], b"{}")
+    cassette.save()
+
+    transport = cassette_transport("replay", tmp_path)
+    async with httpx.AsyncClient(transport=transport) as client:
+        assert (await client.get("https://x.test/known")).json() == {}
+        with pytest.raises(CassetteMissError):
+            await client.get("https://x.test/unknown")
+    assert transport.misses == 1
+
+
+def test_replay_requires_a_cassette(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        cassette_transport("replay", tmp_path / "missing")
@@ -1,5 +1,6 @@
 import pytest
 from scripts.checkers.chrome import ChromeVersionChecker
+from scripts.checkers.session import HttpSession
 from .conftest import MockResponse
 
 MOCK_CHROME_RESPONSE = {
@@ -46,3 +47,50 @@ def test_chrome_supported_platforms():
     assert "macos" in platforms
     assert "ios" in platforms
     assert "android" in platforms
+
+
+@pytest.mark.asyncio
+async def test_chrome_requests_only_newest_version(stub_server):
+    for channel in ["stable", "beta", "dev", "canary"]:
+        stub_server.route(f"/win/channels/{channel}/versions", MOCK_CHROME_RESPONSE)
+    checker = ChromeVersionChecker()
+    checker.base_url = stub_server.base_url
+
+    result = await checker.fetch_latest_version("windows")
+    assert result["check_url"] == stub_server.url("/win/channels/stable/versions")
+
+    assert len(stub_server.request_headers) == 4
+    for path, _ in stub_server.request_headers:
+        assert "pageSize=1" in path
+        assert "order_by=version+desc" in path
+    assert checker.transfer_stats()["requests"] == 4
+
+
+@pytest.mark.asyncio
+async def test_chrome_fetches_channels_concurrently(stub_server):
+    stub_server.route("/win/channels/stable/versions", MOCK_CHROME_RESPONSE)
+    stub_server.route(
+        "/win/channels/beta/versions", {"versions": [{"version": "121.0.6167.16"}]}
+    )
+    stub_server.route(
+        "/win/channels/dev/versions", {"versions": [{"version": "122.0.6182.0"}]}
+    )
+    checker = ChromeVersionChecker()
+    checker.base_url = stub_server.base_url
+
+    async with HttpSession(http2=False):
+        result = await checker.fetch_latest_version("windows")
+
+    assert result["version"] == "120.0.6099.129"
+    # Canary is not served: it is left out without failing the platform
+    assert result["channels"] == {
+        "beta": {
+            "version": "121.0.6167.16",
+            "check_url": stub_server.url("/win/channels/beta/versions"),
+        },
+        "dev": {
+            "version": "122.0.6182.0",
+            "check_url": stub_server.url("/win/channels/dev/versions"),
+        },
+    }
+    assert checker.transfer_stats()["requests"] == 4
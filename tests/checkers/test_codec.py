@@ -0,0 +1,52 @@
+import json
+from pathlib import Path
+
+import pytest
+from scripts.checkers.codec import available_codecs, get_codec
+
+ROOT = Path(__file__).parent.parent.parent
+DATA_FILES = sorted((ROOT / "data").glob("*.json"))
+
+
+@pytest.fixture(params=available_codecs())
+def codec(request):
+    return get_codec(request.param)
+
+
+def test_stdlib_is_always_available():
+    assert "stdlib" in available_codecs()
+    assert get_codec().name == available_codecs()[0]
+    with pytest.raises(KeyError):
+        get_codec("yaml")
+
+
+@pytest.mark.parametrize("path", DATA_FILES, ids=lambda path: path.name)
+def test_data_files_round_trip_byte_for_byte(codec, path):
+    raw = path.read_bytes()
+    assert codec.dumps_pretty(codec.loads(raw)).encode() == raw
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {},
+        [],
+        {"empty": [], "nested": {"list": [1, True, None, {}]}},
+        {"escapes": 'quote " backslash \\ newline \n control \x01'},
+        {"non_ascii": "Microsoft Edge für Windows – 日本"},
+        {"float": 1.5, "exponent": 1e16, "small": 1e-7},
+        {"big": 2**70},
+        {1: "integer key"},
+    ],
+)
+def test_pretty_output_matches_stdlib(codec, document):
+    assert codec.dumps_pretty(document) == json.dumps(document, indent=2) + "\n"
+
+
+def test_decoding_matches_stdlib(codec):
+    raw = (ROOT / "tests" / "fixtures" / "safari-release-notes.json").read_bytes()
+    assert codec.loads(raw) == json.loads(raw)
+    assert codec.loads('{"a": ["b", 1]}') == {"a": ["b", 1]}
+    assert codec.loads(b'{"value": NaN}')["value"] != 0
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b'{"truncated": ')
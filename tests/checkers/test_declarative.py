@@ -0,0 +1,181 @@
+import ast
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from jsonschema import ValidationError
+from scripts.checkers import registry as registry_module
+from scripts.checkers.declarative import JsonApiChecker, load_definition
+from scripts.checkers.registry import CheckerRegistry
+from .conftest import MockResponse
+from .test_chrome import MOCK_CHROME_RESPONSE
+from .test_edge import MOCK_EDGE_RESPONSE
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+# Example definitions; definitions/ only holds products tracked in production
+DEFINITIONS = REPO_ROOT / "tests" / "fixtures" / "definitions"
+
+EDGE_DEFINITION = {
+    "identifier": "edge",
+    "name": "Microsoft Edge",
+    "type": "browser",
+    "url": "https://edgeupdates.microsoft.com/api/products",
+    "path": [
+        {"match": {"Product": "Stable"}},
+        "Releases",
+        {"match": {"Platform": "{platform}"}, "ignore_case": True},
+        "ProductVersion",
+    ],
+    "platforms": {"windows": {}, "macos": {}, "linux": {}},
+}
+
+
+@pytest.mark.asyncio
+async def test_filters_and_single_fetch(mock_httpx_client, mocker):
+    mock_client, mock_context = mock_httpx_client
+    checker = JsonApiChecker(EDGE_DEFINITION)
+    mocker.patch.object(checker, "get_client", return_value=mock_context)
+    mock_client.get.return_value = MockResponse(200, MOCK_EDGE_RESPONSE)
+
+    results = await checker.fetch_latest_versions(["windows", "macos", "linux"])
+
+    assert mock_client.get.call_count == 1
+    assert results["windows"] == {
+        "version": "120.0.2210.121",
+        "check_url": EDGE_DEFINITION["url"],
+        "check_method": "api",
+    }
+    assert results["macos"]["version"] == "120.0.2210.121"
+    # No Linux release in the payload
+    assert results["linux"] is None
+
+
+@pytest.mark.asyncio
+async def test_url_templates_and_params(stub_server):
+    for code in ["win", "mac"]:
+        stub_server.route(f"/{code}/channels/stable/versions", MOCK_CHROME_RESPONSE)
+    checker = JsonApiChecker(
+        {
+            "identifier": "chrome",
+            "name": "Google Chrome",
+            "type": "browser",
+            "url": stub_server.base_url + "/{code}/channels/stable/versions",
+            "params": {"pageSize": "1", "order_by": "version desc"},
+            "path": ["versions", 0, "version"],
+            "platforms": {
+                "windows": {"vars": {"code": "win"}},
+                "macos": {"vars": {"code": "mac"}},
+            },
+        }
+    )
+
+    results = await checker.fetch_latest_versions(["windows", "macos"])
+
+    assert results["macos"]["version"] == "120.0.6099.129"
+    assert results["macos"]["check_url"] == stub_server.url(
+        "/mac/channels/stable/versions"
+    )
+    assert all("pageSize=1" in path for path, _ in stub_server.request_headers)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_concurrency, expected_peak", [(None, 4), (2, 2)])
+async def test_request_groups_are_fetched_concurrently(
+    mocker, max_concurrency, expected_peak
+):
+    codes = ["win", "mac", "lin", "and"]
+    checker = JsonApiChecker(
+        {
+            "identifier": "chrome",
+            "name": "Google Chrome",
+            "type": "browser",
+            "url": "https://example.com/{code}",
+            "path": ["versions", 0, "version"],
+            "platforms": {code: {"vars": {"code": code}} for code in codes},
+        }
+    )
+    in_flight, peak = 0, 0
+
+    async def fetch_json(url, params=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return MOCK_CHROME_RESPONSE
+
+    mocker.patch.object(checker, "fetch_json", side_effect=fetch_json)
+
+    results = await checker.fetch_latest_versions(codes, max_concurrency)
+
+    assert peak == expected_peak
+    assert all(results[code]["version"] == "120.0.6099.129" for code in codes)
+
+
+@pytest.mark.asyncio
+async def test_example_definition_strips_prefix(mock_httpx_client, mocker):
+    mock_client, mock_context = mock_httpx_client
+    checker = CheckerRegistry(definitions_dir=DEFINITIONS).create("nodejs")
+    mocker.patch.object(checker, "get_client", return_value=mock_context)
+    mock_client.get.return_value = MockResponse(
+        200, [{"version": "v23.1.0"}, {"version": "v23.0.0"}]
+    )
+
+    result = await checker.fetch_latest_version("linux")
+    assert result["version"] == "23.1.0"
+    assert checker.get_initial_data()["type"] == "runtime"
+
+
+def test_invalid_definition_is_rejected(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text(json.dumps({"identifier": "broken", "name": "Broken"}))
+    with pytest.raises(ValidationError):
+        load_definition(path)
+
+
+def test_entry_point_plugins(mocker, tmp_path):
+    class FakeEntryPoint:
+        name = "plugin"
+        value = "plugin_package:DEFINITION"
+
+        def load(self):
+            return dict(EDGE_DEFINITION, identifier="plugin")
+
+    mocker.patch.object(
+        registry_module, "_entry_points", return_value=[FakeEntryPoint()]
+    )
+    registry = CheckerRegistry(definitions_dir=tmp_path)
+
+    assert "plugin" in registry.names()
+    checker = registry.create("plugin")
+    assert checker.product_name == "plugin"
+
+
+def test_selecting_products_imports_only_those():
+    code = (
+        "import sys\n"
+        "from scripts.checkers.registry import CheckerRegistry\n"
+        "from pathlib import Path\n"
+        f"registry = CheckerRegistry(definitions_dir=Path({str(DEFINITIONS)!r}))\n"
+        "names = registry.names()\n"
+        "registry.create('nodejs')\n"
+        "print(sorted(m for m in sys.modules if m.startswith('scripts.checkers.')))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    loaded = ast.literal_eval(output)
+    assert "scripts.checkers.declarative" in loaded
+    assert not {
+        "scripts.checkers.chrome",
+        "scripts.checkers.edge",
+        "scripts.checkers.firefox",
+        "scripts.checkers.safari",
+    } & set(loaded)
@@ -73,3 +73,33 @@ def test_edge_supported_platforms():
     assert "linux" in platforms
     assert "ios" in platforms
     assert "android" in platforms
+
+
+@pytest.mark.asyncio
+async def test_edge_batch_fetches_once(mock_httpx_client, mocker):
+    mock_client, mock_context = mock_httpx_client
+    checker = EdgeVersionChecker()
+    mocker.patch.object(checker, "get_client", return_value=mock_context)
+    mock_client.get.return_value = MockResponse(200, MOCK_EDGE_RESPONSE)
+
+    results = await checker.fetch_latest_versions(["windows", "macos", "linux"])
+
+    assert mock_client.get.call_count == 1
+    assert results["windows"]["version"] == "120.0.2210.121"
+    assert results["macos"]["version"] == "120.0.2210.121"
+    assert results["linux"] is None
+
+
+@pytest.mark.asyncio
+async def test_edge_extracts_channels_from_the_same_payload(mock_httpx_client, mocker):
+    mock_client, mock_context = mock_httpx_client
+    checker = EdgeVersionChecker()
+    mocker.patch.object(checker, "get_client", return_value=mock_context)
+    mock_client.get.return_value = MockResponse(200, MOCK_EDGE_RESPONSE)
+
+    results = await checker.fetch_latest_versions(["windows", "macos"])
+
+    assert mock_client.get.call_count == 1
+    assert results["windows"]["version"] == "120.0.2210.121"
+    assert results["windows"]["channels"] == {"beta": {"version": "121.0.0.0"}}
+    assert results["macos"]["channels"] == {}
@@ -0,0 +1,115 @@
+import json
+
+import httpx
+import pytest
+from scripts.checkers.declarative import JsonApiChecker
+from scripts.checkers.events import ChangeEvent, ChangeFeed, NdjsonSink, WebhookSink
+from scripts.checkers.resilience import RetryPolicy
+from scripts.checkers.session import HttpSession
+
+
+def widget_checker(tmp_path):
+    checker = JsonApiChecker(
+        {
+            "identifier": "widget",
+            "name": "Widget",
+            "type": "runtime",
+            "url": "https://api.test/{platform}.json",
+            "path": ["version"],
+            "platforms": {"linux": {}, "macos": {}},
+        }
+    )
+    checker.data_file = tmp_path / "widget.json"
+    return checker
+
+
+def event(n):
+    return ChangeEvent("widget", "linux", f"1.{n}", f"1.{n + 1}", "u", "t")
+
+
+@pytest.mark.asyncio
+async def test_update_appends_changes_to_ndjson(tmp_path):
+    versions = {"/linux.json": "1.0", "/macos.json": "1.0"}
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            200, json={"version": versions[request.url.path]}
+        )
+    )
+    feed_file = tmp_path / "changes.ndjson"
+    checker = widget_checker(tmp_path)
+
+    for _ in range(2):
+        async with ChangeFeed([NdjsonSink(feed_file)]) as feed:
+            async with HttpSession(transport=transport):
+                assert await checker.update()
+        versions["/linux.json"] = "1.1"
+
+    # Replacing the placeholders on the first run is not a change
+    events = [json.loads(line) for line in feed_file.read_text().splitlines()]
+    assert len(events) == 1
+    assert feed.published == 1
+    change = events[0]
+    assert (change["product"], change["platform"]) == ("widget", "linux")
+    assert (change["old"], change["new"]) == ("1.0", "1.1")
+    assert change["check_url"] == "https://api.test/linux.json"
+    assert change["detected_at"] == checker.read_current_data()["metadata"][
+        "last_checked"
+    ]
+    assert change["id"] == ChangeEvent(*list(change.values())[1:]).id
+
+
+@pytest.mark.asyncio
+async def test_webhook_batches_and_retries():
+    received = []
+    attempts = []
+
+    def respond(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(503, headers={"Retry-After": "2"})
+        received.append(json.loads(request.content)["events"])
+        return httpx.Response(204)
+
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    sink = WebhookSink(
+        ["https://hooks.test/a"],
+        batch_size=2,
+        flush_interval=3600,
+        policy=RetryPolicy(max_retries=2),
+        transport=httpx.MockTransport(respond),
+        sleep=sleep,
+    )
+    await sink.emit([event(0), event(1), event(2)])
+    # The full batch went out at once; the third event waits for a flush
+    await sink.aclose()
+
+    assert [len(batch) for batch in received] == [2, 1]
+    assert sleeps == [2.0]
+    assert sink.stats.as_dict() == {
+        "batches": 2,
+        "delivered": 3,
+        "retries": 1,
+        "dropped": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_webhook_gives_up_after_retries():
+    sink = WebhookSink(
+        ["https://hooks.test/a"],
+        policy=RetryPolicy(max_retries=1),
+        transport=httpx.MockTransport(lambda request: httpx.Response(500)),
+        sleep=lambda delay: _noop(),
+    )
+    await sink.emit([event(0)])
+    await sink.aclose()
+    assert sink.stats.dropped == 1
+    assert sink.stats.retries == 1
+
+
+async def _noop():
+    return None
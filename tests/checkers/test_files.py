@@ -0,0 +1,32 @@
+import os
+import stat
+
+import pytest
+from scripts.checkers.files import atomic_write_text
+
+
+def mode(path):
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_rewrite_keeps_permissions(tmp_path):
+    path = tmp_path / "product.json"
+    path.write_text("old\n")
+    path.chmod(0o644)
+
+    atomic_write_text(path, "new\n")
+
+    assert path.read_text() == "new\n"
+    assert mode(path) == 0o644
+    assert [p.name for p in tmp_path.iterdir()] == ["product.json"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_new_file_follows_umask(tmp_path):
+    previous = os.umask(0o022)
+    try:
+        atomic_write_text(tmp_path / "new.json", "{}\n")
+    finally:
+        os.umask(previous)
+    assert mode(tmp_path / "new.json") == 0o644
@@ -57,3 +57,68 @@ def test_firefox_supported_platforms():
     assert "macos" in platforms
     assert "ios" in platforms
     assert "android" in platforms
+
+
+@pytest.mark.asyncio
+async def test_firefox_batch_fetches_each_file_once(mock_httpx_client, mocker):
+    mock_client, mock_context = mock_httpx_client
+    checker = FirefoxVersionChecker()
+    mocker.patch.object(checker, "get_client", return_value=mock_context)
+    responses = {
+        checker.desktop_url: MOCK_FIREFOX_DESKTOP_RESPONSE,
+        checker.mobile_url: {"version": "121.0", "ios_version": "121.1"},
+    }
+    mock_client.get.side_effect = lambda url, **kwargs: MockResponse(
+        200, responses[url]
+    )
+
+    results = await checker.fetch_latest_versions(checker.get_supported_platforms())
+
+    assert mock_client.get.call_count == 2
+    assert results["windows"]["check_url"] == checker.desktop_url
+    assert results["ios"]["version"] == "121.1"
+    assert results["android"]["version"] == "121.0"
+
+
+@pytest.mark.asyncio
+async def test_firefox_extracts_channels_from_the_same_payload(
+    mock_httpx_client, mocker
+):
+    mock_client, mock_context = mock_httpx_client
+    checker = FirefoxVersionChecker()
+    mocker.patch.object(checker, "get_client", return_value=mock_context)
+    responses = {
+        checker.desktop_url: {
+            "LATEST_FIREFOX_VERSION": "121.0",
+            "LATEST_FIREFOX_DEVEL_VERSION": "122.0b3",
+            "FIREFOX_DEVEDITION": "122.0b3",
+            "FIREFOX_NIGHTLY": "123.0a1",
+            "FIREFOX_ESR": "115.6.0esr",
+            "FIREFOX_AURORA": "",
+        },
+        checker.mobile_url: {
+            "version": "121.0",
+            "beta_version": "122.0b2",
+            "nightly_version": "123.0a1",
+            "ios_version": "121.1",
+        },
+    }
+    mock_client.get.side_effect = lambda url, **kwargs: MockResponse(
+        200, responses[url]
+    )
+
+    results = await checker.fetch_latest_versions(checker.get_supported_platforms())
+
+    assert mock_client.get.call_count == 2
+    assert results["windows"]["channels"] == {
+        "beta": {"version": "122.0b3"},
+        "dev": {"version": "122.0b3"},
+        "nightly": {"version": "123.0a1"},
+        "esr": {"version": "115.6.0esr"},
+    }
+    assert results["android"]["channels"] == {
+        "beta": {"version": "122.0b2"},
+        "nightly": {"version": "123.0a1"},
+    }
+    assert results["ios"]["version"] == "121.1"
+    assert results["ios"]["channels"] == {}
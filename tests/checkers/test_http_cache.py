@@ -0,0 +1,124 @@
+import json
+
+import pytest
+from scripts.checkers.edge import EdgeVersionChecker
+from scripts.checkers.http_cache import ValidatorCache
+from scripts.checkers.session import HttpSession
+from .test_edge import MOCK_EDGE_RESPONSE
+
+ETAG = '"abc123"'
+
+
+def make_checker(stub_server, tmp_path):
+    checker = EdgeVersionChecker()
+    checker.api_url = stub_server.url("/api/products")
+    checker.data_file = tmp_path / "edge.json"
+    return checker
+
+
+def etag_route(stub_server, body):
+    payload = json.dumps(body).encode()
+
+    def respond(count):
+        _, headers = stub_server.request_headers[-1]
+        if headers.get("If-None-Match") == ETAG:
+            return 304, {"ETag": ETAG}, b""
+        return 200, {"ETag": ETAG}, payload
+
+    stub_server.route("/api/products", respond)
+
+
+async def run_update(checker, cache_file):
+    cache = ValidatorCache(cache_file)
+    async with HttpSession(http2=False, validator_cache=cache):
+        result = await checker.update(["windows", "macos"])
+    return result, cache
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidation_skips_parsing(stub_server, tmp_path, mocker):
+    etag_route(stub_server, MOCK_EDGE_RESPONSE)
+    checker = make_checker(stub_server, tmp_path)
+    cache_file = tmp_path / "cache" / "http.json"
+
+    # First run: placeholder versions, so a full unconditional fetch
+    result, cache = await run_update(checker, cache_file)
+    assert result is True
+    assert cache.misses == 1
+    assert "If-None-Match" not in stub_server.request_headers[-1][1]
+    assert json.loads(cache_file.read_text())["entries"][checker.api_url]["etag"] == ETAG
+
+    # Second run: conditional request answered with 304
+    extract = mocker.spy(checker, "_extract_versions_from_json")
+    result, cache = await run_update(checker, cache_file)
+    assert result is True
+    assert cache.hits == 1
+    assert cache.hit_rate == 1.0
+    assert stub_server.request_headers[-1][1]["If-None-Match"] == ETAG
+    assert extract.call_count == 0
+
+    data = json.loads(checker.data_file.read_text())
+    assert data["versions"]["platforms"]["windows"]["version"] == "120.0.2210.121"
+
+
+@pytest.mark.asyncio
+async def test_identical_body_without_validators_is_a_hit(stub_server, tmp_path):
+    stub_server.route("/api/products", MOCK_EDGE_RESPONSE)
+    checker = make_checker(stub_server, tmp_path)
+    cache_file = tmp_path / "http.json"
+
+    await run_update(checker, cache_file)
+    result, cache = await run_update(checker, cache_file)
+
+    assert result is True
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_failed_update_invalidates_validators(stub_server, tmp_path):
+    etag_route(stub_server, MOCK_EDGE_RESPONSE)
+    checker = make_checker(stub_server, tmp_path)
+    cache_file = tmp_path / "http.json"
+    await run_update(checker, cache_file)
+
+    # Upstream drops macOS: the update fails and the entry must be forgotten
+    broken = [
+        dict(MOCK_EDGE_RESPONSE[0], Releases=MOCK_EDGE_RESPONSE[0]["Releases"][:1])
+    ]
+    stub_server.route("/api/products", broken, headers={"ETag": '"v2"'})
+
+    result, cache = await run_update(checker, cache_file)
+    assert result is False
+    assert cache.misses == 1
+    assert checker.api_url not in json.loads(cache_file.read_text())["entries"]
+
+
+def test_unreadable_cache_starts_empty(tmp_path):
+    cache_file = tmp_path / "http.json"
+    cache_file.write_text("{not json")
+    cache = ValidatorCache(cache_file)
+    assert cache.entries == {}
+    assert cache.request_headers("https://example.com") == {}
+
+
+@pytest.mark.asyncio
+async def test_cache_from_before_channels_is_discarded(stub_server, tmp_path):
+    etag_route(stub_server, MOCK_EDGE_RESPONSE)
+    checker = make_checker(stub_server, tmp_path)
+    cache_file = tmp_path / "http.json"
+    await run_update(checker, cache_file)
+
+    # State left by a run before channels were tracked: stable versions only,
+    # validators recorded in the previous cache format
+    data = json.loads(checker.data_file.read_text())
+    for entry in data["versions"]["platforms"].values():
+        entry.pop("channels", None)
+    checker.data_file.write_text(json.dumps(data, indent=2) + "\n")
+    cache = json.loads(cache_file.read_text())
+    cache_file.write_text(json.dumps(dict(cache, version=1)))
+
+    result, cache = await run_update(checker, cache_file)
+    assert result is True
+    assert "If-None-Match" not in stub_server.request_headers[-1][1]
+    platforms = json.loads(checker.data_file.read_text())["versions"]["platforms"]
+    assert platforms["windows"]["channels"] == {"beta": {"version": "121.0.0.0"}}
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+from scripts.checkers.edge import EdgeVersionChecker
+from scripts.checkers.metrics import Histogram, RunMetrics
+from scripts.checkers.session import HttpSession
+from .test_edge import MOCK_EDGE_RESPONSE
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram([0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.sum == pytest.approx(3.65)
+
+
+def test_openmetrics_export():
+    metrics = RunMetrics(buckets=[0.5])
+    metrics.observe("extract", 0.25, "chrome", platform="windows")
+    metrics.record_request(
+        "chrome", "https://x.test/v?a=1", 200, 120, {"ttfb": 0.75, "download": 0.01}
+    )
+    metrics.record_request("chrome", "https://x.test/v", 503, 4, {"ttfb": 0.1})
+
+    text = metrics.openmetrics()
+    lines = text.splitlines()
+    assert 'version_tracker_stage_seconds_bucket{stage="extract",product="chrome",le="0.5"} 1' in lines
+    assert 'version_tracker_stage_seconds_bucket{stage="ttfb",product="chrome",le="+Inf"} 2' in lines
+    assert 'version_tracker_stage_seconds_count{stage="ttfb",product="chrome"} 2' in lines
+    assert 'version_tracker_http_requests_total{product="chrome",host="x.test",status="503"} 1' in lines
+    assert 'version_tracker_http_received_bytes_total{product="chrome",host="x.test"} 124' in lines
+    assert lines[-1] == "# EOF"
+
+
+@pytest.mark.asyncio
+async def test_update_records_every_stage(stub_server, tmp_path):
+    stub_server.route("/api/products", MOCK_EDGE_RESPONSE)
+    checker = EdgeVersionChecker()
+    checker.api_url = stub_server.url("/api/products")
+    checker.data_file = tmp_path / "edge.json"
+
+    async with HttpSession(http2=False) as session:
+        assert await checker.update(["windows", "macos"])
+
+    report = session.metrics.report()
+    assert list(report["stages"]) == [
+        "connect",
+        "ttfb",
+        "download",
+        "decode",
+        "extract",
+        "validate",
+        "write",
+    ]
+    edge = report["products"]["edge"]
+    assert edge["requests"] == 1
+    assert edge["statuses"] == {"200": 1}
+    assert edge["bytes"] == len(json.dumps(MOCK_EDGE_RESPONSE))
+    url = report["urls"][checker.api_url]
+    assert set(url["stages"]) == {"connect", "ttfb", "download", "decode", "extract"}
+    assert report["requests"][0]["status"] == 200
+
+    session.metrics.write(tmp_path / "run.prom", tmp_path / "run.json")
+    assert (tmp_path / "run.prom").read_text().endswith("# EOF\n")
+    assert json.loads((tmp_path / "run.json").read_text())["products"]["edge"]
@@ -0,0 +1,214 @@
+import httpx
+import pytest
+from scripts.checkers.chrome import ChromeVersionChecker
+from scripts.checkers.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryingTransport,
+    RetryPolicy,
+    parse_retry_after,
+)
+from scripts.checkers.session import HttpSession
+from .test_chrome import MOCK_CHROME_RESPONSE
+
+
+def flaky(failures, status=503, headers=None, body=b'{"ok": true}'):
+    """Route that fails ``failures`` times before answering 200."""
+
+    def respond(count):
+        if count <= failures:
+            return status, headers or {}, b"{}"
+        return 200, {}, body
+
+    return respond
+
+
+def make_client(policy, sleeps, clock=None, **kwargs):
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    transport = RetryingTransport(
+        httpx.AsyncHTTPTransport(),
+        policy,
+        sleep=sleep,
+        rand=lambda: 0.5,
+        clock=clock or (lambda: 0.0),
+        **kwargs,
+    )
+    return httpx.AsyncClient(transport=transport), transport
+
+
+@pytest.mark.asyncio
+async def test_retries_with_jittered_backoff(stub_server):
+    stub_server.route("/flaky", flaky(2))
+    sleeps = []
+    client, transport = make_client(RetryPolicy(base_delay=1.0), sleeps)
+
+    async with client:
+        response = await client.get(stub_server.url("/flaky"))
+
+    assert response.status_code == 200
+    assert stub_server.hits["/flaky"] == 3
+    # Full jitter: half of the 1s and 2s ceilings with rand() == 0.5
+    assert sleeps == [0.5, 1.0]
+    assert transport.stats.retries == 2
+    assert transport.stats.breakers["127.0.0.1"].state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_respects_retry_after(stub_server):
+    stub_server.route("/limited", flaky(1, status=429, headers={"Retry-After": "3"}))
+    sleeps = []
+    client, _ = make_client(RetryPolicy(), sleeps)
+
+    async with client:
+        assert (await client.get(stub_server.url("/limited"))).status_code == 200
+    assert sleeps == [3.0]
+
+    # Longer than the policy allows: give up instead of stalling the run
+    stub_server.route(
+        "/overloaded", flaky(1, status=503, headers={"Retry-After": "600"})
+    )
+    sleeps.clear()
+    client, transport = make_client(RetryPolicy(max_retry_after=30), sleeps)
+    async with client:
+        assert (await client.get(stub_server.url("/overloaded"))).status_code == 503
+    assert sleeps == []
+    assert transport.stats.gave_up == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_limits_whole_run(stub_server):
+    stub_server.route("/down", flaky(100))
+    sleeps = []
+    client, transport = make_client(
+        RetryPolicy(max_retries=5, retry_budget=2), sleeps
+    )
+
+    async with client:
+        for _ in range(2):
+            response = await client.get(stub_server.url("/down"))
+            assert response.status_code == 503
+
+    assert stub_server.hits["/down"] == 4
+    assert transport.stats.retries == 2
+    assert transport.stats.budget_exhausted == 2
+
+
+@pytest.mark.asyncio
+async def test_breaker_stops_requests_to_dead_host(stub_server):
+    stub_server.route("/down", flaky(100))
+    now = [0.0]
+    client, transport = make_client(
+        RetryPolicy(max_retries=1),
+        [],
+        clock=lambda: now[0],
+        failure_threshold=3,
+        reset_timeout=60,
+    )
+
+    async with client:
+        assert (await client.get(stub_server.url("/down"))).status_code == 503
+        # The third failure opens the breaker before the retry is sent
+        with pytest.raises(CircuitOpenError):
+            await client.get(stub_server.url("/down"))
+        with pytest.raises(CircuitOpenError):
+            await client.get(stub_server.url("/down"))
+        assert stub_server.hits["/down"] == 3
+
+        # After the reset timeout one trial request goes through
+        stub_server.route("/down", flaky(0))
+        now[0] = 61.0
+        assert (await client.get(stub_server.url("/down"))).status_code == 200
+
+    breaker = transport.stats.breakers["127.0.0.1"]
+    assert breaker.as_dict() == {
+        "state": "closed",
+        "consecutive_failures": 0,
+        "trips": 1,
+        "rejected": 2,
+    }
+
+
+def test_half_open_failure_reopens():
+    now = [0.0]
+    breaker = CircuitBreaker(
+        failure_threshold=1, reset_timeout=10, clock=lambda: now[0]
+    )
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 10.0
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.trips == 2
+
+
+@pytest.mark.asyncio
+async def test_interrupted_trial_does_not_wedge_the_breaker():
+    now = [0.0]
+    errors = [
+        httpx.ConnectError("refused"),
+        httpx.RemoteProtocolError("peer closed connection"),
+        ValueError("unrelated bug"),
+        None,
+    ]
+
+    def respond(request):
+        error = errors.pop(0)
+        if error is not None:
+            raise error
+        return httpx.Response(200)
+
+    transport = RetryingTransport(
+        httpx.MockTransport(respond),
+        RetryPolicy(max_retries=0),
+        failure_threshold=1,
+        reset_timeout=10,
+        clock=lambda: now[0],
+    )
+    breaker = transport.breaker("x.test")
+    request = httpx.Request("GET", "https://x.test/")
+
+    with pytest.raises(httpx.ConnectError):
+        await transport.handle_async_request(request)
+    now[0] = 10.0
+    # A protocol error is a host failure and reopens the breaker
+    with pytest.raises(httpx.RemoteProtocolError):
+        await transport.handle_async_request(request)
+    assert breaker.state == "open"
+
+    now[0] = 20.0
+    # Any other error ends the trial without judging the host
+    with pytest.raises(ValueError):
+        await transport.handle_async_request(request)
+    assert breaker.state == "half_open"
+    response = await transport.handle_async_request(request)
+    assert response.status_code == 200
+    assert breaker.state == "closed"
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=1445412480) == 30.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_checker_recovers_from_transient_errors(stub_server):
+    body = httpx.Response(200, json=MOCK_CHROME_RESPONSE).content
+    stub_server.route("/win/channels/stable/versions", flaky(1, body=body))
+    checker = ChromeVersionChecker()
+    checker.base_url = stub_server.base_url
+    checker.channels = []  # stable only
+
+    policy = RetryPolicy(base_delay=0.01)
+    async with HttpSession(http2=False, retry_policy=policy) as session:
+        result = await checker.fetch_latest_version("windows")
+
+    assert result["version"] == "120.0.6099.129"
+    assert session.resilience.retries == 1
+    assert session.stats.requests == 2
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from scripts.checkers.safari import SafariVersionChecker
 from .conftest import MockResponse
@@ -29,6 +31,7 @@ MOCK_SAFARI_RESPONSE = {
 async def test_safari_fetch_success(mock_httpx_client, mocker):
     mock_client, mock_context = mock_httpx_client
     checker = SafariVersionChecker()
+    checker.streaming = False  # the mocked client only supports buffered get()
     mocker.patch.object(checker, "get_client", return_value=mock_context)
 
     # Configure mock response
@@ -45,6 +48,7 @@ async def test_safari_fetch_success(mock_httpx_client, mocker):
 async def test_safari_fetch_error(mock_httpx_client, mocker):
     mock_client, mock_context = mock_httpx_client
     checker = SafariVersionChecker()
+    checker.streaming = False  # the mocked client only supports buffered get()
     mocker.patch.object(checker, "get_client", return_value=mock_context)
 
     # Configure error response
@@ -60,3 +64,46 @@ def test_safari_supported_platforms():
     assert "macos" in platforms
     assert "ios" in platforms
     assert "windows" not in platforms
+
+
+@pytest.mark.asyncio
+async def test_safari_streaming_fetch_success(stub_server):
+    stub_server.route("/index", MOCK_SAFARI_RESPONSE)
+    checker = SafariVersionChecker()
+    checker.api_url = stub_server.url("/index")
+
+    result = await checker.fetch_latest_version("ios")
+    assert result is not None
+    assert result["version"] == "18.2"
+    assert result["check_url"] == checker.api_url
+
+
+@pytest.mark.asyncio
+async def test_safari_streaming_stops_early(stub_server):
+    children = MOCK_SAFARI_RESPONSE["interfaceLanguages"]["swift"][0]["children"]
+    filler = [
+        {
+            "path": f"/documentation/safari-release-notes/safari-{n}_0-release-notes",
+            "title": f"Safari {n}.0 Release Notes",
+            "type": "article",
+        }
+        for n in range(17, 0, -1)
+    ] * 2000
+    document = {"interfaceLanguages": {"swift": [{"children": children + filler}]}}
+    stub_server.route("/index", document)
+    checker = SafariVersionChecker()
+    checker.api_url = stub_server.url("/index")
+
+    result = await checker.fetch_latest_version("macos")
+    assert result["version"] == "18.2"
+    document_size = len(json.dumps(document))
+    assert checker.bytes_downloaded < document_size / 4
+
+
+@pytest.mark.asyncio
+async def test_safari_streaming_missing_index(stub_server):
+    stub_server.route("/index", {"interfaceLanguages": {"objc": []}})
+    checker = SafariVersionChecker()
+    checker.api_url = stub_server.url("/index")
+
+    assert await checker.fetch_latest_version("macos") is None
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from scripts.checkers.chrome import ChromeVersionChecker
+from scripts.checkers.scheduler import RequestScheduler, TokenBucket
+from scripts.checkers.session import HttpSession
+from .test_chrome import MOCK_CHROME_RESPONSE
+
+
+async def run_requests(scheduler, requests, hold=0.0):
+    """Acquire a slot for each (host, product) and return the grant order."""
+    granted = []
+
+    async def request(host, product):
+        await scheduler.acquire(host, product)
+        granted.append(product)
+        await asyncio.sleep(hold)
+        scheduler.release(host)
+
+    await asyncio.gather(*(request(host, product) for host, product in requests))
+    return granted
+
+
+@pytest.mark.asyncio
+async def test_round_robin_across_products():
+    scheduler = RequestScheduler(max_concurrency=1, host_rate=None)
+    requests = [("a.example", "big")] * 5 + [("b.example", "small")] * 2
+
+    granted = await run_requests(scheduler, requests)
+
+    # "small" queued behind five "big" requests but is not starved
+    assert granted == ["big", "small", "big", "small", "big", "big", "big"]
+    assert scheduler.stats.peak_active == 1
+    assert scheduler.stats.peak_queued == 6
+
+
+@pytest.mark.asyncio
+async def test_per_host_cap_does_not_block_other_hosts():
+    scheduler = RequestScheduler(max_concurrency=4, max_per_host=1, host_rate=None)
+    requests = [("a.example", "p")] * 3 + [("b.example", "p")]
+
+    await run_requests(scheduler, requests, hold=0.01)
+
+    # One request per host at a time: a.example never took all the slots
+    assert scheduler.stats.peak_active == 2
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_requests_per_host():
+    scheduler = RequestScheduler(host_rate=50.0, host_burst=1)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await run_requests(scheduler, [("a.example", "p")] * 4)
+    elapsed = loop.time() - start
+
+    # One token up front, then one every 20ms
+    assert elapsed >= 0.05
+    waits = scheduler.stats.waits["p"]
+    assert len(waits) == 4 and max(waits) >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_leaves_the_queue():
+    scheduler = RequestScheduler(max_concurrency=1, host_rate=None)
+    await scheduler.acquire("a.example", "p")
+
+    waiting = asyncio.ensure_future(scheduler.acquire("a.example", "q"))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    assert scheduler.queued == 0
+    scheduler.release("a.example")
+    assert await scheduler.acquire("a.example", "p") == pytest.approx(0, abs=0.01)
+
+
+def test_token_bucket_refills():
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, burst=2, clock=lambda: now[0])
+    assert bucket.try_take() and bucket.try_take()
+    assert not bucket.try_take()
+    assert bucket.wait_time() == pytest.approx(0.5)
+
+    now[0] = 0.5
+    assert bucket.try_take()
+
+
+@pytest.mark.asyncio
+async def test_session_reports_queue_wait(stub_server):
+    for code in ["win", "mac", "android"]:
+        stub_server.route(f"/{code}/channels/stable/versions", MOCK_CHROME_RESPONSE)
+    checker = ChromeVersionChecker()
+    checker.base_url = stub_server.base_url
+    checker.channels = []  # stable only
+
+    async with HttpSession(http2=False, host_rate=50.0, host_burst=1) as session:
+        results = await checker.fetch_latest_versions(["windows", "macos", "android"])
+
+    assert all(result["version"] == "120.0.6099.129" for result in results.values())
+    assert checker.transfer_stats()["queue_wait_ms"] >= 20
+    assert session.scheduler.stats.as_dict()["products"]["chrome"]["requests"] == 3
@@ -0,0 +1,80 @@
+import json
+import os
+
+import pytest
+from jsonschema import ValidationError
+from scripts.checkers.chrome import ChromeVersionChecker
+from scripts.checkers.edge import EdgeVersionChecker
+from scripts.checkers.schema import CompiledSchema, get_compiled_schema
+
+SIMPLE_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["name"],
+    "properties": {"name": {"type": "string"}},
+}
+
+
+def test_checkers_share_one_compiled_schema():
+    assert ChromeVersionChecker().compiled_schema is EdgeVersionChecker().compiled_schema
+
+
+def test_schema_recompiled_when_file_changes(tmp_path):
+    schema_file = tmp_path / "schema.json"
+    schema_file.write_text(json.dumps(SIMPLE_SCHEMA))
+
+    first = get_compiled_schema(schema_file)
+    assert get_compiled_schema(schema_file) is first
+
+    schema_file.write_text(json.dumps(dict(SIMPLE_SCHEMA, required=[])))
+    stat = schema_file.stat()
+    os.utime(schema_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = get_compiled_schema(schema_file)
+    assert second is not first
+    assert second.schema["required"] == []
+
+
+def test_invalid_schema_rejected():
+    with pytest.raises(Exception):
+        CompiledSchema({"type": "not-a-type"})
+
+
+def test_validate_document_skips_known_serializations():
+    compiled = CompiledSchema(SIMPLE_SCHEMA)
+    document = {"name": "chrome"}
+    serialized = json.dumps(document)
+
+    compiled.validate_document(serialized, document)
+    compiled.validate_document(serialized, document)
+    compiled.validate_document(serialized.encode(), document)
+    assert compiled.full_validations == 1
+
+    changed = {"name": "edge"}
+    compiled.validate_document(json.dumps(changed), changed)
+    assert compiled.full_validations == 2
+
+
+def test_validate_document_reports_errors_and_does_not_remember_them():
+    compiled = CompiledSchema(SIMPLE_SCHEMA)
+    document = {"name": 1}
+
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            compiled.validate_document(json.dumps(document), document)
+    assert compiled.full_validations == 2
+
+
+def test_read_after_write_is_not_revalidated(tmp_path, mocker):
+    checker = ChromeVersionChecker()
+    checker.data_file = tmp_path / "chrome.json"
+    validate = mocker.spy(checker.compiled_schema, "validate")
+
+    data = checker.read_current_data()
+    data["metadata"]["last_checked"] = "2030-01-01T00:00:00Z"
+    checker.write_updated_data(data)
+    checker.read_current_data()
+
+    # Initial data and the modified data each validated once; the re-read
+    # of what was just written is a digest hit
+    assert validate.call_count == 2
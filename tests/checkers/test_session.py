@@ -0,0 +1,180 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+from scripts.checkers.chrome import ChromeVersionChecker
+from scripts.checkers.edge import EdgeVersionChecker
+from scripts.checkers.session import HttpSession, accept_encoding, current_session
+from .test_chrome import MOCK_CHROME_RESPONSE
+from .test_edge import MOCK_EDGE_RESPONSE
+
+
+@pytest.mark.asyncio
+async def test_session_reuses_one_connection_per_host(stub_server):
+    for code in ["win", "mac", "android"]:
+        stub_server.route(
+            f"/{code}/channels/stable/versions", MOCK_CHROME_RESPONSE
+        )
+    checker = ChromeVersionChecker()
+    checker.base_url = stub_server.base_url
+    checker.channels = []  # stable only
+
+    async with HttpSession(http2=False) as session:
+        for platform in ["windows", "macos", "android"]:
+            result = await checker.fetch_latest_version(platform)
+            assert result["version"] == "120.0.6099.129"
+
+    assert stub_server.connections == 1
+    assert session.stats.requests == 3
+    assert session.stats.connections_opened == 1
+    assert session.stats.connections_reused == 2
+    assert session.stats.connections_by_host == {"127.0.0.1": 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_connection(stub_server):
+    for code in ["win", "mac", "android"]:
+        stub_server.route(
+            f"/{code}/channels/stable/versions", MOCK_CHROME_RESPONSE
+        )
+    checker = ChromeVersionChecker()
+    checker.base_url = stub_server.base_url
+    checker.channels = []  # stable only
+
+    async with HttpSession(http2=False) as session:
+        results = await checker.fetch_latest_versions(["windows", "macos", "android"])
+
+    assert all(r["version"] == "120.0.6099.129" for r in results.values())
+    assert stub_server.connections == 1
+    assert session.stats.requests == 3
+    assert session.stats.connections_opened == 1
+
+
+@pytest.mark.asyncio
+async def test_session_coalesces_identical_urls(stub_server):
+    stub_server.route("/api/products", MOCK_EDGE_RESPONSE)
+    checker = EdgeVersionChecker()
+    checker.api_url = stub_server.url("/api/products")
+
+    async with HttpSession(http2=False) as session:
+        results = await asyncio.gather(
+            *(
+                checker.fetch_latest_version(platform)
+                for platform in ["windows", "macos", "windows"]
+            )
+        )
+        assert all(r["version"] == "120.0.2210.121" for r in results)
+        # A later request in the same run is served from the shared result
+        assert await checker.fetch_latest_version("macos") is not None
+
+    assert stub_server.hits["/api/products"] == 1
+    assert session.stats.coalesced == 3
+
+
+@pytest.mark.asyncio
+async def test_session_response_ttl_zero_only_shares_in_flight(stub_server):
+    stub_server.route("/api/products", MOCK_EDGE_RESPONSE)
+    checker = EdgeVersionChecker()
+    checker.api_url = stub_server.url("/api/products")
+
+    async with HttpSession(http2=False, response_ttl=0) as session:
+        await asyncio.gather(
+            checker.fetch_latest_version("windows"),
+            checker.fetch_latest_version("macos"),
+        )
+        await checker.fetch_latest_version("macos")
+
+    assert stub_server.hits["/api/products"] == 2
+    assert session.stats.coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_session_does_not_cache_failures():
+    attempts = []
+
+    async def fetch():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ValueError("upstream down")
+        return {"ok": True}
+
+    async with HttpSession(http2=False) as session:
+        with pytest.raises(ValueError):
+            await session.coalesce("key", fetch)
+        assert await session.coalesce("key", fetch) == {"ok": True}
+        assert await session.coalesce("key", fetch) == {"ok": True}
+
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_session_response_cache_is_bounded():
+    async def fetch():
+        return object()
+
+    async with HttpSession(http2=False, max_cached_responses=2) as session:
+        for key in ["a", "b", "c"]:
+            await session.coalesce(key, fetch)
+        assert list(session._responses) == ["b", "c"]
+
+    assert not session._responses
+
+
+@pytest.mark.asyncio
+async def test_without_session_each_fetch_opens_a_connection(stub_server):
+    stub_server.route("/api/products", MOCK_EDGE_RESPONSE)
+    checker = EdgeVersionChecker()
+    checker.api_url = stub_server.url("/api/products")
+
+    for platform in ["windows", "macos"]:
+        assert await checker.fetch_latest_version(platform) is not None
+
+    assert stub_server.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_session_closes_client_and_clears_context():
+    async with HttpSession(http2=False) as session:
+        assert current_session() is session
+        client = session.client
+
+    assert current_session() is None
+    assert client.is_closed
+    with pytest.raises(RuntimeError):
+        session.client
+
+
+@pytest.mark.asyncio
+async def test_compressed_responses_are_decoded_and_counted(stub_server):
+    body = json.dumps(MOCK_EDGE_RESPONSE * 50).encode()
+    compressed = gzip.compress(body)
+    stub_server.route(
+        "/api/products",
+        lambda count: (200, {"Content-Encoding": "gzip"}, compressed),
+    )
+    checker = EdgeVersionChecker()
+
+    async with HttpSession(http2=False):
+        data = await checker.fetch_json(stub_server.url("/api/products"))
+
+    assert len(data) == len(MOCK_EDGE_RESPONSE) * 50
+    _, headers = stub_server.request_headers[0]
+    assert "gzip" in headers["Accept-Encoding"]
+    assert checker.bytes_downloaded == len(compressed) < len(body)
+
+
+@pytest.mark.parametrize(
+    "installed, expected",
+    [
+        (set(), "gzip, deflate"),
+        ({"brotlicffi"}, "br, gzip, deflate"),
+        ({"brotli", "zstandard"}, "zstd, br, gzip, deflate"),
+    ],
+)
+def test_accept_encoding_follows_installed_decoders(mocker, installed, expected):
+    mocker.patch(
+        "importlib.util.find_spec",
+        side_effect=lambda name: object() if name in installed else None,
+    )
+    assert accept_encoding() == expected
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from scripts.checkers.state import FieldChange
+from .test_base_checker import FakeChecker
+
+
+def load(checker):
+    return json.loads(checker.data_file.read_text())
+
+
+def test_set_platform_tracks_changed_fields(tmp_path):
+    checker = FakeChecker(tmp_path)
+    state = checker.load_state()
+    entry = state.get_platform("windows")
+
+    assert state.set_platform("windows", entry) == []
+    assert not state.dirty
+
+    entry["version"] = "2.0.0"
+    changes = state.set_platform("windows", entry)
+    assert changes == [FieldChange("windows", "version", "0.0.0", "2.0.0")]
+    assert state.dirty
+    assert state.changes == changes
+
+
+def test_save_skips_noop_unless_touched(tmp_path):
+    checker = FakeChecker(tmp_path)
+    state = checker.load_state()
+    before = checker.data_file.read_text()
+
+    assert state.save() is False
+    assert checker.data_file.read_text() == before
+
+    assert state.save(touch_last_checked=True) is True
+    assert load(checker)["metadata"]["last_checked"] != "2025-01-01T00:00:00Z"
+
+
+def test_failed_write_leaves_file_intact(tmp_path, mocker):
+    checker = FakeChecker(tmp_path)
+    state = checker.load_state()
+    before = checker.data_file.read_text()
+
+    entry = state.get_platform("macos")
+    entry["version"] = "9.9.9"
+    state.set_platform("macos", entry)
+    mocker.patch("os.replace", side_effect=OSError("disk full"))
+
+    with pytest.raises(OSError):
+        state.save()
+
+    assert checker.data_file.read_text() == before
+    assert [p.name for p in tmp_path.iterdir()] == ["fake.json"]
+
+
+@pytest.mark.asyncio
+async def test_update_loads_once_and_skips_noop_rewrite(tmp_path, mocker):
+    checker = FakeChecker(tmp_path)
+    assert await checker.update() is True
+    first = checker.data_file.read_text()
+    assert load(checker)["versions"]["platforms"]["linux"]["version"] == "1.0.2"
+
+    read = mocker.spy(checker, "read_current_data")
+    validate = mocker.spy(checker.compiled_schema, "validate_document")
+    assert await checker.update() is True
+
+    assert read.call_count == 1
+    assert validate.call_count == 1  # the initial read; nothing was written
+    assert checker.data_file.read_text() == first
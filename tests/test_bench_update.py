@@ -0,0 +1,42 @@
+import asyncio
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS = Path(__file__).parent.parent / "benchmarks"
+
+
+def load_benchmark(name):
+    spec = importlib.util.spec_from_file_location(name, BENCHMARKS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_synthetic_payload_size():
+    stub = load_benchmark("stub_upstream")
+    body = stub.synthetic("widget", "linux", 2048)
+    assert len(body) == 2048
+    assert json.loads(body)["version"] == "1.2.3"
+
+
+@pytest.mark.asyncio
+async def test_update_round_against_stub(tmp_path):
+    stub = load_benchmark("stub_upstream")
+    bench = load_benchmark("bench_update")
+    upstream = stub.StubUpstream(size=512)
+    server = await asyncio.start_server(upstream.handle, "127.0.0.1", 0)
+    base_url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    try:
+        result = await bench.run_round(base_url, 6, 2, tmp_path, concurrency=8)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert result["failed_products"] == 0
+    assert result["requests"] == upstream.requests
+    assert result["bytes_read"] > 0
+    assert (tmp_path / "synthetic-0001.json").exists()
+    assert (tmp_path / "safari.json").exists()
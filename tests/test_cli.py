@@ -0,0 +1,106 @@
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from scripts import cli
+
+BENCH_IMPORT = Path(__file__).parent.parent / "benchmarks" / "bench_import.py"
+
+
+def load_bench_import():
+    spec = importlib.util.spec_from_file_location("bench_import", BENCH_IMPORT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_list_and_get(capsys):
+    assert cli.main(["list"]) == 0
+    assert "chrome" in capsys.readouterr().out.split()
+
+    assert cli.main(["get", "edge", "linux"]) == 0
+    assert capsys.readouterr().out.strip()
+
+    assert cli.main(["get", "edge"]) == 0
+    assert json.loads(capsys.readouterr().out)["identifier"] == "edge"
+
+    assert cli.main(["get", "netscape"]) == 1
+
+
+def test_check_is_delegated(capsys):
+    program = sys.argv[0]
+    # Unknown products are rejected before any network access
+    assert cli.main(["check", "--product", "netscape"]) == 2
+    assert sys.argv[0] == program
+
+    with pytest.raises(SystemExit):
+        cli.main(["check", "--help"])
+    assert capsys.readouterr().out.startswith("usage: version-tracker check")
+    assert sys.argv[0] == program
+
+
+def test_parse_importtime():
+    bench = load_bench_import()
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _json\n"
+        "import time:       900 |       1020 | json\n"
+    )
+    assert bench.parse_importtime(stderr) == [("_json", 120, 1), ("json", 1020, 0)]
+
+
+# Runs a CLI command, then prints the heavy dependencies it left in sys.modules
+PROBE = """
+import contextlib, io, json, sys
+from scripts import cli
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        cli.main(sys.argv[2:])
+    except SystemExit:
+        pass
+heavy = json.loads(sys.argv[1])
+print(json.dumps(sorted(m for m in sys.modules if m.split(".")[0] in heavy)))
+"""
+
+
+@pytest.mark.parametrize("command", ["help", "list", "get"])
+def test_cold_start_stays_light(command):
+    # Import times vary too much between machines to assert on here; which
+    # modules get loaded does not
+    bench = load_bench_import()
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            PROBE,
+            json.dumps(bench.HEAVY_MODULES),
+            *bench.COMMANDS[command],
+        ],
+        cwd=bench.REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert json.loads(result.stdout) == []
+
+
+def test_serve_loads_no_checker_dependencies():
+    # The server needs asyncio, but neither the HTTP client nor the validator
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            PROBE,
+            json.dumps(["httpx", "httpcore", "jsonschema"]),
+            "serve",
+            "--help",
+        ],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert json.loads(result.stdout) == []
@@ -0,0 +1,191 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from scripts.checkers.declarative import JsonApiChecker
+from scripts.checkers.registry import CheckerRegistry
+from scripts.daemon import (
+    Daemon,
+    IntervalPolicy,
+    ProductSchedule,
+    ReleaseWindows,
+    create_checkers,
+)
+from scripts.history import HistoryStore
+
+# Monday 2026-10-12 16:00 UTC
+MONDAY_4PM = datetime(2026, 10, 12, 16, tzinfo=timezone.utc).timestamp()
+POLICY = IntervalPolicy(
+    min_interval=60, base_interval=600, max_interval=2000, backoff=2, jitter=0.1
+)
+
+
+def test_interval_backs_off_and_resets_on_change():
+    schedule = ProductSchedule("chrome", POLICY)
+    now = MONDAY_4PM
+    schedule.record(now, success=True, changed=False)
+    assert schedule.interval == 1200
+    schedule.record(now, success=True, changed=False)
+    assert schedule.interval == 2000
+    schedule.record(now, success=False, changed=False)
+    assert schedule.interval == 2000
+
+    schedule.record(now + 900, success=True, changed=True, requests=3)
+    assert schedule.interval == 600
+    assert schedule.detection_latencies == [900]
+    assert schedule.as_dict()["requests"] == 3
+    # Jitter spreads the delay by +/-10%
+    assert schedule.next_delay(now + 2 * 86400, rand=lambda: 1.0) == pytest.approx(660)
+    assert schedule.next_delay(now + 2 * 86400, rand=lambda: 0.0) == pytest.approx(540)
+
+
+def test_release_window_tightens_interval(tmp_path):
+    history = HistoryStore(tmp_path)
+    history.append("safari", "macos", "18.0", timestamp="2026-09-14T00:00:00Z")
+    # A release on a Monday at 17:00 UTC
+    history.append(
+        "safari", "macos", "18.1", previous="18.0", timestamp="2026-09-21T17:10:00Z"
+    )
+
+    windows = ReleaseWindows.from_history(history, "safari", spread_hours=1)
+    assert windows.releases == 1
+    schedule = ProductSchedule("safari", POLICY, windows)
+    assert schedule.in_window(MONDAY_4PM)
+    assert schedule.next_delay(MONDAY_4PM, rand=lambda: 0.5) == 60
+    # Tuesday is outside every window
+    assert schedule.next_delay(MONDAY_4PM + 86400, rand=lambda: 0.5) == 600
+
+
+@pytest.mark.asyncio
+async def test_daemon_polls_and_reports(tmp_path):
+    hits = []
+
+    def respond(request):
+        hits.append(request.url.path)
+        version = "1.1.0" if len(hits) >= 4 else "1.0.0"
+        return httpx.Response(200, json={"version": version})
+
+    checker = JsonApiChecker(
+        {
+            "identifier": "widget",
+            "name": "Widget",
+            "type": "runtime",
+            "url": "https://api.test/{platform}.json",
+            "path": ["version"],
+            "platforms": {"linux": {}},
+        }
+    )
+    checker.data_file = tmp_path / "widget.json"
+
+    clock = [MONDAY_4PM]
+    daemon = None
+
+    async def sleep(delay):
+        clock[0] += delay
+        if daemon.schedules["widget"].checks >= 5:
+            daemon.stop()
+        await asyncio.sleep(0)
+
+    daemon = Daemon(
+        {"widget": checker},
+        POLICY,
+        transport=httpx.MockTransport(respond),
+        clock=lambda: clock[0],
+        sleep=sleep,
+        rand=lambda: 0.5,
+    )
+    report = await daemon.run()
+
+    widget = report["products"]["widget"]
+    assert widget["checks"] == 5
+    assert widget["requests"] == 5
+    # The first check only replaced the placeholder; the fourth found 1.1.0
+    assert widget["changes"] == 1
+    # Checks 2 and 3 had backed off to 1200s and 2000s before it was seen
+    assert widget["detection_latency_bound_s"] == {
+        "count": 1,
+        "mean": 2000.0,
+        "max": 2000.0,
+    }
+    assert widget["interval_s"] == 1200
+
+    daemon.report_file = tmp_path / "report.json"
+    daemon.write_report()
+    written = json.loads(daemon.report_file.read_text())
+    assert written["products"]["widget"]["checks"] == 5
+    stored = checker.read_current_data()["versions"]["platforms"]["linux"]
+    assert stored["version"] == "1.1.0"
+
+
+@pytest.mark.asyncio
+async def test_failed_poll_does_not_repeat_previous_change(tmp_path):
+    checker = JsonApiChecker(
+        {
+            "identifier": "widget",
+            "name": "Widget",
+            "type": "runtime",
+            "url": "https://api.test/{platform}.json",
+            "path": ["version"],
+            "platforms": {"linux": {}},
+        }
+    )
+    checker.data_file = tmp_path / "widget.json"
+    entry = {"check_url": "https://api.test/linux.json", "check_method": "api"}
+
+    async def update_then_fail(**kwargs):
+        if checker.state is not None:
+            raise AssertionError("poll() should start from a fresh state")
+        if daemon.schedules["widget"].checks:
+            raise RuntimeError("data file unreadable")
+        state = checker.load_state()
+        state.set_platform("linux", {"version": "1.0.0", **entry})
+        state.set_platform("linux", {"version": "1.1.0", **entry})
+        return True
+
+    checker.update = update_then_fail
+    daemon = Daemon({"widget": checker}, POLICY, clock=lambda: MONDAY_4PM)
+
+    assert await daemon.poll("widget") is True
+    assert await daemon.poll("widget") is False
+    assert daemon.schedules["widget"].changes == 1
+    assert daemon.schedules["widget"].failures == 1
+
+
+def test_broken_checker_is_left_out(tmp_path):
+    (tmp_path / "broken.json").write_text(json.dumps({"identifier": "broken"}))
+    registry = CheckerRegistry(definitions_dir=tmp_path, use_entry_points=False)
+
+    checkers = create_checkers(registry, ["chrome", "broken", "edge"])
+
+    assert list(checkers) == ["chrome", "edge"]
+
+
+@pytest.mark.asyncio
+async def test_failed_cache_save_does_not_end_polling(tmp_path):
+    checker = JsonApiChecker(
+        {
+            "identifier": "widget",
+            "name": "Widget",
+            "type": "runtime",
+            "url": "https://api.test/{platform}.json",
+            "path": ["version"],
+            "platforms": {"linux": {}},
+        }
+    )
+    checker.data_file = tmp_path / "widget.json"
+
+    async def update(**kwargs):
+        return True
+
+    def save():
+        raise OSError("No space left on device")
+
+    checker.update = update
+    daemon = Daemon({"widget": checker}, POLICY, clock=lambda: MONDAY_4PM)
+    daemon.session = SimpleNamespace(validator_cache=SimpleNamespace(save=save))
+
+    assert await daemon.poll("widget") is False
+    assert daemon.schedules["widget"].checks == 1
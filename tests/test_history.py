@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from scripts import history
+from scripts.history import HistoryStore, normalize_timestamp
+from .checkers.test_base_checker import FakeChecker
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append("chrome", "windows", "120.0", None, "2025-01-01T00:00:00Z")
+    store.append("chrome", "windows", "121.0", "120.0", "2025-02-01T12:00:00Z")
+    store.append("chrome", "macos", "121.0", "120.0", "2025-02-02T00:00:00Z")
+    store.append("chrome", "windows", "122.0", "121.0", "2025-03-01T00:00:00Z")
+    return store
+
+
+def test_normalize_timestamp_is_fixed_width():
+    assert normalize_timestamp("2025-02-01") == "2025-02-01T00:00:00.000000Z"
+    assert normalize_timestamp("2025-02-01T01:00:00+01:00") == (
+        "2025-02-01T00:00:00.000000Z"
+    )
+    assert normalize_timestamp("2025-02-01T00:00:00.5Z") > normalize_timestamp(
+        "2025-02-01T00:00:00Z"
+    )
+
+
+def test_version_at(store):
+    assert store.version_at("chrome", "windows", "2024-12-31") is None
+    assert store.version_at("chrome", "windows", "2025-01-01") == "120.0"
+    assert store.version_at("chrome", "windows", "2025-02-01T11:59:59Z") == "120.0"
+    assert store.version_at("chrome", "windows", "2025-02-01T12:00:00Z") == "121.0"
+    assert store.version_at("chrome", "windows", "2030-01-01") == "122.0"
+    assert store.version_at("chrome", "linux", "2030-01-01") is None
+
+
+def test_changes_range_query(store, tmp_path):
+    windows = store.changes(
+        "chrome", "windows", since="2025-02-01", until="2025-03-01"
+    )
+    assert [r["version"] for r in windows] == ["121.0", "122.0"]
+
+    # A fresh store reads the same answers back from disk
+    reopened = HistoryStore(tmp_path)
+    everything = reopened.changes("chrome")
+    assert [(r["platform"], r["version"]) for r in everything] == [
+        ("windows", "120.0"),
+        ("windows", "121.0"),
+        ("macos", "121.0"),
+        ("windows", "122.0"),
+    ]
+    assert reopened.products() == ["chrome"]
+    assert reopened.platforms("chrome") == ["macos", "windows"]
+
+
+def test_append_writes_one_compact_line(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append("edge", "linux", "1.2.3", "1.2.2", "2025-01-01T00:00:00Z")
+    lines = (tmp_path / "edge.jsonl").read_text().splitlines()
+    assert len(lines) == 1
+    assert " " not in lines[0]
+    assert json.loads(lines[0])["previous"] == "1.2.2"
+
+
+@pytest.mark.asyncio
+async def test_update_appends_only_real_changes(tmp_path):
+    checker = FakeChecker(tmp_path)
+    await checker.update()
+    await checker.update()
+
+    store = HistoryStore(checker.history_dir)
+    changes = store.changes("fake")
+    assert len(changes) == 5
+    assert {r["previous"] for r in changes} == {"0.0.0"}
+
+
+def test_cli(store, tmp_path, capsys):
+    base = ["--history-dir", str(tmp_path)]
+
+    assert history.main(base + ["at", "chrome", "windows", "2025-02-15"]) == 0
+    assert capsys.readouterr().out.strip() == "121.0"
+
+    assert history.main(base + ["at", "chrome", "windows", "2020-01-01"]) == 1
+
+    assert history.main(base + ["log", "chrome", "--platform", "macos"]) == 0
+    assert "120.0 -> 121.0" in capsys.readouterr().out
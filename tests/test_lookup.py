@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from scripts import lookup
+from scripts.lookup import VersionIndex
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for path in DATA_DIR.glob("*.json"):
+        shutil.copy(path, tmp_path / path.name)
+    return tmp_path
+
+
+def bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_lookups_match_data_files():
+    chrome = json.loads((DATA_DIR / "chrome.json").read_text())
+    expected = chrome["versions"]["platforms"]["windows"]["version"]
+
+    assert lookup.get_version("chrome", "windows") == expected
+    assert lookup.get_version("chrome", "linux") is None
+    assert lookup.get_version("netscape", "windows") is None
+    assert lookup.list_products() == ["chrome", "edge", "firefox", "safari"]
+
+
+def test_is_newer(data_dir):
+    index = VersionIndex(data_dir)
+    current = index.get_version("safari", "macos")
+
+    assert index.is_newer("safari", "macos", "1.0")
+    assert not index.is_newer("safari", "macos", current)
+    assert not index.is_newer("safari", "macos", "999.0")
+    assert not index.is_newer("safari", "windows", "1.0")
+
+
+def test_lookups_do_not_touch_disk(data_dir, mocker):
+    index = VersionIndex(data_dir)
+    index.list_products()
+
+    mocker.patch("builtins.open", side_effect=AssertionError("disk access"))
+    mocker.patch.object(Path, "stat", side_effect=AssertionError("disk access"))
+    assert index.get_version("edge", "linux") is not None
+    assert index.get_entry("edge", "linux")["check_method"] == "api"
+
+
+def test_index_is_read_only(data_dir):
+    index = VersionIndex(data_dir)
+    entry = index.get_entry("chrome", "windows")
+    with pytest.raises(TypeError):
+        entry["version"] = "1.0"
+    assert isinstance(index.get_product("chrome")["platforms"], tuple)
+
+
+def test_reload_only_reparses_changed_files(data_dir, mocker):
+    index = VersionIndex(data_dir)
+    index.list_products()
+    assert index.reload() is False
+
+    path = data_dir / "safari.json"
+    data = json.loads(path.read_text())
+    data["versions"]["platforms"]["ios"]["version"] = "99.1"
+    path.write_text(json.dumps(data))
+    bump_mtime(path)
+
+    loads = mocker.spy(json, "load")
+    assert index.reload() is True
+    assert loads.call_count == 1
+    assert index.get_version("safari", "ios") == "99.1"
+
+    (data_dir / "edge.json").unlink()
+    assert index.reload() is True
+    assert index.list_products() == ["chrome", "firefox", "safari"]
+
+
+def test_import_does_not_pull_in_checker_dependencies():
+    code = (
+        "import sys, scripts.lookup as l; l.list_products(); "
+        "print(','.join(m for m in ('httpx', 'jsonschema') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_channel_versions(data_dir):
+    path = data_dir / "firefox.json"
+    data = json.loads(path.read_text())
+    data["versions"]["platforms"]["windows"]["channels"] = {
+        "beta": {"version": "999.0b1"},
+        "esr": {"version": "140.4.0esr"},
+    }
+    path.write_text(json.dumps(data))
+    index = VersionIndex(data_dir)
+
+    assert index.get_version("firefox", "windows", "beta") == "999.0b1"
+    assert index.get_version("firefox", "windows", "esr") == "140.4.0esr"
+    assert index.get_version("firefox", "windows", "nightly") is None
+    assert index.get_version("firefox", "macos", "beta") is None
+    assert index.is_newer("firefox", "windows", "999.0a1", channel="beta")
+    assert not index.is_newer("firefox", "windows", "999.0", channel="beta")
@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+import pytest
+from scripts import run_all
+from scripts.checkers.chrome import ChromeVersionChecker
+from scripts.checkers.declarative import JsonApiChecker
+from scripts.checkers.edge import EdgeVersionChecker
+from scripts.checkers.registry import CheckerRegistry
+from tests.checkers.test_declarative import DEFINITIONS
+
+
+def test_registry_lists_builtin_and_declarative_checkers():
+    assert CheckerRegistry().names() == ["chrome", "edge", "firefox", "safari"]
+
+    registry = CheckerRegistry(definitions_dir=DEFINITIONS)
+    assert {"chrome", "edge", "firefox", "safari", "nodejs"} <= set(registry.names())
+    assert registry.factory("chrome") is ChromeVersionChecker
+    assert isinstance(registry.create("nodejs"), JsonApiChecker)
+
+
+@pytest.mark.asyncio
+async def test_run_checkers_concurrently(mocker):
+    started = []
+
+    async def fake_update(self, platforms=None, **kwargs):
+        started.append(type(self).__name__)
+        await asyncio.sleep(0.05)
+        return True
+
+    mocker.patch(
+        "scripts.checkers.base_checker.BaseVersionChecker.update", fake_update
+    )
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    assert await run_all.run_checkers() == 0
+    elapsed = loop.time() - start
+
+    assert len(started) == len(CheckerRegistry().names())
+    # All 50ms checks run together, not one after another
+    assert elapsed < 0.15
+
+
+@pytest.mark.asyncio
+async def test_run_checkers_filters_and_exit_code(mocker):
+    calls = {}
+
+    async def fake_update(self, platforms=None, **kwargs):
+        calls[type(self)] = platforms
+        return not isinstance(self, EdgeVersionChecker)
+
+    mocker.patch(
+        "scripts.checkers.base_checker.BaseVersionChecker.update", fake_update
+    )
+
+    result = await run_all.run_checkers(["chrome", "edge"], ["linux", "windows"])
+    assert result == 1
+    assert calls[ChromeVersionChecker] == ["windows"]
+    assert calls[EdgeVersionChecker] == ["linux", "windows"]
+
+
+@pytest.mark.asyncio
+async def test_run_checkers_unknown_product():
+    assert await run_all.run_checkers(["netscape"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_broken_definition_only_fails_its_product(mocker, tmp_path):
+    (tmp_path / "broken.json").write_text(json.dumps({"identifier": "broken"}))
+    updated = []
+
+    async def fake_update(self, platforms=None, **kwargs):
+        updated.append(type(self))
+        return True
+
+    mocker.patch(
+        "scripts.checkers.base_checker.BaseVersionChecker.update", fake_update
+    )
+    registry = CheckerRegistry(definitions_dir=tmp_path, use_entry_points=False)
+
+    assert await run_all.run_checkers(registry=registry) == 1
+    assert ChromeVersionChecker in updated
+    assert len(updated) == 4
+
+    assert await run_all.run_checkers(["broken"], registry=registry) == 1
+
+
+@pytest.mark.asyncio
+async def test_run_checkers_writes_metrics(mocker, tmp_path):
+    async def fake_update(self, platforms=None, **kwargs):
+        self._observe("extract", 0.01, platform="windows")
+        return True
+
+    mocker.patch(
+        "scripts.checkers.base_checker.BaseVersionChecker.update", fake_update
+    )
+
+    result = await run_all.run_checkers(
+        ["chrome"],
+        metrics_file=tmp_path / "metrics.prom",
+        report_file=tmp_path / "report.json",
+    )
+    assert result == 0
+    assert 'stage="extract",product="chrome"' in (tmp_path / "metrics.prom").read_text()
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["platforms"]["chrome"]["windows"]["extract"]["count"] == 1
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+import shutil
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+from scripts.server import VersionServer
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+@pytest_asyncio.fixture
+async def server(tmp_path):
+    for path in DATA_DIR.glob("*.json"):
+        shutil.copy(path, tmp_path / path.name)
+    server = VersionServer(tmp_path, port=0, reload_interval=3600)
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def client(server):
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_routes(client):
+    response = await client.get("/products")
+    assert response.status_code == 200
+    assert response.json() == {"products": ["chrome", "edge", "firefox", "safari"]}
+
+    response = await client.get("/products/edge")
+    assert response.json()["name"] == "Microsoft Edge"
+
+    response = await client.get("/products/edge/linux/")
+    entry = response.json()
+    assert (entry["product"], entry["platform"]) == ("edge", "linux")
+    assert entry["check_method"] == "api"
+
+    assert (await client.get("/products/edge/beos")).status_code == 404
+    assert (await client.post("/products")).status_code == 405
+
+
+@pytest.mark.asyncio
+async def test_etag_and_not_modified(client):
+    first = await client.get("/products/chrome/windows")
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    second = await client.get(
+        "/products/chrome/windows", headers={"If-None-Match": etag}
+    )
+    assert second.status_code == 304
+    assert second.content == b""
+
+    head = await client.head("/products/chrome/windows")
+    assert head.status_code == 200
+    assert head.headers["Content-Length"] == first.headers["Content-Length"]
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_lists(client):
+    etag = (await client.get("/products/chrome/windows")).headers["ETag"]
+    for header in [f'"other",{etag}', f'"other" ,  {etag}', "*"]:
+        response = await client.get(
+            "/products/chrome/windows", headers={"If-None-Match": header}
+        )
+        assert response.status_code == 304, header
+
+    response = await client.get(
+        "/products/chrome/windows", headers={"If-None-Match": '"other"'}
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_request_bodies_do_not_desync_keep_alive(server):
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    body = b'GET /products HTTP/1.1\r\n\r\n'
+    writer.write(
+        b"POST /products HTTP/1.1\r\nHost: test\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+        + b"GET /products/edge HTTP/1.1\r\nHost: test\r\n\r\n"
+    )
+    await writer.drain()
+
+    responses = []
+    for _ in range(2):
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+        responses.append((head.split(b"\r\n")[0], await reader.readexactly(length)))
+    writer.close()
+
+    assert responses[0][0] == b"HTTP/1.1 405 Method Not Allowed"
+    # The body was skipped, not answered as a request of its own
+    assert responses[1][0] == b"HTTP/1.1 200 OK"
+    assert json.loads(responses[1][1])["identifier"] == "edge"
+
+
+@pytest.mark.asyncio
+async def test_responses_are_prepared_once(server, client, mocker):
+    dumps = mocker.spy(json, "dumps")
+    for _ in range(5):
+        await client.get("/products/safari")
+    assert dumps.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_changed_files(server, client, tmp_path):
+    before = await client.get("/products/safari/ios")
+    assert server.refresh() is False
+
+    path = tmp_path / "safari.json"
+    data = json.loads(path.read_text())
+    data["versions"]["platforms"]["ios"]["version"] = "99.9"
+    path.write_text(json.dumps(data))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert server.refresh() is True
+    after = await client.get(
+        "/products/safari/ios", headers={"If-None-Match": before.headers["ETag"]}
+    )
+    assert after.status_code == 200
+    assert after.json()["version"] == "99.9"
+
+
+@pytest.mark.asyncio
+async def test_event_stream_resumes_and_follows_the_feed(server, client):
+    feed = server.events.path
+    first = b'{"product":"chrome","new":"2"}\n'
+    feed.write_bytes(first)
+    server.publish_new_events()
+
+    async with client.stream(
+        "GET", "/events", headers={"Last-Event-ID": "0"}
+    ) as response:
+        assert response.headers["Content-Type"] == "text/event-stream"
+        lines = response.aiter_lines()
+        assert [await lines.__anext__() for _ in range(4)] == [
+            f"id: {len(first)}",
+            "event: change",
+            'data: {"product":"chrome","new":"2"}',
+            "",
+        ]
+
+        with open(feed, "ab") as f:
+            f.write(b'{"product":"edge","new":"3"}\n{"partial')
+        assert server.publish_new_events() == 1
+        assert await lines.__anext__() == f"id: {len(first) + 29}"
+        await lines.__anext__()
+        assert await lines.__anext__() == 'data: {"product":"edge","new":"3"}'
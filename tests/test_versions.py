@@ -0,0 +1,80 @@
+import random
+
+import pytest
+from scripts.versions import (
+    InvalidVersion,
+    compare,
+    is_downgrade,
+    is_prerelease,
+    is_valid,
+    max_version,
+    sort_versions,
+    version_key,
+)
+
+
+def test_orders_tracked_formats():
+    ordered = [
+        "26.6",
+        "26.6.1",
+        "26.10",
+        "151.0.4129.9",
+        "151.0.4129.59",
+        "151.0.4129.72",
+        "153.0.3",
+        "154.0a1",
+        "154.0b5",
+        "154.0b12",
+        "154.0rc1",
+        "154.0",
+        "154.0.1",
+    ]
+    shuffled = ordered[:]
+    random.Random(0).shuffle(shuffled)
+    assert sort_versions(shuffled) == ordered
+    assert sort_versions(shuffled, reverse=True) == ordered[::-1]
+    assert max_version(shuffled) == "154.0.1"
+    assert max_version([]) is None
+
+
+def test_equivalent_spellings():
+    assert compare("26.6", "26.6.0") == 0
+    assert compare("140.3.0esr", "140.3.0") == 0
+    assert compare("v1.2", "1.2") == 0
+    assert compare("115.0.3esr", "115.0.2") == 1
+    assert compare("1.9", "1.10") == -1
+    # Stable sort keeps equal versions in input order
+    assert sort_versions(["26.6.0", "26.6"]) == ["26.6.0", "26.6"]
+
+
+def test_prereleases():
+    assert is_prerelease("154.0b5")
+    assert is_prerelease("155.0a1")
+    assert not is_prerelease("140.3.0esr")
+    assert not is_prerelease("151.0.4129.72")
+
+
+@pytest.mark.parametrize("version", ["", "latest", "1..2", "1.2-beta", "1.2b3esr"])
+def test_rejects_invalid_versions(version):
+    assert not is_valid(version)
+    with pytest.raises(InvalidVersion):
+        version_key(version)
+
+
+def test_keys_are_cached():
+    version_key.cache_clear()
+    for _ in range(3):
+        sort_versions(["1.0", "2.0", "1.5"])
+    info = version_key.cache_info()
+    assert info.misses == 3
+    assert info.hits == 6
+
+
+def test_is_downgrade():
+    assert is_downgrade("153.0.3", "153.0.2")
+    assert is_downgrade("154.0", "154.0b5")
+    assert not is_downgrade("153.0.3", "153.0.3")
+    assert not is_downgrade("153.0.3", "154.0b1")
+    assert not is_downgrade(None, "1.0")
+    assert not is_downgrade("0.0.0", "1.0")
+    assert not is_downgrade("unknown", "1.0")